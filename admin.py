@@ -1,5 +1,7 @@
 import streamlit as st
 from database import QuizDatabase
+from mongo_client import connection_stats
+from question_tags import search_fields
 import json
 from bson import ObjectId
 import datetime
@@ -97,6 +99,7 @@ def upload_questions(db):
             else:
                 doc.setdefault("created_at", datetime.datetime.utcnow())
                 doc.setdefault("updated_at", datetime.datetime.utcnow())
+                doc.update(search_fields(doc))
                 if not doc.get("question_id") or doc.get("question_id") == "AUTO":
                     doc["question_id"] = get_next_question_id(db.collection, topic, prefix_map)
 
@@ -150,6 +153,7 @@ def edit_delete_question(db):
                         "explanation": explanation,
                         "updated_at": datetime.datetime.utcnow()
                     }
+                    updated_doc.update(search_fields({**doc, **updated_doc}))
                     try:
                         db.collection.update_one({"_id": doc["_id"]}, {"$set": updated_doc})
                         st.success(f"Updated question '{qid}'")
@@ -169,6 +173,8 @@ def main():
     st.title("Admin Interface: Quiz Management")
 
     db = QuizDatabase()
+    conns = connection_stats()
+    st.sidebar.caption(f"MongoDB connections: {conns['open']} open, {conns['in_use']} in use")
 
     st.sidebar.title("Navigation")
     option = st.sidebar.radio("Go to", ("Summary", "Questions by Topic", "Upload Questions", "Edit/Delete Question"))
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import sys
 from pathlib import Path
 
@@ -10,29 +9,9 @@ ROOT = Path(__file__).resolve().parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-JSONL_PATH = ROOT / "question_bank" / "v2" / "questions.jsonl"
-REVISION_PATH = ROOT / "data" / "revision.json"
-MOCK_HISTORY_PATH = ROOT / "data" / "mock_history.json"
-
-
-def load_jsonl_count(path: Path) -> int:
-    if not path.exists():
-        return 0
-    n = 0
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            if line.strip():
-                n += 1
-    return n
-
-
-def load_json(path: Path, default):
-    if not path.exists():
-        return default
-    try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except Exception:
-        return default
+from src.data.history_store import get_history_store
+from src.data.question_bank import get_bank
+from src.data.revision_store import get_revision_store
 
 
 st.set_page_config(page_title="MongoDB Exam Prep", layout="wide")
@@ -41,18 +20,18 @@ st.markdown("# MongoDB Exam Prep")
 st.caption("Practice → Mock → Revision → Stats. Built to feel like an exam-prep product, not a demo.")
 
 # --- KPIs ---
-q_count = load_jsonl_count(JSONL_PATH)
-revision = load_json(REVISION_PATH, {"items": {}})
-history = load_json(MOCK_HISTORY_PATH, {"attempts": []})
+q_count = len(get_bank())
+history = get_history_store()
 
-rev_count = len((revision.get("items") or {}))
-attempts = (history.get("attempts") or [])
-last_pct = attempts[-1].get("pct") if attempts else None
+rev_count = len(get_revision_store())
+attempt_count = history.count()
+last = history.last()
+last_pct = last.get("pct") if last else None
 
 k1, k2, k3, k4 = st.columns(4)
 k1.metric("Questions (compiled)", str(q_count))
 k2.metric("Revision queue", str(rev_count))
-k3.metric("Mock attempts", str(len(attempts)))
+k3.metric("Mock attempts", str(attempt_count))
 k4.metric("Last mock %", f"{last_pct}%" if last_pct is not None else "—")
 
 st.divider()
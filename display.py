@@ -1,15 +1,14 @@
 import streamlit as st
-from pymongo import MongoClient
 from bson import ObjectId
 import json
 
+from mongo_client import get_database
+
 # === CONFIG ===
 st.set_page_config(page_title="MongoDB Question Preview", layout="wide")
 
 # === MONGODB CONNECTION ===
-mongo_uri = st.secrets["mongo_uri"]  # .streamlit/secrets.toml
-client = MongoClient(mongo_uri)
-db = client["quiz_app"]
+db = get_database()  # mongo_uri in .streamlit/secrets.toml; one pooled client per process
 collection = db["questions"]
 
 st.title("👀 MongoDB Question Previewer (DB → UI)")
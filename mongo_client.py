@@ -0,0 +1,154 @@
+import os
+import threading
+
+from pymongo import MongoClient, monitoring
+
+DB_NAME = "quiz_app"
+
+# Pool and timeout defaults; override any of them in .streamlit/secrets.toml:
+#
+#   mongo_uri = "mongodb+srv://..."
+#   [mongo]
+#   maxPoolSize = 50
+#   compressors = "zstd,zlib"
+#
+# zlib ships with Python; zstd/snappy need the zstandard/python-snappy packages
+# and are skipped by the driver when missing.
+DEFAULT_OPTIONS = {
+    "maxPoolSize": 20,
+    "minPoolSize": 0,
+    "maxIdleTimeMS": 300_000,
+    "waitQueueTimeoutMS": 5_000,
+    "connectTimeoutMS": 5_000,
+    "serverSelectionTimeoutMS": 5_000,
+    "socketTimeoutMS": 20_000,
+    "compressors": "zlib",
+    "retryWrites": True,
+    "appname": "mdb-quiz-app",
+}
+
+
+class ConnectionCounter(monitoring.ConnectionPoolListener):
+    """Live pool connections across every server the client talks to."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.open = 0
+        self.checked_out = 0
+        self.created_total = 0
+
+    def _add(self, field, n):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + n)
+
+    def snapshot(self):
+        with self._lock:
+            return {"open": self.open, "in_use": self.checked_out, "created_total": self.created_total}
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open += 1
+            self.created_total += 1
+
+    def connection_closed(self, event):
+        self._add("open", -1)
+
+    def connection_checked_out(self, event):
+        self._add("checked_out", 1)
+
+    def connection_checked_in(self, event):
+        self._add("checked_out", -1)
+
+    # Pool and checkout-failure events carry nothing the counter needs.
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        pass
+
+
+def _secrets():
+    """st.secrets as a dict, or {} outside Streamlit / without a secrets file."""
+    try:
+        import streamlit as st
+
+        return dict(st.secrets)
+    except Exception:
+        return {}
+
+
+def mongo_uri():
+    """The connection string: secrets.toml `mongo_uri`, else the MONGO_URI env var."""
+    uri = _secrets().get("mongo_uri") or os.environ.get("MONGO_URI")
+    if not uri:
+        raise RuntimeError("No MongoDB URI: set mongo_uri in .streamlit/secrets.toml or MONGO_URI")
+    return uri
+
+
+def client_options(**overrides):
+    options = dict(DEFAULT_OPTIONS)
+    options.update(dict(_secrets().get("mongo") or {}))
+    options.update(overrides)
+    return options
+
+
+# -------------------------
+# Process-wide client
+# -------------------------
+_lock = threading.Lock()
+_client = None
+counter = ConnectionCounter()
+
+
+def get_client():
+    """
+    The one MongoClient for this process. Streamlit reruns, pages and
+    sessions all share it, so TLS handshakes, server discovery and the
+    connection pool happen once instead of on every rerun.
+    """
+    global _client
+    if _client is not None:
+        return _client
+    with _lock:
+        if _client is None:
+            _client = MongoClient(mongo_uri(), event_listeners=[counter], **client_options())
+        return _client
+
+
+def get_database(name=DB_NAME):
+    return get_client()[name]
+
+
+def set_client(client):
+    """Install `client` (e.g. mongomock.MongoClient()) as the process-wide client."""
+    global _client
+    with _lock:
+        _client = client
+
+
+def close_client():
+    global _client
+    with _lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+
+
+def connection_stats():
+    """{"open", "in_use", "created_total"} for the process-wide client's pools."""
+    return counter.snapshot()
@@ -1,10 +1,7 @@
 from __future__ import annotations
 
-import json
-import random
 import sys
 from pathlib import Path
-from datetime import datetime
 
 import streamlit as st
 
@@ -13,96 +10,42 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-JSONL_PATH = ROOT / "question_bank" / "v2" / "questions.jsonl"
-REVISION_PATH = ROOT / "data" / "revision.json"
-
-
-def load_questions():
-    if not JSONL_PATH.exists():
-        return []
-    rows = []
-    with JSONL_PATH.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            rows.append(json.loads(line))
-    return rows
-
-
-def now_iso():
-    return datetime.now().isoformat(timespec="seconds")
-
-
-def load_revision():
-    if not REVISION_PATH.exists():
-        return {"items": {}}
-    try:
-        return json.loads(REVISION_PATH.read_text(encoding="utf-8"))
-    except Exception:
-        return {"items": {}}
-
-
-def save_revision(state: dict):
-    REVISION_PATH.parent.mkdir(parents=True, exist_ok=True)
-    REVISION_PATH.write_text(json.dumps(state, indent=2, ensure_ascii=False), encoding="utf-8")
+from src.data.question_bank import get_bank
+from src.data.revision_store import get_revision_store
 
 
 def add_wrong_to_revision(q: dict, selected: list[str], source: str = "practice"):
     qid = q.get("id")
     if not qid:
         return
-
-    rev = load_revision()
-    items = rev.setdefault("items", {})
-
-    rec = items.get(
-        qid,
+    events = [
         {
+            "op": "wrong",
             "qid": qid,
-            "added_at": now_iso(),
-            "last_seen": None,
-            "times_seen": 0,
-            "times_wrong": 0,
-            "times_correct": 0,
-            "last_selected": [],
+            "selected": selected,
             "source": source,
-        },
+            "topic": q.get("topic", "Unknown"),
+            "difficulty": q.get("difficulty", "Unknown"),
+        }
+    ]
+    get_revision_store().record_many(events)
+
+
+def pick_question(bank, topic=None, difficulty=None, only_published=True):
+    # Index lookup: candidates are cached per filter combination, so repeated
+    # "Next" clicks are a single random.choice over a prebuilt tuple.
+    return bank.sample(
+        status="published" if only_published else None,
+        topic=topic,
+        difficulty=difficulty,
     )
 
-    rec["last_seen"] = now_iso()
-    rec["times_seen"] += 1
-    rec["times_wrong"] += 1
-    rec["last_selected"] = selected
-    rec["source"] = source  # last source wins (fine)
-
-    items[qid] = rec
-    save_revision(rev)
-
-
-def pick_question(questions, topic=None, difficulty=None, only_published=True):
-    pool = questions
-    if only_published:
-        pool = [q for q in pool if q.get("status") == "published"]
-    if topic and topic != "All":
-        pool = [q for q in pool if q.get("topic") == topic]
-    if difficulty and difficulty != "All":
-        pool = [q for q in pool if q.get("difficulty") == difficulty]
-    if not pool:
-        return None
-    return random.choice(pool)
-
-
-def grade(q: dict, user_keys: list[str]) -> bool:
-    correct = set((q.get("answer") or {}).get("keys", []))
-    return set(user_keys) == correct
-
 
 st.set_page_config(page_title="Practice", layout="wide")
 st.title("Practice")
 
-questions = load_questions()
-if not questions:
+bank = get_bank()
+if not bank.rows:
     st.error("No questions found. Run: python -m scripts.build_bank")
     st.stop()
 
@@ -110,16 +53,13 @@ if not questions:
 st.sidebar.markdown("### Filters")
 published_only = st.sidebar.checkbox("Published only", value=True)
 
-topics = sorted({q.get("topic", "Unknown") for q in questions})
-diffs = sorted({q.get("difficulty", "Unknown") for q in questions})
-
-topic = st.sidebar.selectbox("Topic", ["All"] + topics)
-difficulty = st.sidebar.selectbox("Difficulty", ["All"] + diffs)
+topic = st.sidebar.selectbox("Topic", ["All"] + bank.topics)
+difficulty = st.sidebar.selectbox("Difficulty", ["All"] + bank.difficulties)
 
 # Session state
 if "current_q" not in st.session_state:
     st.session_state.current_q = pick_question(
-        questions, topic=topic, difficulty=difficulty, only_published=published_only
+        bank, topic=topic, difficulty=difficulty, only_published=published_only
     )
 if "answered" not in st.session_state:
     st.session_state.answered = False
@@ -132,7 +72,7 @@ if "last_result" not in st.session_state:
 # Apply filters / new question
 if st.sidebar.button("New question"):
     st.session_state.current_q = pick_question(
-        questions, topic=topic, difficulty=difficulty, only_published=published_only
+        bank, topic=topic, difficulty=difficulty, only_published=published_only
     )
     st.session_state.answered = False
     st.session_state.user_keys = []
@@ -199,13 +139,16 @@ else:
 col1, col2, col3 = st.columns([1, 1, 6])
 
 with col1:
+    # Only the first Submit on a question view counts; repeats just re-grade.
     if st.button("Submit", type="primary"):
+        first_submit = not st.session_state.answered
         st.session_state.answered = True
         st.session_state.user_keys = user_keys
 
         # Add to revision if wrong
-        if not grade(q, user_keys):
-            add_wrong_to_revision(q, user_keys, source="practice")
+        if not bank.grader.is_correct(q.get("id"), user_keys):
+            if first_submit:
+                add_wrong_to_revision(q, user_keys, source="practice")
             st.session_state.last_result = "wrong"
         else:
             st.session_state.last_result = "correct"
@@ -213,7 +156,7 @@ with col1:
 with col2:
     if st.button("Next"):
         st.session_state.current_q = pick_question(
-            questions, topic=topic, difficulty=difficulty, only_published=published_only
+            bank, topic=topic, difficulty=difficulty, only_published=published_only
         )
         st.session_state.answered = False
         st.session_state.user_keys = []
@@ -227,7 +170,7 @@ st.divider()
 
 # --- Explanation (only after submit) ---
 if st.session_state.answered:
-    is_correct = grade(q, st.session_state.user_keys)
+    is_correct = bank.grader.is_correct(q.get("id"), st.session_state.user_keys)
 
     if is_correct:
         st.success("✅ Correct")
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import random
 import sys
 import time
@@ -15,9 +14,22 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-JSONL_PATH = ROOT / "question_bank" / "v2" / "questions.jsonl"
-REVISION_PATH = ROOT / "data" / "revision.json"
-MOCK_HISTORY_PATH = ROOT / "data" / "mock_history.json"
+from src.data.attempt_store import get_attempt_store
+from src.data.history_store import get_history_store
+from src.data.question_bank import get_bank
+from src.data.revision_store import get_revision_store
+from src.domain.exam_assembly import ExamConstraints
+from src.domain.grading import AttemptGrade
+from src.ui.mock_panel import (
+    checkpoint_attempt,
+    progress_snapshot,
+    question_panel,
+    render_counters,
+    track_question_time,
+)
+
+# Official simulations avoid questions seen in this many recent attempts.
+RECENT_ATTEMPTS_AVOIDED = 3
 
 
 # -------------------------
@@ -58,100 +70,10 @@ def set_qp(**kwargs):
 # -------------------------
 # IO helpers
 # -------------------------
-def load_questions():
-    if not JSONL_PATH.exists():
-        return []
-    rows = []
-    with JSONL_PATH.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            rows.append(json.loads(line))
-    return rows
-
-
 def now_iso():
     return datetime.now().isoformat(timespec="seconds")
 
 
-def load_revision():
-    if not REVISION_PATH.exists():
-        return {"items": {}}
-    try:
-        return json.loads(REVISION_PATH.read_text(encoding="utf-8"))
-    except Exception:
-        return {"items": {}}
-
-
-def save_revision(state: dict):
-    REVISION_PATH.parent.mkdir(parents=True, exist_ok=True)
-    REVISION_PATH.write_text(json.dumps(state, indent=2, ensure_ascii=False), encoding="utf-8")
-
-
-def add_wrong_to_revision(q: dict, selected: list[str], source: str = "mock"):
-    qid = q.get("id")
-    if not qid:
-        return
-
-    rev = load_revision()
-    items = rev.setdefault("items", {})
-
-    rec = items.get(
-        qid,
-        {
-            "qid": qid,
-            "added_at": now_iso(),
-            "last_seen": None,
-            "times_seen": 0,
-            "times_wrong": 0,
-            "times_correct": 0,
-            "last_selected": [],
-            "source": source,
-        },
-    )
-
-    rec["last_seen"] = now_iso()
-    rec["times_seen"] += 1
-    rec["times_wrong"] += 1
-    rec["last_selected"] = selected
-    rec["source"] = source
-
-    items[qid] = rec
-    save_revision(rev)
-
-
-def load_mock_history():
-    if not MOCK_HISTORY_PATH.exists():
-        return {"attempts": []}
-    try:
-        return json.loads(MOCK_HISTORY_PATH.read_text(encoding="utf-8"))
-    except Exception:
-        return {"attempts": []}
-
-
-def save_mock_history(state: dict):
-    MOCK_HISTORY_PATH.parent.mkdir(parents=True, exist_ok=True)
-    MOCK_HISTORY_PATH.write_text(json.dumps(state, indent=2, ensure_ascii=False), encoding="utf-8")
-
-
-# -------------------------
-# Pool helpers
-# -------------------------
-def is_exam_pool(q: dict) -> bool:
-    er = q.get("exam_relevance") or {}
-    return er.get("pool") == "exam"
-
-
-def is_published(q: dict) -> bool:
-    return q.get("status") == "published"
-
-
-def grade_one(q: dict, selected: list[str]) -> bool:
-    correct = set((q.get("answer") or {}).get("keys", []))
-    return set(selected) == correct
-
-
 def format_mmss(seconds: int) -> str:
     seconds = max(0, int(seconds))
     m = seconds // 60
@@ -170,114 +92,16 @@ def sample_without_replacement(items: list[dict], n: int) -> list[dict]:
 # -------------------------
 # Official weighting helpers (domain quotas)
 # -------------------------
-OFFICIAL_DOMAIN_PCTS = {
-    "OVERVIEW_DOCUMENT_MODEL": 0.08,
-    "CRUD": 0.51,
-    "INDEXES": 0.17,
-    "DATA_MODELING": 0.04,
-    "TOOLS_TOOLING": 0.02,
-    "DRIVERS": 0.18,
-}
-
-DOMAIN_ORDER_FILL = [
-    "CRUD",
-    "DRIVERS",
-    "INDEXES",
-    "OVERVIEW_DOCUMENT_MODEL",
-    "DATA_MODELING",
-    "TOOLS_TOOLING",
-]
-
-
-def normalize_domain(q: dict) -> str:
-    d = (q.get("domain") or "").strip().upper()
-    if d:
-        d = d.replace("&", "AND").replace("/", "_").replace("-", "_").replace(" ", "_")
-        alias = {
-            "OVERVIEW": "OVERVIEW_DOCUMENT_MODEL",
-            "DOCUMENT_MODEL": "OVERVIEW_DOCUMENT_MODEL",
-            "OVERVIEW_DOCUMENT": "OVERVIEW_DOCUMENT_MODEL",
-            "DOC_MODEL": "OVERVIEW_DOCUMENT_MODEL",
-            "INDEX": "INDEXES",
-            "INDEXING": "INDEXES",
-            "TOOLS": "TOOLS_TOOLING",
-            "TOOLING": "TOOLS_TOOLING",
-            "DRIVER": "DRIVERS",
-        }
-        return alias.get(d, d)
-
-    txt = f"{q.get('topic','')} {q.get('subtopic','')}".lower()
-    if any(k in txt for k in ["crud", "insert", "update", "delete", "find", "aggregate", "aggregation", "pipeline"]):
-        return "CRUD"
-    if "index" in txt:
-        return "INDEXES"
-    if any(k in txt for k in ["driver", "pymongo", "motor", "uri", "tls", "retrywrites"]):
-        return "DRIVERS"
-    if any(k in txt for k in ["model", "schema", "embedding", "reference", "normalize", "denormal"]):
-        return "DATA_MODELING"
-    if any(k in txt for k in ["mongosh", "atlas", "compass", "dump", "restore", "import", "export"]):
-        return "TOOLS_TOOLING"
-    return "OVERVIEW_DOCUMENT_MODEL"
-
-
-def compute_domain_quotas(total_q: int) -> dict[str, int]:
-    raw = {k: OFFICIAL_DOMAIN_PCTS[k] * total_q for k in OFFICIAL_DOMAIN_PCTS}
-    quotas = {k: int(round(v)) for k, v in raw.items()}
-
-    for k in quotas:
-        quotas[k] = max(0, quotas[k])
-
-    s = sum(quotas.values())
-    if s != total_q:
-        diff = total_q - s
-        i = 0
-        while diff != 0:
-            k = DOMAIN_ORDER_FILL[i % len(DOMAIN_ORDER_FILL)]
-            if diff > 0:
-                quotas[k] += 1
-                diff -= 1
-            else:
-                if quotas[k] > 0:
-                    quotas[k] -= 1
-                    diff += 1
-            i += 1
-
-    s = sum(quotas.values())
-    if s != total_q:
-        quotas["CRUD"] += (total_q - s)
-    return quotas
-
-
-def select_official_exam_questions(exam_pool: list[dict], total_q: int) -> tuple[list[dict], dict]:
-    quotas = compute_domain_quotas(total_q)
-    buckets: dict[str, list[dict]] = {k: [] for k in OFFICIAL_DOMAIN_PCTS.keys()}
-    for q in exam_pool:
-        d = normalize_domain(q)
-        if d in buckets:
-            buckets[d].append(q)
-
-    chosen: list[dict] = []
-    chosen_ids: set[str] = set()
-    shortages: dict[str, int] = {}
-
-    for d, qn in quotas.items():
-        pool = [q for q in buckets.get(d, []) if q.get("id") and q["id"] not in chosen_ids]
-        pick = min(qn, len(pool))
-        picked = sample_without_replacement(pool, pick)
-        for qq in picked:
-            chosen.append(qq)
-            chosen_ids.add(qq["id"])
-        if pick < qn:
-            shortages[d] = qn - pick
-
-    remaining = [q for q in exam_pool if q.get("id") and q["id"] not in chosen_ids]
-    fill_needed = total_q - len(chosen)
-    if fill_needed > 0:
-        chosen.extend(sample_without_replacement(remaining, min(fill_needed, len(remaining))))
-
-    random.shuffle(chosen)
-    dbg = {"quotas": quotas, "shortages": shortages, "selected": len(chosen)}
-    return chosen, dbg
+def select_official_exam_questions(
+    bank, total_q: int, seed: int | None = None, avoid_ids=()
+) -> tuple[list[dict], dict]:
+    # Attributes are precomputed once per bank load; the generator balances
+    # domain quotas, difficulty mix, multi/single ratio and subtopic spread,
+    # avoids `avoid_ids`, and lists whatever it had to relax in dbg["relaxed"].
+    constraints = ExamConstraints(total_q=total_q, avoid_ids=avoid_ids)
+    positions, dbg = bank.exam_assembler.assemble(constraints, rng=seed)
+    pool = bank.published_exam
+    return [pool[i] for i in positions], dbg
 
 
 def select_any_pool_random(published_all: list[dict], total_q: int) -> tuple[list[dict], dict]:
@@ -306,65 +130,91 @@ def reset_attempt():
     for k in list(st.session_state.keys()):
         if str(k).startswith("mock_opt_") or str(k).startswith("mock_radio_"):
             del st.session_state[k]
-    set_qp(autosubmit=None)
+    set_qp(attempt=None)
+
+
+def grade_attempt(attempt: dict, bank) -> AttemptGrade:
+    # Graded once when the attempt is submitted; the history log, the
+    # revision push and the results view all reuse it.
+    grade = attempt.get("grade")
+    if grade is None:
+        grade = bank.grader.grade(attempt["order"], attempt["answers"])
+        attempt["grade"] = grade
+    return grade
 
 
-def push_wrong_to_revision(order: list[str], by_id: dict, answers: dict):
+def push_wrong_to_revision(attempt_id: str, grade: AttemptGrade, rows_by_id: dict, answers: dict):
     if st.session_state.get("revision_pushed") is True:
         return
-    for qid in order:
-        q = by_id.get(qid)
-        if not q:
-            continue
-        selected = answers.get(qid, [])
-        if not grade_one(q, selected):
-            add_wrong_to_revision(q, selected, source="mock")
+    events = []
+    for qid in grade.wrong_qids:
+        row = rows_by_id[qid]
+        events.append(
+            {
+                "op": "wrong",
+                "qid": qid,
+                "selected": answers.get(qid, []),
+                "source": "mock",
+                "topic": row.get("topic", "Unknown"),
+                "difficulty": row.get("difficulty", "Unknown"),
+            }
+        )
+    # One log line for the whole attempt; keyed by attempt_id so a rerun
+    # (reconnect, fresh session) never counts the same attempt twice.
+    get_revision_store().record_many(events, attempt_id=attempt_id)
     st.session_state.revision_pushed = True
 
 
-def log_mock_attempt(attempt: dict, by_id: dict):
+def log_mock_attempt(attempt: dict, grade: AttemptGrade, rows_by_id: dict):
     if st.session_state.get("mock_logged") is True:
         return
 
-    order = attempt["order"]
-    answers = attempt["answers"]
-    total = len(order)
-    score = 0
-    wrong_ids = []
-
-    for qid in order:
-        q = by_id.get(qid)
-        if not q:
-            continue
-        ok = grade_one(q, answers.get(qid, []))
-        score += 1 if ok else 0
-        if not ok:
-            wrong_ids.append(qid)
-
-    hist = load_mock_history()
-    hist.setdefault("attempts", []).append(
+    times = attempt.get("time_ms") or {}
+    graded = []
+    for r in grade.results():
+        row = rows_by_id[r.qid]
+        graded.append(
+            {
+                "qid": r.qid,
+                "topic": row.get("topic"),
+                "domain": r.domain,
+                "difficulty": row.get("difficulty"),
+                "selected": r.selected,
+                "correct": r.correct,
+                "time_ms": times.get(r.qid),
+            }
+        )
+
+    get_history_store().add_attempt(
         {
             "ts": now_iso(),
             "attempt_id": attempt["attempt_id"],
             "mode": attempt["mode"],
             "selection_mode": attempt["selection_mode"],
-            "total": total,
-            "score": score,
-            "pct": round((score / max(1, total)) * 100, 2),
+            "total": grade.total,
+            "score": grade.score,
+            "pct": grade.pct,
             "duration_sec": attempt["duration_sec"],
-            "wrong_ids": wrong_ids,
-        }
+        },
+        graded,
     )
-    save_mock_history(hist)
     st.session_state.mock_logged = True
 
 
 # -------------------------
-# JS ticking timer (client-side)
+# Exam timer
 # -------------------------
-def render_js_timer(end_ts: float, attempt_id: str):
-    # When time is up, add ?autosubmit=<attempt_id> and reload.
-    # Timer itself updates in browser every second without Streamlit reruns.
+def expire_if_due(attempt: dict) -> bool:
+    """Server-side time-up: the deadline comes from the persisted attempt."""
+    if not attempt["submitted"] and time.time() >= attempt["end_ts"]:
+        attempt["submitted"] = True
+        return True
+    return False
+
+
+def render_js_timer(end_ts: float):
+    # Display-only countdown for Streamlit versions without st.fragment; the
+    # deadline is still enforced server-side on the next interaction.
     html = f"""
     <div style="display:flex; gap:10px; align-items:center;">
       <div style="font-size:14px; color: #666;">Time left</div>
@@ -373,7 +223,6 @@ def render_js_timer(end_ts: float, attempt_id: str):
 
     <script>
       const endTs = {end_ts} * 1000;
-      const attemptId = "{attempt_id}";
 
       function fmt(ms) {{
         ms = Math.max(0, ms);
@@ -383,22 +232,9 @@ def render_js_timer(end_ts: float, attempt_id: str):
         return `${{m}}:${{s}}`;
       }}
 
-      function setQP(key, value) {{
-        const url = new URL(window.parent.location.href);
-        url.searchParams.set(key, value);
-        window.parent.location.href = url.toString();
-      }}
-
       function tick() {{
-        const now = Date.now();
-        const rem = endTs - now;
         const el = document.getElementById('timer');
-        if (el) el.textContent = fmt(rem);
-
-        if (rem <= 0) {{
-          // force submit
-          setQP("autosubmit", attemptId);
-        }}
+        if (el) el.textContent = fmt(endTs - Date.now());
       }}
 
       tick();
@@ -408,21 +244,71 @@ def render_js_timer(end_ts: float, attempt_id: str):
     components.html(html, height=55)
 
 
+def _timer_tick():
+    # Reruns on its own every second; only this fragment is re-executed
+    # until time is up, then the whole page reruns into the submitted view.
+    attempt = st.session_state.get("attempt")
+    if not attempt or attempt["submitted"]:
+        return
+    st.metric("Time left", format_mmss(attempt["end_ts"] - time.time()))
+    if expire_if_due(attempt):
+        st.rerun(scope="app")
+
+
+if hasattr(st, "fragment"):
+    render_timer = st.fragment(run_every=1)(_timer_tick)
+else:
+    def render_timer():
+        render_js_timer(st.session_state.attempt["end_ts"])
+
+
+# -------------------------
+# Checkpointing (survives websocket drops and server restarts; see src.ui.mock_panel)
+# -------------------------
+def restore_attempt(attempt_id) -> dict | None:
+    """
+    Rebuild a session's attempt from its last checkpoint (reconnect, reload,
+    server restart). A submitted attempt reopens on its results, already
+    finished, so a new session never checkpoints or finishes it again.
+    """
+    if isinstance(attempt_id, list):
+        attempt_id = attempt_id[0] if attempt_id else None
+    attempt = get_attempt_store().get(attempt_id) if attempt_id else None
+    if attempt is None:
+        return None
+    # The store's submitted flag is only set by finish(), after the final checkpoint.
+    attempt["finished"] = attempt["submitted"]
+    attempt["on_screen"] = None
+    attempt["saved"] = progress_snapshot(attempt)
+    attempt["saved_idx"] = attempt["idx"]
+    attempt["saved_at"] = time.time()
+    return attempt
+
+
 # -------------------------
 # Page
 # -------------------------
 st.set_page_config(page_title="Mock Exam", layout="wide")
 st.title("Mock Exam")
 
-all_questions = load_questions()
-if not all_questions:
+bank = get_bank()
+if not bank.rows:
     st.error("No questions found. Run: python -m scripts.build_bank")
     st.stop()
 
-published_all = [q for q in all_questions if is_published(q)]
-published_exam = [q for q in published_all if is_exam_pool(q)]
+published_all = bank.published
+published_exam = bank.published_exam
+
+by_id = bank.by_id
 
-by_id = {q.get("id"): q for q in published_all if q.get("id")}
+# Pick up an attempt after a reconnect, reload or restart (?attempt=<id>)
+if "attempt" not in st.session_state:
+    attempt_qp = get_qp().get("attempt")
+    restored = restore_attempt(attempt_qp)
+    if restored is not None:
+        st.session_state.attempt = restored
+    elif attempt_qp:
+        set_qp(attempt=None)
 
 # Settings UI (only when no active attempt)
 if "attempt" not in st.session_state:
@@ -476,7 +362,10 @@ if "attempt" not in st.session_state:
             if len(published_exam) == 0:
                 st.error("No published EXAM questions available.")
                 st.stop()
-            chosen, dbg = select_official_exam_questions(published_exam, int(total_q))
+            seed = random.getrandbits(63)
+            recent = get_history_store().recent_qids(RECENT_ATTEMPTS_AVOIDED)
+            chosen, dbg = select_official_exam_questions(bank, int(total_q), seed=seed, avoid_ids=recent)
+            dbg["seed"] = seed
             selection_mode = "official_exam_only_strict"
         else:
             if len(published_all) == 0:
@@ -490,7 +379,7 @@ if "attempt" not in st.session_state:
         duration_sec = int(duration_min * 60)
         end_ts = started_at + duration_sec
 
-        st.session_state.attempt = {
+        attempt = {
             "attempt_id": attempt_id,
             "mode": mode,
             "selection_mode": selection_mode,
@@ -503,11 +392,15 @@ if "attempt" not in st.session_state:
             "answers": {},
             "marked": set(),
             "submitted": False,
+            "time_ms": {},
+            "on_screen": None,
             "selection_debug": dbg,
         }
-
-        # Clear autosubmit param just in case
-        set_qp(autosubmit=None)
+        # Persist the deadline server-side and tag the URL, so a reconnect
+        # resumes this attempt instead of losing it.
+        get_attempt_store().start(attempt)
+        st.session_state.attempt = attempt
+        set_qp(attempt=attempt_id)
         st.rerun()
 
     st.stop()
@@ -518,21 +411,8 @@ if "attempt" not in st.session_state:
 # -------------------------
 attempt = st.session_state.attempt
 
-# Handle JS autosubmit signal
-qp = get_qp()
-autosubmit = qp.get("autosubmit")
-if isinstance(autosubmit, list):
-    autosubmit = autosubmit[0] if autosubmit else None
-
-if autosubmit and (str(autosubmit) == attempt["attempt_id"]) and not attempt["submitted"]:
-    attempt["submitted"] = True
-    st.session_state.attempt = attempt
-    set_qp(autosubmit=None)
-    st.rerun()
-
-# Server-side enforcement too
-if (time.time() >= attempt["end_ts"]) and not attempt["submitted"]:
-    attempt["submitted"] = True
+# Time-up is enforced on every run, not only by the ticking timer
+if expire_if_due(attempt):
     st.session_state.attempt = attempt
     st.rerun()
 
@@ -542,57 +422,46 @@ if not order:
     reset_attempt()
     st.stop()
 
-# Top bar (timer + progress)
-top1, top2, top3, top4 = st.columns([1.3, 2.2, 1.2, 1.3])
+# Top bar (timer). Progress and counters belong to the question panel below,
+# so they refresh with it.
+top1, _top2 = st.columns([1.3, 4.7])
 
 with top1:
-    # JS ticking timer (real exam feel)
-    render_js_timer(attempt["end_ts"], attempt["attempt_id"])
-
-with top2:
-    idx = attempt["idx"]
-    st.progress(min(1.0, (idx + 1) / max(1, len(order))))
-    st.caption(f"Question {idx + 1} / {len(order)}")
-
-with top3:
-    answered_count = sum(1 for _qid, ans in attempt["answers"].items() if ans)
-    st.metric("Answered", f"{answered_count}/{len(order)}")
-
-with top4:
-    marked_count = len(attempt["marked"])
-    st.metric("Marked", str(marked_count))
-
-st.divider()
+    # Server-side ticking timer (real exam feel, no page reloads). Not
+    # rendered once submitted, so its run_every=1 reruns stop too.
+    if not attempt["submitted"]:
+        render_timer()
 
 # Auto submit view
 if attempt["submitted"]:
-    push_wrong_to_revision(order, by_id, attempt["answers"])
-    log_mock_attempt(attempt, by_id)
+    render_counters(attempt)
+    st.divider()
+    if not attempt.get("finished"):
+        # Final checkpoint once; later reruns of the results view write nothing.
+        track_question_time(attempt, None)
+        checkpoint_attempt(attempt, force=True)
+        get_attempt_store().finish(attempt["attempt_id"])
+        attempt["finished"] = True
+    grade = grade_attempt(attempt, bank)
+    push_wrong_to_revision(attempt["attempt_id"], grade, bank.rows_by_id, attempt["answers"])
+    log_mock_attempt(attempt, grade, bank.rows_by_id)
 
     # Score + Review
-    score = 0
-    detailed = []
-    for qid in order:
-        q = by_id.get(qid)
-        if not q:
-            continue
-        sel = attempt["answers"].get(qid, [])
-        ok = grade_one(q, sel)
-        score += 1 if ok else 0
-        detailed.append((qid, ok, sel, (q.get("answer") or {}).get("keys", [])))
-
-    pct = (score / max(1, len(order))) * 100
     st.markdown("## Results")
-    st.metric("Score", f"{score}/{len(order)} ({pct:.1f}%)")
+    st.metric("Score", f"{grade.score}/{grade.total} ({grade.pct:.1f}%)")
+    domain_scores = grade.by_domain()
+    if domain_scores:
+        st.caption(" • ".join(f"{d}: {s['correct']}/{s['total']}" for d, s in sorted(domain_scores.items())))
+    credit, multi_total = grade.multi_credit()
+    if multi_total:
+        st.caption(f"Multi-select partial credit: {credit:.1f}/{multi_total}")
     st.caption("Incorrect questions were added to Revision automatically. Attempt saved to Stats.")
 
     st.divider()
     st.markdown("## Review (with explanations)")
 
-    for qid, ok, selected, correct in detailed:
-        q = by_id.get(qid)
-        if not q:
-            continue
+    for qid, ok, selected, correct, _domain, _partial in grade.results():
+        q = by_id[qid]
 
         st.markdown(f"### {qid} — {q.get('title','')}")
         st.caption(f"{q.get('topic','')} • {q.get('subtopic','')} • {q.get('difficulty','')}")
@@ -641,102 +510,12 @@ if attempt["submitted"]:
     st.stop()
 
 # Active question (Typeform)
-idx = attempt["idx"]
-qid = order[idx]
-q = by_id.get(qid)
-
-if not q:
-    st.error(f"Question not found in bank: {qid}")
+missing = next((qid for qid in order if qid not in by_id), None)
+if missing:
+    st.error(f"Question not found in bank: {missing}")
     reset_attempt()
     st.stop()
 
-st.markdown(f"## {q.get('title','')}")
-st.caption(f"{qid} • {q.get('topic','')} • {q.get('subtopic','')} • {q.get('difficulty','')}")
-
-st.markdown("### Question")
-st.write(q.get("prompt", ""))
-
-context = q.get("context")
-if context and str(context).strip():
-    st.markdown("### Context")
-    st.caption(context)
-
-artifacts = q.get("artifacts") or {}
-sample_docs = artifacts.get("sample_docs") or []
-if sample_docs:
-    st.markdown("### Sample docs")
-    st.json(sample_docs)
-
-st.divider()
-st.markdown("### Options")
-
-qtype = q.get("type", "single")
-choices = q.get("choices", [])
-choice_map = {c["key"]: c["text"] for c in choices}
-
-prev = attempt["answers"].get(qid, [])
-selected_keys: list[str] = []
-
-if qtype == "multi":
-    for k in ["A", "B", "C", "D"]:
-        if k not in choice_map:
-            continue
-        default_checked = k in prev
-        ck = st.checkbox(
-            f"{k}. {choice_map[k]}",
-            value=default_checked,
-            key=f"mock_opt_{qid}_{k}",
-        )
-        if ck:
-            selected_keys.append(k)
-else:
-    keys = [c["key"] for c in choices]
-    labels = [f"{k}. {choice_map[k]}" for k in keys]
-    default_index = 0
-    if prev and prev[0] in keys:
-        default_index = keys.index(prev[0])
-    picked = st.radio(
-        "Select one",
-        options=labels,
-        index=default_index,
-        key=f"mock_radio_{qid}",
-    )
-    selected_keys = [picked.split(".")[0]]
-
-attempt["answers"][qid] = selected_keys
-st.session_state.attempt = attempt
-
-# Navigation
-nav1, nav2, nav3, nav4, nav5 = st.columns([1, 1, 1.4, 1.2, 4.4])
-
-with nav1:
-    if st.button("Prev", disabled=idx == 0):
-        attempt["idx"] = max(0, idx - 1)
-        st.session_state.attempt = attempt
-        st.rerun()
-
-with nav2:
-    if st.button("Next", disabled=idx >= len(order) - 1):
-        attempt["idx"] = min(len(order) - 1, idx + 1)
-        st.session_state.attempt = attempt
-        st.rerun()
-
-with nav3:
-    marked = attempt["marked"]
-    is_marked = qid in marked
-    if st.button("Unmark" if is_marked else "Mark for review"):
-        if is_marked:
-            marked.remove(qid)
-        else:
-            marked.add(qid)
-        attempt["marked"] = marked
-        st.session_state.attempt = attempt
-        st.rerun()
-
-with nav4:
-    if st.button("Submit", type="primary"):
-        attempt["submitted"] = True
-        st.session_state.attempt = attempt
-        st.rerun()
-
-st.caption("Typeform mode: one question at a time. No explanations until submission. Pool labels hidden by design.")
+# Question, options, counters and Prev/Next/Mark run as one fragment: a click
+# there reruns only the panel, not the bank lookups and timer above.
+question_panel(attempt, by_id)
@@ -1,10 +1,8 @@
 from __future__ import annotations
 
-import json
-import random
 import sys
+import time
 from pathlib import Path
-from datetime import datetime
 
 import streamlit as st
 
@@ -13,106 +11,64 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-JSONL_PATH = ROOT / "question_bank" / "v2" / "questions.jsonl"
-REVISION_PATH = ROOT / "data" / "revision.json"
+from src.data.question_bank import get_bank
+from src.data.revision_store import get_revision_store
 
 
-def load_questions():
-    if not JSONL_PATH.exists():
-        return []
-    rows = []
-    with JSONL_PATH.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            rows.append(json.loads(line))
-    return rows
-
-
-def load_revision():
-    if not REVISION_PATH.exists():
-        return {"items": {}}  # qid -> record
-    try:
-        return json.loads(REVISION_PATH.read_text(encoding="utf-8"))
-    except Exception:
-        return {"items": {}}
-
-
-def save_revision(state: dict):
-    REVISION_PATH.parent.mkdir(parents=True, exist_ok=True)
-    REVISION_PATH.write_text(json.dumps(state, indent=2, ensure_ascii=False), encoding="utf-8")
-
-
-def now_iso():
-    return datetime.now().isoformat(timespec="seconds")
-
-
-def grade_one(q: dict, selected: list[str]) -> bool:
-    correct = set((q.get("answer") or {}).get("keys", []))
-    return set(selected) == correct
-
-
-def add_to_revision(rev: dict, q: dict, selected: list[str], source: str):
+def add_to_revision(store, q: dict, selected: list[str], source: str):
     qid = q.get("id")
     if not qid:
         return
-
-    items = rev.setdefault("items", {})
-    rec = items.get(qid, {
-        "qid": qid,
-        "added_at": now_iso(),
-        "last_seen": None,
-        "times_seen": 0,
-        "times_wrong": 0,
-        "times_correct": 0,
-        "last_selected": [],
-        "source": source,
-    })
-
-    rec["last_seen"] = now_iso()
-    rec["times_seen"] += 1
-    rec["times_wrong"] += 1
-    rec["last_selected"] = selected
-
-    items[qid] = rec
-
-
-def mark_correct(rev: dict, qid: str, selected: list[str]):
-    items = rev.setdefault("items", {})
-    if qid not in items:
-        return
-    rec = items[qid]
-    rec["last_seen"] = now_iso()
-    rec["times_seen"] += 1
-    rec["times_correct"] += 1
-    rec["last_selected"] = selected
-    items[qid] = rec
-
-
-def remove_from_revision(rev: dict, qid: str):
-    items = rev.setdefault("items", {})
-    if qid in items:
-        del items[qid]
-
-
-def pick_revision_question(rev: dict, questions_by_id: dict, mode: str):
-    items = list((rev.get("items") or {}).values())
-    items = [x for x in items if x.get("qid") in questions_by_id]
-    if not items:
-        return None
-
-    # Simple priority strategies
-    if mode == "Most wrong first":
-        items.sort(key=lambda x: (x.get("times_wrong", 0), x.get("times_seen", 0)), reverse=True)
-        return questions_by_id[items[0]["qid"]]
-
-    if mode == "Least recently seen":
-        items.sort(key=lambda x: x.get("last_seen") or "")
-        return questions_by_id[items[0]["qid"]]
-
-    # Random
-    return questions_by_id[random.choice(items)["qid"]]
+    store.record_many(
+        [
+            {
+                "op": "wrong",
+                "qid": qid,
+                "selected": selected,
+                "source": source,
+                "topic": q.get("topic", "Unknown"),
+                "difficulty": q.get("difficulty", "Unknown"),
+            }
+        ]
+    )
+
+
+def mark_correct(store, qid: str, selected: list[str]):
+    store.record_many([{"op": "correct", "qid": qid, "selected": selected}])
+
+
+def remove_from_revision(store, qid: str):
+    store.remove(qid)
+
+
+PICK_MODES = {
+    "Due first (spaced repetition)": "due",
+    "Most wrong first": "most_wrong",
+    "Least recently seen": "least_recent",
+    "Random": "random",
+}
+
+
+def pick_revision_question(store, questions_by_id, mode: str, skipped: list[str]):
+    # Indexed query on the store; no per-rerun sort of the whole queue.
+    rec = store.pick(PICK_MODES[mode], valid=questions_by_id, exclude=skipped)
+    if rec is None and skipped:
+        skipped.clear()  # everything was skipped once; start over
+        rec = store.pick(PICK_MODES[mode], valid=questions_by_id)
+    if rec is None:
+        return None, None
+    return questions_by_id[rec["qid"]], rec
+
+
+def format_due(due_ts: float) -> str:
+    secs = due_ts - time.time()
+    if secs <= 0:
+        return "due now"
+    if secs < 3600:
+        return f"due in {int(secs // 60) + 1} min"
+    if secs < 86400:
+        return f"due in {secs / 3600:.0f} h"
+    return f"due in {secs / 86400:.0f} d"
 
 
 # -------------------------
@@ -121,58 +77,72 @@ def pick_revision_question(rev: dict, questions_by_id: dict, mode: str):
 st.set_page_config(page_title="Revision", layout="wide")
 st.title("Revision")
 
-questions = load_questions()
-if not questions:
+bank = get_bank()
+if not bank.rows:
     st.error("No questions found. Run: python -m scripts.build_bank")
     st.stop()
 
-by_id = {q.get("id"): q for q in questions if q.get("id")}
-rev = load_revision()
+by_id = bank.by_id
+store = get_revision_store()
 
-items = rev.get("items") or {}
-count = len(items)
+count = len(store)
+due_now = store.due_count()
 
 st.markdown("### Your revision queue")
-st.write(f"Questions in revision: **{count}**")
+st.write(f"Questions in revision: **{count}** (due now: **{due_now}**)")
 
 col1, col2, col3, col4 = st.columns([1.2, 1.2, 1, 4.6])
 
 with col1:
-    mode = st.selectbox("Pick strategy", ["Random", "Most wrong first", "Least recently seen"], index=1)
+    mode = st.selectbox("Pick strategy", list(PICK_MODES), index=0)
 
 with col2:
     show_list = st.checkbox("Show full list", value=False)
 
 with col3:
     if st.button("Clear all", type="secondary", disabled=count == 0):
-        rev = {"items": {}}
-        save_revision(rev)
+        store.clear()
         st.success("Revision list cleared.")
         st.rerun()
 
 if show_list and count > 0:
     st.markdown("#### Revision items")
     # Show a compact list
-    for qid, rec in list(items.items())[:200]:
-        q = by_id.get(qid)
+    for qid, rec in list(store.items.items())[:200]:
+        q = bank.row(qid)
         if not q:
             continue
         st.write(
             f"- **{qid}** — {q.get('title','')} "
-            f"(wrong: {rec.get('times_wrong',0)}, correct: {rec.get('times_correct',0)})"
+            f"(wrong: {rec.get('times_wrong',0)}, correct: {rec.get('times_correct',0)}, "
+            f"{format_due(rec.get('due_ts', 0))})"
         )
 
 st.divider()
 
 # Pick question
-q = pick_revision_question(rev, by_id, mode)
+# Keep the current question pinned until Next, so answering it (which
+# reschedules it) or toggling options doesn't swap the question underneath.
+skipped = st.session_state.setdefault("rev_skipped", [])
+current = st.session_state.get("rev_current")
+rec = store.get(current) if current in by_id and st.session_state.get("rev_mode") == mode else None
+if rec is None:
+    q, rec = pick_revision_question(store, by_id, mode, skipped)
+    st.session_state.rev_current = rec["qid"] if rec else None
+    st.session_state.rev_mode = mode
+    st.session_state.rev_answered = False
+else:
+    q = by_id[current]
 if not q:
     st.info("No questions in revision yet. Add wrong answers from Practice/Mock (next patch) or manually add.")
     st.stop()
 
 qid = q.get("id", "")
 st.markdown(f"## {q.get('title','')}")
-st.caption(f"{qid} • {q.get('topic','')} • {q.get('subtopic','')} • {q.get('difficulty','')}")
+st.caption(
+    f"{qid} • {q.get('topic','')} • {q.get('subtopic','')} • {q.get('difficulty','')} • "
+    f"{format_due(rec.get('due_ts', 0))}"
+)
 
 st.markdown("### Question")
 st.write(q.get("prompt", ""))
@@ -214,17 +184,21 @@ colA, colB, colC = st.columns([1, 1.2, 4.8])
 
 with colA:
     if st.button("Submit", type="primary"):
-        ok = grade_one(q, user_keys)
+        ok = bank.grader.is_correct(qid, user_keys)
+        # Only the first Submit on a card view is recorded, so a repeat
+        # can't log the answer or advance the SM-2 schedule twice.
+        first_submit = not st.session_state.get("rev_answered")
+        st.session_state.rev_answered = True
 
         if ok:
             st.success("✅ Correct")
-            mark_correct(rev, qid, user_keys)
-            save_revision(rev)
+            if first_submit:
+                mark_correct(store, qid, user_keys)
         else:
             st.error("❌ Incorrect")
             # keep it in revision and record wrong
-            add_to_revision(rev, q, user_keys, source="revision")
-            save_revision(rev)
+            if first_submit:
+                add_to_revision(store, q, user_keys, source="revision")
 
         # show explanation
         r = q.get("rationale") or {}
@@ -253,13 +227,15 @@ with colA:
 
 with colB:
     if st.button("Remove from revision"):
-        remove_from_revision(rev, qid)
-        save_revision(rev)
+        remove_from_revision(store, qid)
         st.success("Removed.")
         st.rerun()
 
 with colC:
     if st.button("Next"):
+        if not st.session_state.get("rev_answered"):
+            skipped.append(qid)
+        st.session_state.rev_current = None
         # clear widget state for new question
         for k in list(st.session_state.keys()):
             if str(k).startswith("rev_opt_") or str(k).startswith("rev_radio_"):
@@ -1,82 +1,62 @@
 from __future__ import annotations
 
-import json
 import sys
 from pathlib import Path
 
+import plotly.express as px
 import streamlit as st
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-JSONL_PATH = ROOT / "question_bank" / "v2" / "questions.jsonl"
-REVISION_PATH = ROOT / "data" / "revision.json"
-MOCK_HISTORY_PATH = ROOT / "data" / "mock_history.json"
-
-
-def load_jsonl(path: Path):
-    if not path.exists():
-        return []
-    rows = []
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                rows.append(json.loads(line))
-    return rows
-
-
-def load_json(path: Path, default):
-    if not path.exists():
-        return default
-    try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except Exception:
-        return default
+from src.data.analytics import PASS_PCT, get_analytics
+from src.data.history_store import get_history_store
+from src.data.question_bank import get_bank
+from src.data.revision_store import get_revision_store
 
 
 st.set_page_config(page_title="Stats", layout="wide")
 st.title("Stats")
 
-questions = load_jsonl(JSONL_PATH)
-revision = load_json(REVISION_PATH, {"items": {}})
-history = load_json(MOCK_HISTORY_PATH, {"attempts": []})
+bank = get_bank()
+history = get_history_store()
 
-published = [q for q in questions if q.get("status") == "published"]
-exam_pool = [q for q in published if (q.get("exam_relevance") or {}).get("pool") == "exam"]
-learn_pool = [q for q in published if (q.get("exam_relevance") or {}).get("pool") == "learning"]
+published = bank.published
+exam_pool = bank.published_exam
+learn_pool = bank.published_learning
 
-rev_items = revision.get("items") or {}
-attempts = history.get("attempts") or []
+revision = get_revision_store()
+rev_count = len(revision)
+attempt_count = history.count()
+last = history.last()
 
 # --- Top KPIs ---
 k1, k2, k3, k4 = st.columns(4)
 k1.metric("Published Questions", str(len(published)))
 k2.metric("Exam Pool", str(len(exam_pool)))
 k3.metric("Learning Pool", str(len(learn_pool)))
-k4.metric("Revision Queue", str(len(rev_items)))
+k4.metric("Revision Queue", str(rev_count))
 
 st.divider()
 
 # --- Mock performance summary ---
 st.markdown("## Mock Exam Performance")
 
-if not attempts:
+if last is None:
     st.info("No mock attempts yet. Take one mock exam to populate stats.")
 else:
-    last = attempts[-1]
     c1, c2, c3, c4 = st.columns(4)
     c1.metric("Last Score", f"{last.get('score',0)}/{last.get('total',0)}")
     c2.metric("Last %", f"{last.get('pct',0)}%")
-    c3.metric("Attempts", str(len(attempts)))
+    c3.metric("Attempts", str(attempt_count))
 
-    best = max(attempts, key=lambda a: a.get("pct", 0))
+    best = history.best()
     c4.metric("Best %", f"{best.get('pct',0)}%")
 
     # show recent attempts table-like
     st.markdown("### Recent attempts (latest 10)")
-    for a in attempts[-10:][::-1]:
+    for a in history.recent(10):
         st.write(
             f"- **{a.get('ts','')}** — {a.get('score',0)}/{a.get('total',0)} "
             f"({a.get('pct',0)}%) • mix: {a.get('mode','')}"
@@ -84,25 +64,60 @@ else:
 
 st.divider()
 
-# --- Weak areas (from Revision + mock history) ---
-st.markdown("## Weak Areas")
+# --- Trends (columnar analytics, cached per data version) ---
+ROLLING_WINDOW = 5
+
+if last is not None:
+    st.markdown("## Trends")
+    analytics = get_analytics()
+    est = analytics.pass_probability()
+
+    t1, t2, t3 = st.columns(3)
+    t1.metric(f"Pass probability (≥{PASS_PCT:.0f}%)", f"{est['probability']:.0%}" if est else "—")
+    t2.metric("Expected score", f"{est['expected_pct']:.1f}% ± {est['sd_pct']:.1f}" if est else "—")
+    t3.metric("Answers analysed", str(len(analytics)))
+
+    rolling = analytics.rolling_accuracy(ROLLING_WINDOW)
+    fig = px.line(
+        rolling,
+        x="n",
+        y=["pct", "rolling"],
+        markers=True,
+        labels={"n": "Attempt", "value": "Score %", "variable": ""},
+        title=f"Mock score and {ROLLING_WINDOW}-attempt rolling average",
+    )
+    fig.add_hline(y=PASS_PCT, line_dash="dot")
+    st.plotly_chart(fig, use_container_width=True)
+
+    trend = analytics.domain_trend(ROLLING_WINDOW)
+    if not trend.empty:
+        fig = px.line(
+            trend,
+            x="n",
+            y="rolling",
+            color="domain",
+            labels={"n": "Attempt", "rolling": "Accuracy %", "domain": "Domain"},
+            title=f"Accuracy by domain ({ROLLING_WINDOW}-attempt rolling)",
+        )
+        st.plotly_chart(fig, use_container_width=True)
 
-# From revision: count by topic/difficulty
-by_topic = {}
-by_diff = {}
+    times = analytics.time_percentiles("domain")
+    if not times.empty:
+        st.markdown("### Seconds per question")
+        st.dataframe(times.round(1), use_container_width=True)
 
-# Map question id -> topic/diff
-by_id = {q.get("id"): q for q in questions if q.get("id")}
+    if est:
+        with st.expander("Pass estimate by domain"):
+            st.dataframe(est["by_domain"].round(1), use_container_width=True)
 
-for qid, rec in rev_items.items():
-    q = by_id.get(qid)
-    if not q:
-        continue
-    t = q.get("topic", "Unknown")
-    d = q.get("difficulty", "Unknown")
+    st.divider()
 
-    by_topic[t] = by_topic.get(t, 0) + 1
-    by_diff[d] = by_diff.get(d, 0) + 1
+# --- Weak areas (from Revision + mock history) ---
+st.markdown("## Weak Areas")
+
+# From revision: count by topic/difficulty (maintained as items come and go)
+by_topic = revision.counts_by("topic")
+by_diff = revision.counts_by("difficulty")
 
 c1, c2 = st.columns(2)
 
@@ -125,43 +140,44 @@ st.divider()
 # --- Topic accuracy from mocks (aggregated) ---
 st.markdown("## Accuracy by Topic (from mocks)")
 
-if not attempts:
+if last is None:
     st.info("Take at least 1 mock exam to see accuracy breakdown.")
 else:
-    agg = {}
-    for a in attempts:
-        bt = a.get("by_topic") or {}
-        for topic, vals in bt.items():
-            agg.setdefault(topic, {"correct": 0, "total": 0})
-            agg[topic]["correct"] += vals.get("correct", 0)
-            agg[topic]["total"] += vals.get("total", 0)
-
-    # compute accuracy
-    acc = []
-    for topic, vals in agg.items():
-        total = vals["total"]
-        correct = vals["correct"]
-        pct = (correct / total) * 100 if total else 0
-        acc.append((topic, correct, total, pct))
-
-    acc.sort(key=lambda x: x[3])  # weakest first
+    # precomputed rollups: one small indexed read per dimension
+    def weakest_first(dim: str) -> list[dict]:
+        rows = history.rollup(dim)
+        for r in rows:
+            r["pct"] = (r["correct"] / r["total"]) * 100 if r["total"] else 0
+        return sorted(rows, key=lambda r: r["pct"])
+
+    def accuracy_line(r: dict) -> str:
+        line = f"- **{r['key']}**: {r['correct']}/{r['total']} ({r['pct']:.1f}%)"
+        if r["avg_time_ms"] is not None:
+            line += f" • {r['avg_time_ms'] / 1000:.0f}s per question"
+        return line
 
     st.markdown("### Weakest topics first")
-    for topic, correct, total, pct in acc[:12]:
-        st.write(f"- **{topic}**: {correct}/{total} ({pct:.1f}%)")
+    for r in weakest_first("topic")[:12]:
+        st.write(accuracy_line(r))
+
+    by_domain = weakest_first("domain")
+    if by_domain:
+        st.markdown("### By exam domain")
+        for r in by_domain:
+            st.write(accuracy_line(r))
 
 st.divider()
 
 # --- Quick action suggestions ---
 st.markdown("## What to do next")
 
-if len(rev_items) > 0:
+if rev_count > 0:
     st.write("✅ Do a **Revision session** until your revision queue drops.")
 else:
     st.write("✅ Your revision queue is empty — take a mock exam to discover weak areas.")
 
-if attempts:
-    last_pct = attempts[-1].get("pct", 0)
+if last is not None:
+    last_pct = last.get("pct", 0)
     if last_pct < 70:
         st.write("✅ Focus on **Concept repair** (Practice + Revision), then retake mock.")
     else:
@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import json
-import subprocess
 from pathlib import Path
 
 import streamlit as st
@@ -14,18 +12,26 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from scripts.build_bank import build_bank
+from scripts.validate_bank import validate_bank
+from src.data.question_bank import close_bank, get_bank, reload_bank
 from src.ui.components import render_question_preview
 
 ROOT = Path(__file__).resolve().parents[1]
 YAML_DIR = ROOT / "question_bank" / "v2" / "questions"
-JSONL_PATH = ROOT / "question_bank" / "v2" / "questions.jsonl"
 
 
-def run_cmd(cmd: list[str]) -> tuple[int, str]:
-    """Run command and return (returncode, combined_output)."""
-    p = subprocess.run(cmd, cwd=str(ROOT), capture_output=True, text=True)
-    out = (p.stdout or "") + (p.stderr or "")
-    return p.returncode, out.strip()
+def file_results_table(files) -> list[dict]:
+    return [
+        {
+            "file": f.name,
+            "ok": f.ok,
+            "parse_ms": round(f.parse_ms, 2),
+            "validate_ms": round(f.validate_ms, 2),
+            "error": f.error or "",
+        }
+        for f in files
+    ]
 
 
 def list_yaml_files():
@@ -34,19 +40,6 @@ def list_yaml_files():
     return files
 
 
-def load_jsonl_questions():
-    if not JSONL_PATH.exists():
-        return []
-    rows = []
-    with JSONL_PATH.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            rows.append(json.loads(line))
-    return rows
-
-
 def admin_gate():
     # Optional admin password gate.
     # If you don't set ADMIN_PASSWORD in secrets, the page is open.
@@ -170,6 +163,9 @@ updated_at: "2025-12-14"
             with out_path.open("w", encoding="utf-8") as f:
                 yaml.safe_dump(obj, f, sort_keys=False, allow_unicode=True, width=110)
 
+            # Hint for the next Build so this file is re-read even if its mtime is unchanged.
+            st.session_state.setdefault("admin_changed", []).append(str(out_path))
+
             st.success(f"Saved: {out_path.relative_to(ROOT)}")
             st.info("Next: run Validate tab → then Build tab.")
         except Exception as e:
@@ -182,12 +178,14 @@ with tabs[1]:
     st.subheader("Validate bank (YAML)")
 
     if st.button("Run validation", type="primary"):
-        rc, out = run_cmd(["python", "-m", "scripts.validate_bank"])
-        if rc == 0:
-            st.success(out or "VALIDATION PASSED ✅")
+        report = validate_bank()
+        if report.ok:
+            st.success(report.format())
         else:
             st.error("VALIDATION FAILED ❌")
-            st.code(out or "(no output)", language="text")
+            st.code(report.format(), language="text")
+        with st.expander("Per-file results", expanded=not report.ok):
+            st.dataframe(file_results_table(report.files), use_container_width=True)
 
 # -------------------------
 # Tab 3: Build
@@ -196,13 +194,22 @@ with tabs[2]:
     st.subheader("Build bank (compile YAML → JSONL)")
 
     if st.button("Build JSONL", type="primary"):
-        rc, out = run_cmd(["python", "-m", "scripts.build_bank"])
-        if rc == 0:
+        changed = [Path(p) for p in st.session_state.get("admin_changed", [])]
+        # Release the cached bank's questions.bin mapping first: Windows
+        # refuses to replace a mapped file. The next get_bank() reloads it.
+        close_bank()
+        result = build_bank(changed=changed)
+        if result.ok:
+            st.session_state["admin_changed"] = []
+            if not result.up_to_date:
+                # Swap the process-wide bank so every session sees the new build.
+                reload_bank()
             st.success("Build successful ✅")
-            st.code(out or "(no output)", language="text")
+            st.code(result.format(), language="text")
         else:
             st.error("Build failed ❌")
-            st.code(out or "(no output)", language="text")
+            st.code(result.format(), language="text")
+            st.dataframe(file_results_table(result.errors), use_container_width=True)
 
 # -------------------------
 # Tab 4: Preview
@@ -210,14 +217,14 @@ with tabs[2]:
 with tabs[3]:
     st.subheader("Preview how a question will render")
 
-    questions = load_jsonl_questions()
-    if not questions:
+    bank = get_bank()
+    if not bank.rows:
         st.info("No compiled questions found. Run Build first.")
     else:
-        ids = [q.get("id", "") for q in questions if q.get("id")]
+        ids = list(bank.by_id)
         selected = st.selectbox("Select question", ids)
 
-        q = next((x for x in questions if x.get("id") == selected), None)
+        q = bank.get(selected)
         if q:
             # IMPORTANT: do not show pool information to the user in normal flows.
             # In admin preview, we still avoid highlighting pool by default.
@@ -232,20 +239,17 @@ with tabs[4]:
     yfiles = list_yaml_files()
     st.write(f"YAML files: **{len(yfiles)}** in `{YAML_DIR.relative_to(ROOT)}`")
 
-    questions = load_jsonl_questions()
-    st.write(f"Compiled JSONL questions: **{len(questions)}**")
+    bank = get_bank()
+    st.write(f"Compiled JSONL questions: **{len(bank)}**")
 
-    if questions:
-        published = sum(1 for q in questions if q.get("status") == "published")
-        drafts = sum(1 for q in questions if q.get("status") == "draft")
+    if bank.rows:
+        published = len(bank.by_status.get("published", []))
+        drafts = len(bank.by_status.get("draft", []))
         st.write(f"Published: **{published}** | Draft: **{drafts}**")
 
         # quick distribution
-        by_topic = {}
-        by_diff = {}
-        for q in questions:
-            by_topic[q.get("topic", "Unknown")] = by_topic.get(q.get("topic", "Unknown"), 0) + 1
-            by_diff[q.get("difficulty", "Unknown")] = by_diff.get(q.get("difficulty", "Unknown"), 0) + 1
+        by_topic = {t: len(qs) for t, qs in bank.by_topic.items()}
+        by_diff = {d: len(qs) for d, qs in bank.by_difficulty.items()}
 
         c1, c2 = st.columns(2)
         with c1:
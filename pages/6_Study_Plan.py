@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import sys
 from pathlib import Path
 from datetime import date, timedelta
@@ -11,30 +10,9 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-JSONL_PATH = ROOT / "question_bank" / "v2" / "questions.jsonl"
-REVISION_PATH = ROOT / "data" / "revision.json"
-MOCK_HISTORY_PATH = ROOT / "data" / "mock_history.json"
-
-
-def load_jsonl(path: Path):
-    if not path.exists():
-        return []
-    rows = []
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                rows.append(json.loads(line))
-    return rows
-
-
-def load_json(path: Path, default):
-    if not path.exists():
-        return default
-    try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except Exception:
-        return default
+from src.data.history_store import get_history_store
+from src.data.question_bank import get_bank
+from src.data.revision_store import get_revision_store
 
 
 def pct(a: float, b: float) -> float:
@@ -167,44 +145,27 @@ def make_plan(
 st.set_page_config(page_title="Study Plan", layout="wide")
 st.title("Study Plan")
 
-questions = load_jsonl(JSONL_PATH)
-revision = load_json(REVISION_PATH, {"items": {}})
-history = load_json(MOCK_HISTORY_PATH, {"attempts": []})
+bank = get_bank()
+history = get_history_store()
 
-published = [q for q in questions if q.get("status") == "published"]
-exam_pool = [q for q in published if (q.get("exam_relevance") or {}).get("pool") == "exam"]
+published = bank.published
+exam_pool = bank.published_exam
 
-rev_items = revision.get("items") or {}
-attempts = history.get("attempts") or []
+revision = get_revision_store()
+rev_count = len(revision)
+last = history.last()
 
 # Weak topics from revision (counts)
-by_id = {q.get("id"): q for q in questions if q.get("id")}
-rev_topic_counts = {}
-for qid in rev_items.keys():
-    q = by_id.get(qid)
-    if not q:
-        continue
-    t = q.get("topic", "Unknown")
-    rev_topic_counts[t] = rev_topic_counts.get(t, 0) + 1
+rev_topic_counts = revision.counts_by("topic")
 
 # Weak topics from mocks (lowest accuracy)
 weak_from_mocks = []
 last_mock_pct = None
-if attempts:
-    last_mock_pct = attempts[-1].get("pct", None)
-
-    agg = {}
-    for a in attempts:
-        bt = a.get("by_topic") or {}
-        for topic, vals in bt.items():
-            agg.setdefault(topic, {"correct": 0, "total": 0})
-            agg[topic]["correct"] += vals.get("correct", 0)
-            agg[topic]["total"] += vals.get("total", 0)
+if last is not None:
+    last_mock_pct = last.get("pct", None)
 
     acc = []
-    for topic, vals in agg.items():
-        total = vals["total"]
-        correct = vals["correct"]
+    for topic, correct, total in history.topic_accuracy():
         acc.append((topic, pct(correct, total)))
     acc.sort(key=lambda x: x[1])  # weakest first
     weak_from_mocks = [t for t, _p in acc[:6]]
@@ -236,7 +197,7 @@ with c3:
 k1, k2, k3, k4 = st.columns(4)
 k1.metric("Published bank", str(len(published)))
 k2.metric("Exam pool", str(len(exam_pool)))
-k3.metric("Revision queue", str(len(rev_items)))
+k3.metric("Revision queue", str(rev_count))
 k4.metric("Last mock %", f"{last_mock_pct}%" if last_mock_pct is not None else "—")
 
 st.divider()
@@ -252,7 +213,7 @@ else:
 plan_obj = make_plan(
     horizon_days=horizon,
     minutes_per_day=minutes,
-    revision_count=len(rev_items),
+    revision_count=rev_count,
     last_mock_pct=last_mock_pct,
     weakest_topics=weakest_topics,
     exam_pool_size=len(exam_pool),
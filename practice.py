@@ -5,6 +5,7 @@ from exam_mode import ExamModeManager
 from question_display import QuestionDisplay
 from dashboard import Dashboard
 from user_manager import UserManager
+from question_buffer import get_question_buffer
 
 # === PAGE CONFIG ===
 st.set_page_config(page_title="MongoDB Associate Exam Prep", layout="wide")
@@ -16,6 +17,16 @@ stats_manager = StatsManager(user_manager)
 exam_manager = ExamModeManager(user_manager)
 question_display = QuestionDisplay(stats_manager)
 dashboard = Dashboard(stats_manager, user_manager)
+question_buffer = get_question_buffer(db.collection)
+
+
+def next_question(domain_keywords=None):
+    """
+    Next question from the session's prefetch buffer. A filter that has shown
+    every match starts another round on its own, so None means the filter
+    matches no question at all.
+    """
+    return question_buffer.next(domain_keywords)
 
 # === SESSION STATE SETUP ===
 if "question_doc" not in st.session_state:
@@ -95,11 +106,11 @@ if page == "🎯 Practice Mode":
     with col2:
         if st.button("🔄 New Question"):
             domain_keywords = stats_manager.exam_domains.get(selected_domain) if selected_domain != "All Topics" else None
-            new_question = db.get_filtered_question(domain_keywords)
+            new_question = next_question(domain_keywords)
             
             if new_question is None and selected_domain != "All Topics":
                 st.warning(f"No questions found for {selected_domain}. Getting a random question instead.")
-                new_question = db.get_random_question()
+                new_question = next_question()
             
             st.session_state["question_doc"] = new_question
             st.session_state["submitted"] = False
@@ -108,12 +119,12 @@ if page == "🎯 Practice Mode":
     # Get question if none exists
     if st.session_state["question_doc"] is None:
         domain_keywords = stats_manager.exam_domains.get(selected_domain) if selected_domain != "All Topics" else None
-        st.session_state["question_doc"] = db.get_filtered_question(domain_keywords)
+        st.session_state["question_doc"] = next_question(domain_keywords)
         
         # If no questions found for the selected domain, show warning and get random question
         if st.session_state["question_doc"] is None and selected_domain != "All Topics":
             st.warning(f"No questions found for {selected_domain}. Showing a random question instead.")
-            st.session_state["question_doc"] = db.get_random_question()
+            st.session_state["question_doc"] = next_question()
 
     question_doc = st.session_state["question_doc"]
 
@@ -165,14 +176,14 @@ elif page == "⏱️ Exam Simulation":
         with col1:
             if st.button("🚀 Start Custom Exam", type="primary"):
                 exam_manager.start_exam(num_questions, time_limit)
-                st.session_state["question_doc"] = db.get_random_question()
+                st.session_state["question_doc"] = next_question()
                 st.session_state["submitted"] = False
                 st.rerun()
         
         with col2:
             if st.button("📚 Quick Practice (10q, 20min)", type="secondary"):
                 exam_manager.start_exam(10, 20)
-                st.session_state["question_doc"] = db.get_random_question()
+                st.session_state["question_doc"] = next_question()
                 st.session_state["submitted"] = False
                 st.rerun()
 
@@ -228,7 +239,7 @@ elif page == "⏱️ Exam Simulation":
                         st.success("🎉 Exam completed! Results have been saved.")
                         st.rerun()
                     else:
-                        st.session_state["question_doc"] = db.get_random_question()
+                        st.session_state["question_doc"] = next_question()
                         st.session_state["submitted"] = False
                         st.rerun()
 
@@ -0,0 +1,143 @@
+# question_buffer.py
+#
+# Per-session prefetch of random questions. Instead of one $sample round trip
+# per "Next Question", each domain filter keeps a local queue filled by a
+# single $match + $sample aggregation of BATCH_SIZE questions; when a queue
+# drops below LOW_WATER a background thread fetches the next batch, so the
+# next pick is normally a pop from memory.
+
+import threading
+from collections import OrderedDict, deque
+
+import streamlit as st
+
+from question_tags import keyword_query
+
+BATCH_SIZE = 20
+LOW_WATER = 5
+# Questions a filter remembers as recently shown. Bounds the $nin list of
+# every refill query, whatever the length of the session.
+RECENT_LIMIT = 200
+
+
+class QuestionBuffer:
+    """
+    Random questions without repeats for one session.
+
+    Each filter keeps its own window of the last `recent_limit` questions it
+    handed out; fetches skip that window and what the filter already has
+    queued, so the refill query stays a fixed size. When a filter has nothing
+    unseen left, its window is recycled and the round starts over; `next()`
+    returns None only if no question matches the filter at all.
+    """
+
+    def __init__(self, collection, batch_size=BATCH_SIZE, low_water=LOW_WATER, recent_limit=RECENT_LIMIT):
+        self.collection = collection
+        self.batch_size = batch_size
+        self.low_water = low_water
+        self.recent_limit = recent_limit
+        self._lock = threading.Lock()
+        self._queues = {}
+        self._queued = {}
+        self._recent = {}
+        self._refilling = set()
+        self._exhausted = set()
+        self._generation = 0
+
+    @staticmethod
+    def _key(domain_keywords):
+        return tuple(sorted({k.lower() for k in domain_keywords})) if domain_keywords else ()
+
+    def _pipeline(self, key, exclude):
+        match = {"_id": {"$nin": list(exclude)}}
+        if key:
+            match = {"$and": [keyword_query(key), match]}
+        return [{"$match": match}, {"$sample": {"size": self.batch_size}}]
+
+    def _fetch(self, key):
+        """One aggregation for up to batch_size unseen questions; queues them."""
+        with self._lock:
+            recent = self._recent.get(key, {})
+            exclude = set(recent) | self._queued.get(key, set())
+            generation = self._generation
+        docs = list(self.collection.aggregate(self._pipeline(key, exclude)))
+        with self._lock:
+            if generation != self._generation:  # reset() while fetching
+                return
+            recent = self._recent.get(key, {})
+            queued = self._queued.setdefault(key, set())
+            fresh = [d for d in docs if d["_id"] not in recent and d["_id"] not in queued]
+            self._queues.setdefault(key, deque()).extend(fresh)
+            queued.update(d["_id"] for d in fresh)
+            if not docs:
+                self._exhausted.add(key)
+
+    def _refill(self, key):
+        try:
+            self._fetch(key)
+        finally:
+            with self._lock:
+                self._refilling.discard(key)
+
+    def _remember(self, key, _id):
+        recent = self._recent.setdefault(key, OrderedDict())
+        recent[_id] = None
+        if len(recent) > self.recent_limit:
+            recent.popitem(last=False)
+
+    def _pop(self, key):
+        queue = self._queues.get(key)
+        recent = self._recent.get(key, {})
+        while queue:
+            doc = queue.popleft()
+            self._queued[key].discard(doc["_id"])
+            if doc["_id"] not in recent:
+                self._remember(key, doc["_id"])
+                return doc
+        return None
+
+    def _recycle(self, key):
+        """Every question for this filter has been shown: start another round."""
+        self._recent.pop(key, None)
+        self._exhausted.discard(key)
+
+    def next(self, domain_keywords=None):
+        """A random question matching `domain_keywords` (None = any question) not shown recently."""
+        key = self._key(domain_keywords)
+        with self._lock:
+            doc = self._pop(key)
+        for _ in range(2):
+            if doc is not None:
+                break
+            with self._lock:
+                if key in self._exhausted:
+                    self._recycle(key)
+            # Cold or recycled queue: wait for one batch.
+            self._fetch(key)
+            with self._lock:
+                doc = self._pop(key)
+
+        with self._lock:
+            low = len(self._queues.get(key, ())) < self.low_water
+            if low and key not in self._exhausted and key not in self._refilling:
+                self._refilling.add(key)
+                threading.Thread(target=self._refill, args=(key,), daemon=True).start()
+        return doc
+
+    def reset(self):
+        """Forget what this session has seen; every question is eligible again."""
+        with self._lock:
+            self._generation += 1
+            self._queues.clear()
+            self._queued.clear()
+            self._recent.clear()
+            self._exhausted.clear()
+
+
+def get_question_buffer(collection):
+    """The QuestionBuffer for the current Streamlit session."""
+    buffer = st.session_state.get("question_buffer")
+    if buffer is None or buffer.collection != collection:
+        buffer = QuestionBuffer(collection)
+        st.session_state["question_buffer"] = buffer
+    return buffer
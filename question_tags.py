@@ -0,0 +1,71 @@
+# question_tags.py
+#
+# Search fields precomputed on every document in the `questions` collection,
+# so domain filtering is an index lookup instead of a regex collection scan:
+#
+#   keywords: the EXAM_DOMAINS keywords (lowercase) found in SEARCH_FIELDS
+#   domain:   the first exam domain with a keyword match, else "Other"
+#
+# Written by scripts.migrate_question_tags for existing documents and on
+# every insert/edit by the upload and admin pages.
+
+EXAM_DOMAINS = {
+    "CRUD Operations": ["CRUD", "Insert", "Update", "Delete", "Find"],
+    "Aggregation": ["Aggregation", "Pipeline", "Match", "Group", "Project"],
+    "Indexing": ["Indexes", "Index", "Compound Indexes", "Text Index"],
+    "Data Modeling": ["Schema", "Data Model", "Document Design", "References"],
+    "Tools & Deployment": ["Tools", "Deployment", "Compass", "Atlas", "Mongosh"]
+}
+
+# Fields the keywords are matched against (case-insensitive substring, like
+# the $regex filter this replaces: only string values and string array items).
+SEARCH_FIELDS = ("topic", "subtopic", "stem", "explanation")
+KEYWORDS = sorted({k.lower() for keywords in EXAM_DOMAINS.values() for k in keywords})
+INDEXES = ("keywords", "domain")
+
+
+def _texts(value):
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        return [v for v in value if isinstance(v, str)]
+    return []
+
+
+def question_keywords(doc):
+    text = "\n".join(t for f in SEARCH_FIELDS for t in _texts(doc.get(f))).lower()
+    return [k for k in KEYWORDS if k in text]
+
+
+def question_domain(keywords):
+    found = set(keywords)
+    for domain, domain_keywords in EXAM_DOMAINS.items():
+        if any(k.lower() in found for k in domain_keywords):
+            return domain
+    return "Other"
+
+
+def search_fields(doc):
+    """The derived fields to $set on `doc` after any change to SEARCH_FIELDS."""
+    keywords = question_keywords(doc)
+    return {"keywords": keywords, "domain": question_domain(keywords)}
+
+
+def keyword_query(domain_keywords):
+    """
+    $match for questions mentioning any of `domain_keywords`. Known keywords
+    use the `keywords` index; anything outside KEYWORDS falls back to the
+    old regex scan, since it was never precomputed.
+    """
+    wanted = {k.lower() for k in domain_keywords}
+    known = sorted(wanted & set(KEYWORDS))
+    unknown = sorted(wanted - set(KEYWORDS))
+    clauses = [{"keywords": {"$in": known}}] if known else []
+    for keyword in unknown:
+        clauses.extend({f: {"$regex": keyword, "$options": "i"}} for f in SEARCH_FIELDS)
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+
+def ensure_indexes(collection):
+    for field in INDEXES:
+        collection.create_index(field, name=f"{field}_1")
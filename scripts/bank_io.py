@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import glob
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+import yaml
+
+from src.domain.models import QuestionV2
+
+# libyaml's C loader is several times faster than the pure-Python one.
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+YAML_LOADER = SafeLoader.__name__
+
+
+def list_bank_files(bank_dir: Path) -> list[Path]:
+    return [Path(fp) for fp in sorted(glob.glob(str(bank_dir / "*.yaml"))) if not Path(fp).name.startswith("_")]
+
+
+def load_yaml(data: bytes | str):
+    return yaml.load(data, Loader=SafeLoader)
+
+
+def parse_and_validate(item: tuple[str, bytes]) -> dict:
+    """
+    Worker: YAML-parse and validate one file.
+
+    Module-level so it can be shipped to a process pool. Returns a plain dict
+    (name, dump, error, parse_s, validate_s) rather than raising.
+    """
+    name, data = item
+    out = {"name": name, "dump": None, "error": None, "parse_s": 0.0, "validate_s": 0.0}
+    t0 = time.perf_counter()
+    try:
+        raw = load_yaml(data)
+    except Exception as e:
+        out["parse_s"] = time.perf_counter() - t0
+        out["error"] = str(e)
+        return out
+    t1 = time.perf_counter()
+    out["parse_s"] = t1 - t0
+    try:
+        out["dump"] = QuestionV2.model_validate(raw).model_dump()
+    except Exception as e:
+        out["error"] = str(e)
+    out["validate_s"] = time.perf_counter() - t1
+    return out
+
+
+def run_parse_and_validate(items: list[tuple[str, bytes]], jobs: int = 1) -> list[dict]:
+    """Results come back in the order of `items`, whatever `jobs` is."""
+    if jobs <= 1 or len(items) < 2:
+        return [parse_and_validate(it) for it in items]
+    jobs = min(jobs, len(items))
+    chunksize = max(1, len(items) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as ex:
+        return list(ex.map(parse_and_validate, items, chunksize=chunksize))
+
+
+class PhaseTimer:
+    """Wall-clock time per named phase, printed as a small report."""
+
+    def __init__(self):
+        self.phases: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - t0
+
+    def add(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def as_ms(self) -> dict[str, float]:
+        return {name: round(secs * 1000, 2) for name, secs in self.phases.items()}
+
+    def report(self) -> str:
+        return format_timings(self.as_ms())
+
+
+def format_timings(timings_ms: dict[str, float]) -> str:
+    return "Timings: " + ", ".join(f"{name}={ms:.0f}ms" for name, ms in timings_ms.items())
+
+
+@dataclass
+class FileResult:
+    name: str
+    ok: bool
+    error: str | None = None
+    parse_ms: float = 0.0
+    validate_ms: float = 0.0
+
+
+def file_result(r: dict, error: str | None = None) -> FileResult:
+    err = error or r["error"]
+    return FileResult(
+        name=r["name"],
+        ok=err is None,
+        error=err,
+        parse_ms=r["parse_s"] * 1000,
+        validate_ms=r["validate_s"] * 1000,
+    )
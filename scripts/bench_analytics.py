@@ -0,0 +1,101 @@
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from src.data.analytics import get_analytics
+from src.data.history_store import MockHistoryStore
+from src.data.local_db import get_db
+from src.domain.domains import OFFICIAL_DOMAIN_PCTS
+
+# Time the Stats page analytics over a synthetic mock history in a scratch
+# database: the first full load, a cache hit, the incremental refresh after
+# one more attempt, then each statistic.
+#
+#   python -m scripts.bench_analytics --attempts 2000   # ~106k answer events
+
+
+def fill(store: MockHistoryStore, attempts: int, questions: int, seed: int = 0, start: int = 0):
+    r = random.Random(seed)
+    domains = list(OFFICIAL_DOMAIN_PCTS)
+    skill = {d: r.uniform(0.45, 0.85) for d in domains}
+    for i in range(start, start + attempts):
+        answers = []
+        for pos in range(questions):
+            d = r.choices(domains, weights=list(OFFICIAL_DOMAIN_PCTS.values()))[0]
+            # Slow, steady improvement so the trend lines have something to show.
+            ok = r.random() < min(0.98, skill[d] + i / attempts * 0.15)
+            answers.append({
+                "qid": f"BENCH-Q{r.randrange(5000):05d}",
+                "topic": d.title(),
+                "domain": d,
+                "difficulty": r.choice(["easy", "medium", "hard"]),
+                "selected": ["A"],
+                "correct": ok,
+                "time_ms": int(r.lognormvariate(10.3, 0.5)),
+            })
+        score = sum(a["correct"] for a in answers)
+        store.add_attempt(
+            {
+                "attempt_id": f"bench{i:06d}",
+                "ts": f"2026-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}.{i:06d}",
+                "total": questions,
+                "score": score,
+                "pct": round(score / questions * 100, 2),
+            },
+            answers,
+        )
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Stats analytics benchmark")
+    ap.add_argument("--attempts", type=int, default=2000, help="mock attempts to generate")
+    ap.add_argument("--questions", type=int, default=53, help="answers per attempt")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    db = get_db(Path(tempfile.mkdtemp()) / "bench.db")
+    t0 = time.perf_counter()
+    fill(MockHistoryStore(db), args.attempts, args.questions, args.seed)
+    fill_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    a = get_analytics(db)
+    load_ms = (time.perf_counter() - t0) * 1000
+    t0 = time.perf_counter()
+    assert get_analytics(db) is a
+    cached_ms = (time.perf_counter() - t0) * 1000
+
+    # One more attempt: only its answers are fetched.
+    history = MockHistoryStore(db)
+    fill(history, 1, args.questions, args.seed, start=args.attempts)
+    t0 = time.perf_counter()
+    a = get_analytics(db)
+    extend_ms = (time.perf_counter() - t0) * 1000
+    assert len(a.attempts) == args.attempts + 1
+
+    timings = {}
+    for name, fn in (
+        ("rolling_accuracy", a.rolling_accuracy),
+        ("domain_trend", a.domain_trend),
+        ("time_percentiles", a.time_percentiles),
+        ("pass_probability", a.pass_probability),
+    ):
+        t0 = time.perf_counter()
+        fn()
+        timings[name] = (time.perf_counter() - t0) * 1000
+
+    est = a.pass_probability()
+    print(f"attempts={args.attempts} answers={len(a)} (generated in {fill_s:.1f} s)")
+    print(f"load             : {load_ms:8.1f} ms  (full history, once per process)")
+    print(f"cached           : {cached_ms:8.2f} ms  (same data version)")
+    print(f"extend           : {extend_ms:8.1f} ms  (one new attempt)")
+    for name, ms in timings.items():
+        print(f"{name:17s}: {ms:8.1f} ms")
+    print(f"pass estimate: {est['probability']:.1%} (expected {est['expected_pct']:.1f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,95 @@
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from src.data.compiled_bank import write_compiled_bank
+from src.data.question_bank import JSONL_PATH, load_bank
+
+# Compare cold-load cost of the JSONL bank against the compiled .bin bank.
+#
+#   python -m scripts.bench_bank --sizes 1000 10000 100000
+#
+# Synthetic banks are made by cloning the real questions with fresh ids.
+
+
+def make_synthetic(seed_rows: list[dict], n: int) -> list[dict]:
+    out = []
+    for i in range(n):
+        q = dict(seed_rows[i % len(seed_rows)])
+        q["id"] = f"BENCH-Q{i:06d}"
+        out.append(q)
+    return out
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench_size(seed_rows: list[dict], n: int, repeat: int, render: int) -> dict:
+    rows = make_synthetic(seed_rows, n)
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl = Path(tmp) / "questions.jsonl"
+        with jsonl.open("w", encoding="utf-8") as f:
+            for r in rows:
+                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+        st = jsonl.stat()
+        write_compiled_bank(rows, jsonl.with_suffix(".bin"), source_stamp=(st.st_mtime_ns, st.st_size))
+
+        ids = random.Random(0).sample([r["id"] for r in rows], min(render, n))
+
+        def load_and_render():
+            bank = load_bank(jsonl)
+            for qid in ids:
+                bank.get(qid)
+            bank.close()
+
+        # load_bank prefers the .bin; hide it to time the JSONL path.
+        bin_path = jsonl.with_suffix(".bin")
+        hidden = bin_path.with_name("hidden.bin")
+        bin_path.rename(hidden)
+        t_jsonl = best_of(load_and_render, repeat)
+        hidden.rename(bin_path)
+        t_bin = best_of(load_and_render, repeat)
+
+        return {
+            "n": n,
+            "jsonl_mb": jsonl.stat().st_size / 1e6,
+            "bin_mb": bin_path.stat().st_size / 1e6,
+            "jsonl_ms": t_jsonl * 1000,
+            "bin_ms": t_bin * 1000,
+        }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="JSONL vs compiled bank load benchmark")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--render", type=int, default=53, help="questions decoded after load (one mock exam)")
+    args = ap.parse_args(argv)
+
+    seed = load_bank(JSONL_PATH)
+    seed_rows = [seed.get(r["id"]) for r in seed.rows]  # full bodies, not the slim index rows
+    if not seed_rows:
+        print(f"No questions found in {JSONL_PATH}. Run: python -m scripts.build_bank")
+        return 1
+
+    print(f"{'questions':>10} {'jsonl MB':>9} {'bin MB':>8} {'jsonl ms':>10} {'bin ms':>9} {'speedup':>8}")
+    for n in args.sizes:
+        r = bench_size(seed_rows, n, args.repeat, args.render)
+        print(
+            f"{r['n']:>10} {r['jsonl_mb']:>9.1f} {r['bin_mb']:>8.1f} "
+            f"{r['jsonl_ms']:>10.1f} {r['bin_ms']:>9.1f} {r['jsonl_ms'] / max(r['bin_ms'], 1e-9):>7.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
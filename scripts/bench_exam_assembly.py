@@ -0,0 +1,136 @@
+import argparse
+import random
+import time
+
+from src.domain.domains import OFFICIAL_DOMAIN_PCTS, normalize_domain
+from src.domain.exam_assembly import (
+    ConstrainedExamAssembler,
+    ExamAssembler,
+    ExamConstraints,
+    compute_domain_quotas,
+    make_rng,
+)
+
+# Time official-exam assembly: the per-attempt list rebuild the Mock page used
+# to do, the precomputed NumPy quota assembler, and the multi-constraint
+# generator (difficulty mix, multi share, subtopic cap, recent-question
+# avoidance) the Mock page now uses.
+#
+#   python -m scripts.bench_exam_assembly --pool 20000 --exams 10000
+#
+# The synthetic pool spreads questions over topics that map to every domain.
+
+TOPICS = [
+    ("CRUD", "insert"),
+    ("CRUD", "aggregation pipeline"),
+    ("Indexes", "compound index"),
+    ("Drivers", "pymongo"),
+    ("Data Modeling", "embedding"),
+    ("Tools", "mongosh"),
+    ("MongoDB Overview", "BSON data types"),
+]
+
+
+def make_pool(n: int, seed: int = 0) -> list[dict]:
+    r = random.Random(seed)
+    pool = []
+    for i in range(n):
+        topic, subtopic = r.choice(TOPICS)
+        pool.append({
+            "id": f"BENCH-Q{i:06d}",
+            "topic": topic,
+            "subtopic": f"{subtopic} {r.randint(1, 40)}",
+            "difficulty": r.choice(["easy", "easy", "medium", "medium", "hard"]),
+            "type": "multi" if r.random() < 0.15 else "single",
+        })
+    return pool
+
+
+def legacy_select(exam_pool: list[dict], total_q: int) -> list[dict]:
+    """The previous per-attempt algorithm, kept here as the baseline."""
+    quotas = compute_domain_quotas(total_q)
+    buckets: dict[str, list[dict]] = {k: [] for k in OFFICIAL_DOMAIN_PCTS}
+    for q in exam_pool:
+        d = normalize_domain(q)
+        if d in buckets:
+            buckets[d].append(q)
+
+    chosen: list[dict] = []
+    chosen_ids: set[str] = set()
+    for d, qn in quotas.items():
+        pool = [q for q in buckets.get(d, []) if q["id"] not in chosen_ids]
+        for qq in random.sample(pool, min(qn, len(pool))):
+            chosen.append(qq)
+            chosen_ids.add(qq["id"])
+
+    fill_needed = total_q - len(chosen)
+    if fill_needed > 0:
+        remaining = [q for q in exam_pool if q["id"] not in chosen_ids]
+        chosen.extend(random.sample(remaining, min(fill_needed, len(remaining))))
+    random.shuffle(chosen)
+    return chosen
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Official exam assembly benchmark")
+    ap.add_argument("--pool", type=int, default=20000, help="exam-pool questions")
+    ap.add_argument("--exams", type=int, default=10000, help="exams to assemble")
+    ap.add_argument("--questions", type=int, default=53, help="questions per exam")
+    ap.add_argument("--legacy-exams", type=int, default=200, help="exams for the (slow) baseline")
+    ap.add_argument("--constrained-exams", type=int, default=1000, help="exams for the constrained generator")
+    ap.add_argument("--avoid", type=int, default=159, help="recently seen questions to avoid (3 x 53)")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    pool = make_pool(args.pool, args.seed)
+
+    t0 = time.perf_counter()
+    for _ in range(args.legacy_exams):
+        legacy_select(pool, args.questions)
+    legacy_ms = (time.perf_counter() - t0) * 1000 / max(1, args.legacy_exams)
+
+    t0 = time.perf_counter()
+    assembler = ExamAssembler([normalize_domain(q) for q in pool])
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    rng = make_rng(args.seed)
+    t0 = time.perf_counter()
+    for _ in range(args.exams):
+        positions, _dbg = assembler.assemble(args.questions, rng=rng)
+    total_s = time.perf_counter() - t0
+    per_ms = total_s * 1000 / max(1, args.exams)
+
+    # Same seed, same exam.
+    a, _ = assembler.assemble(args.questions, rng=42)
+    b, _ = assembler.assemble(args.questions, rng=42)
+    assert (a == b).all()
+
+    domains = [normalize_domain(q) for q in pool]
+    t0 = time.perf_counter()
+    constrained = ConstrainedExamAssembler(pool, domains)
+    cbuild_ms = (time.perf_counter() - t0) * 1000
+    avoid = [q["id"] for q in pool[: args.avoid]]
+    constraints = ExamConstraints(total_q=args.questions, avoid_ids=avoid)
+    worst_ms = 0.0
+    relaxed = 0
+    t0 = time.perf_counter()
+    for _ in range(args.constrained_exams):
+        t1 = time.perf_counter()
+        _positions, dbg = constrained.assemble(constraints, rng=rng)
+        worst_ms = max(worst_ms, (time.perf_counter() - t1) * 1000)
+        relaxed += bool(dbg["relaxed"])
+    cper_ms = (time.perf_counter() - t0) * 1000 / max(1, args.constrained_exams)
+
+    print(f"pool={args.pool} questions/exam={args.questions}")
+    print(f"legacy    : {legacy_ms:8.3f} ms/exam  ({args.legacy_exams} exams)")
+    print(f"assembler : {per_ms:8.3f} ms/exam  ({args.exams} exams in {total_s:.2f} s, build {build_ms:.0f} ms once)")
+    print(f"speedup   : {legacy_ms / max(per_ms, 1e-9):.1f}x")
+    print(
+        f"constrained: {cper_ms:7.3f} ms/exam  (worst {worst_ms:.1f} ms, {args.constrained_exams} exams, "
+        f"{relaxed} relaxed, build {cbuild_ms:.0f} ms once)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
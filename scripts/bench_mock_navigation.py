@@ -0,0 +1,110 @@
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+from src.data import attempt_store, question_bank
+from src.data.attempt_store import ActiveAttemptStore
+from src.data.local_db import get_db
+from src.data.question_bank import JSONL_PATH, QuestionBank, load_bank
+from scripts.bench_bank import make_synthetic
+
+# Server time per Mock Exam navigation click, before and after the question
+# panel became a fragment.
+#
+#   python -m scripts.bench_mock_navigation --sizes 100 1000 10000
+#
+# before: a Next click reruns the whole page (what st.rerun() used to do).
+# after:  a Next click reruns only the question panel (st.rerun(scope="fragment")).
+# AppTest always runs whole scripts, so "after" runs the panel on its own as a
+# script; both sides pay the same AppTest overhead.
+
+PAGE = Path(__file__).resolve().parents[1] / "pages" / "2_Mock_Exam.py"
+
+
+def _panel_script(by_id):
+    import streamlit as st
+
+    from src.ui.mock_panel import render_question_panel
+
+    render_question_panel(st.session_state.attempt, by_id)
+
+
+def new_attempt(bank: QuestionBank, total_q: int) -> dict:
+    now = time.time()
+    return {
+        "attempt_id": f"bench{time.time_ns()}",
+        "mode": "Custom",
+        "selection_mode": "any_pool_random",
+        "total_q": total_q,
+        "duration_sec": 3600,
+        "started_at": now,
+        "end_ts": now + 3600,
+        "order": [q["id"] for q in bank.published[:total_q]],
+        "idx": 0,
+        "answers": {},
+        "marked": set(),
+        "submitted": False,
+        "time_ms": {},
+        "on_screen": None,
+        "selection_debug": {},
+    }
+
+
+def time_clicks(at: AppTest, attempt: dict, clicks: int) -> list[float]:
+    attempt_store.get_attempt_store().start(attempt)
+    at.session_state["attempt"] = attempt
+    at.run()
+    out = []
+    for _ in range(clicks):
+        nxt = next(b for b in at.button if b.label == "Next")
+        t0 = time.perf_counter()
+        nxt.click().run()
+        out.append((time.perf_counter() - t0) * 1000)
+        assert not at.exception, at.exception
+    return out
+
+
+def bench_size(seed_rows: list[dict], n: int, clicks: int) -> dict:
+    bank = QuestionBank(make_synthetic(seed_rows, n), stamp=question_bank._bank_stamp(JSONL_PATH))
+    # Serve the synthetic bank from get_bank(): same path and stamp as the
+    # real one, so the page keeps it instead of reloading from disk.
+    question_bank._banks[JSONL_PATH] = bank
+    total_q = min(clicks + 1, len(bank.published))
+
+    page = AppTest.from_file(str(PAGE), default_timeout=30)
+    before = time_clicks(page, new_attempt(bank, total_q), total_q - 1)
+
+    panel = AppTest.from_function(_panel_script, args=(bank.by_id,), default_timeout=30)
+    after = time_clicks(panel, new_attempt(bank, total_q), total_q - 1)
+
+    return {"n": n, "before_ms": statistics.median(before), "after_ms": statistics.median(after)}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Mock Exam navigation benchmark")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    ap.add_argument("--clicks", type=int, default=30, help="Next clicks timed per bank size")
+    args = ap.parse_args(argv)
+
+    seed = load_bank(JSONL_PATH)
+    seed_rows = [seed.get(r["id"]) for r in seed.rows]  # full bodies, not the slim index rows
+    if not seed_rows:
+        print(f"No questions found in {JSONL_PATH}. Run: python -m scripts.build_bank")
+        return 1
+
+    # Checkpoints go to a scratch database, not data/local.db.
+    attempt_store._store = ActiveAttemptStore(get_db(Path(tempfile.mkdtemp()) / "bench.db"))
+
+    print(f"{'questions':>10} {'page ms':>9} {'panel ms':>9} {'speedup':>8}   (median per Next click)")
+    for n in args.sizes:
+        r = bench_size(seed_rows, n, args.clicks)
+        print(f"{r['n']:>10} {r['before_ms']:>9.1f} {r['after_ms']:>9.1f} {r['before_ms'] / max(r['after_ms'], 1e-9):>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,41 @@
+import argparse
+
+from mongo_client import get_database
+from question_tags import EXAM_DOMAINS, SEARCH_FIELDS, keyword_query
+
+# Compare the Practice domain filter before and after the keywords index,
+# per exam domain, using explain("executionStats") on the `questions`
+# collection. Run scripts.migrate_question_tags first.
+#
+#   python -m scripts.bench_question_filter
+
+
+def regex_query(domain_keywords):
+    """The filter get_filtered_question used before question_tags."""
+    return {"$or": [{f: {"$regex": k, "$options": "i"}} for k in domain_keywords for f in SEARCH_FIELDS]}
+
+
+def explain(col, query):
+    stats = col.find(query).explain()["executionStats"]
+    return stats["nReturned"], stats["totalDocsExamined"], stats["totalKeysExamined"], stats["executionTimeMillis"]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Domain filter explain() benchmark")
+    ap.parse_args(argv)
+
+    col = get_database()["questions"]
+    total = col.estimated_document_count()
+    print(f"questions: {total}")
+    print(f"{'domain':20} {'found':>6} {'docs before':>12} {'docs after':>11} {'keys after':>11} {'ms before':>10} {'ms after':>9}")
+    for domain, keywords in EXAM_DOMAINS.items():
+        n0, docs0, _keys0, ms0 = explain(col, regex_query(keywords))
+        n1, docs1, keys1, ms1 = explain(col, keyword_query(keywords))
+        print(f"{domain:20} {n1:>6} {docs0:>12} {docs1:>11} {keys1:>11} {ms0:>10} {ms1:>9}")
+        if n0 != n1:
+            print(f"  note: regex matched {n0}, index matched {n1} (run scripts.migrate_question_tags?)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,47 +1,233 @@
-import glob
+from __future__ import annotations
+
+import argparse
+import hashlib
 import json
-import yaml
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
 
-from src.domain.models import QuestionV2
+from scripts.bank_io import (
+    YAML_LOADER,
+    FileResult,
+    PhaseTimer,
+    file_result,
+    format_timings,
+    list_bank_files,
+    run_parse_and_validate,
+)
+from src.data.atomic import atomic_write_text
+from src.data.compiled_bank import FORMAT_VERSION as BIN_FORMAT_VERSION, write_compiled_bank
+from src.domain.domains import OFFICIAL_DOMAIN_PCTS, classify_domain
 
 ROOT = Path(__file__).resolve().parents[1]
 BANK_DIR = ROOT / "question_bank" / "v2" / "questions"
 OUT_JSONL = ROOT / "question_bank" / "v2" / "questions.jsonl"
+OUT_BIN = ROOT / "question_bank" / "v2" / "questions.bin"
 META = ROOT / "question_bank" / "v2" / "bank.meta.json"
+BUILD_CACHE = ROOT / "question_bank" / "v2" / "bank.build-cache.json"
+MODELS_PY = ROOT / "src" / "domain" / "models.py"
+DOMAINS_PY = ROOT / "src" / "domain" / "domains.py"
+
+# Bump when the cached dump format changes.
+CACHE_VERSION = 1
+
+
+def cache_fingerprint() -> str:
+    # Any change to the schema, the domain rules or the .bin format invalidates
+    # every cached dump (and so rewrites the outputs).
+    h = hashlib.sha256(f"v{CACHE_VERSION}-bin{BIN_FORMAT_VERSION}".encode())
+    h.update(MODELS_PY.read_bytes())
+    h.update(DOMAINS_PY.read_bytes())
+    return h.hexdigest()
+
+
+def load_build_cache(fingerprint: str) -> dict:
+    """Return {filename: {"sha256", "stat", "dump"}} or {} if stale/missing."""
+    if not BUILD_CACHE.exists():
+        return {}
+    try:
+        cache = json.loads(BUILD_CACHE.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    if cache.get("fingerprint") != fingerprint:
+        return {}
+    return cache.get("files") or {}
+
+
+@dataclass
+class BuildResult:
+    ok: bool = False
+    up_to_date: bool = False
+    built: int = 0
+    published: int = 0
+    reparsed: list[str] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)
+    bin_bytes: int = 0
+    files: list[FileResult] = field(default_factory=list)
+    domains: dict[str, int] = field(default_factory=dict)
+    domain_fallback: list[dict] = field(default_factory=list)
+    timings_ms: dict[str, float] = field(default_factory=dict)
+    total_ms: float = 0.0
+
+    @property
+    def errors(self) -> list[FileResult]:
+        return [f for f in self.files if not f.ok]
+
+    def format(self) -> str:
+        if self.errors:
+            lines = ["\nBUILD FAILED ❌\n"]
+            lines += [f"- {f.name}: {f.error}" for f in self.errors]
+            lines.append(format_timings(self.timings_ms))
+            return "\n".join(lines)
+        if self.up_to_date:
+            return f"Bank up to date ({self.built} questions, {self.total_ms:.0f} ms)"
+        lines = [
+            f"Built {self.built} questions → {OUT_JSONL}",
+            f"Compiled {self.bin_bytes} bytes → {OUT_BIN}",
+            f"Published: {self.published}",
+            f"Re-parsed: {len(self.reparsed)}, cached: {self.built - len(self.reparsed)}, deleted: {len(self.deleted)}",
+        ]
+        lines += [f"  - removed {name}" for name in self.deleted]
+        lines.append("Domains: " + ", ".join(f"{d}={n}" for d, n in self.domains.items()))
+        if self.domain_fallback:
+            lines.append(f"Domain inferred from topic/subtopic for {len(self.domain_fallback)} question(s):")
+            lines += [
+                f"  - {f['id']}: {f['domain']}  ({f['topic']} / {f['subtopic']})" for f in self.domain_fallback
+            ]
+        lines.append(f"YAML loader: {YAML_LOADER}")
+        lines.append(format_timings(self.timings_ms))
+        lines.append(f"Done in {self.total_ms:.0f} ms")
+        return "\n".join(lines)
+
+
+def assign_domains(rows: list[dict]) -> tuple[dict[str, int], list[dict]]:
+    """
+    Stamp a canonical `domain` on every row (in place).
+
+    Returns per-domain counts and the questions whose domain came from the
+    topic/subtopic keyword fallback rather than an explicit `domain:` field.
+    """
+    counts = {d: 0 for d in OFFICIAL_DOMAIN_PCTS}
+    fallback = []
+    for r in rows:
+        domain, guessed = classify_domain(r)
+        r["domain"] = domain
+        counts[domain] = counts.get(domain, 0) + 1
+        if guessed:
+            fallback.append({"id": r["id"], "domain": domain, "topic": r["topic"], "subtopic": r["subtopic"]})
+    return counts, fallback
+
+
+def _stat_key(p: Path) -> list[int]:
+    st = p.stat()
+    return [st.st_mtime_ns, st.st_size]
+
+
+def build_bank(changed: list[Path] | None = None, jobs: int = 1) -> BuildResult:
+    """
+    Compile the YAML bank into questions.jsonl/.bin in-process.
+
+    A file is re-hashed only if its mtime/size differ from the cache or it is
+    listed in `changed`, and re-parsed only if its sha256 differs.
+    """
+    t0 = time.perf_counter()
+    timer = PhaseTimer()
+    result = BuildResult()
+    forced = {Path(p).name for p in (changed or [])}
+
+    with timer.phase("glob"):
+        files = list_bank_files(BANK_DIR)
+
+    fingerprint = cache_fingerprint()
+    cached = load_build_cache(fingerprint)
+    entries = {}
+    todo = []
+
+    with timer.phase("read"):
+        for p in files:
+            stat_key = _stat_key(p)
+            hit = cached.get(p.name)
+            if hit and p.name not in forced and hit.get("stat") == stat_key:
+                entries[p.name] = hit
+                continue
+            raw_bytes = p.read_bytes()
+            digest = hashlib.sha256(raw_bytes).hexdigest()
+            if hit and hit.get("sha256") == digest:
+                entries[p.name] = {**hit, "stat": stat_key}
+            else:
+                entries[p.name] = {"sha256": digest, "stat": stat_key, "dump": None}
+                todo.append((p.name, raw_bytes))
+
+    with timer.phase(f"parse+validate wall ({jobs} jobs)"):
+        results = run_parse_and_validate(todo, jobs=jobs)
+
+    for r in results:
+        timer.add("parse", r["parse_s"])
+        timer.add("validate", r["validate_s"])
+        result.files.append(file_result(r))
+        if not r["error"]:
+            entries[r["name"]]["dump"] = r["dump"]
+
+    if result.errors:
+        result.timings_ms = timer.as_ms()
+        result.total_ms = (time.perf_counter() - t0) * 1000
+        return result
+
+    # Copies: the cached dumps keep the author's (possibly empty) domain.
+    rows = [dict(entries[p.name]["dump"]) for p in files]
+    with timer.phase("domains"):
+        result.domains, result.domain_fallback = assign_domains(rows)
+    result.built = len(rows)
+    result.published = sum(1 for d in rows if d.get("status") == "published")
+    result.reparsed = [name for name, _data in todo]
+    result.deleted = sorted(set(cached) - set(entries))
+    result.ok = True
+
+    if not result.reparsed and not result.deleted and cached and OUT_JSONL.exists() and OUT_BIN.exists():
+        # Leave the outputs untouched so the app's bank cache stays warm, but
+        # remember refreshed stat keys so the next build skips hashing.
+        if any(entries[name] is not cached[name] for name in entries):
+            atomic_write_text(BUILD_CACHE, json.dumps({"fingerprint": fingerprint, "files": entries}, ensure_ascii=False))
+        result.up_to_date = True
+        result.timings_ms = timer.as_ms()
+        result.total_ms = (time.perf_counter() - t0) * 1000
+        return result
+
+    with timer.phase("write"):
+        atomic_write_text(OUT_JSONL, "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rows))
+
+        # Binary twin of the JSONL, tied to the JSONL it was compiled from so a
+        # stale .bin is never preferred over a newer JSONL.
+        st = OUT_JSONL.stat()
+        result.bin_bytes = write_compiled_bank(rows, OUT_BIN, source_stamp=(st.st_mtime_ns, st.st_size))
+
+        atomic_write_text(META, json.dumps({
+            "schema_version": "2.0",
+            "built_questions": result.built,
+            "published_questions": result.published,
+            "domains": result.domains,
+            "domain_fallback": result.domain_fallback,
+        }, indent=2))
+
+        atomic_write_text(BUILD_CACHE, json.dumps({
+            "fingerprint": fingerprint,
+            "files": entries,
+        }, ensure_ascii=False))
+
+    result.timings_ms = timer.as_ms()
+    result.total_ms = (time.perf_counter() - t0) * 1000
+    return result
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Compile question YAML into questions.jsonl/.bin")
+    ap.add_argument("--jobs", "-j", type=int, default=1, help="worker processes for parse/validate")
+    args = ap.parse_args(argv)
 
-def main():
-    files = sorted(glob.glob(str(BANK_DIR / "*.yaml")))
-    built = 0
-    published = 0
-
-    rows = []
-    for fp in files:
-        p = Path(fp)
-        if p.name.startswith("_"):
-            continue
-        with p.open("r", encoding="utf-8") as f:
-            raw = yaml.safe_load(f)
-        q = QuestionV2.model_validate(raw)
-        d = q.model_dump()
-        rows.append(d)
-        built += 1
-        if q.status == "published":
-            published += 1
-
-    with OUT_JSONL.open("w", encoding="utf-8") as f:
-        for r in rows:
-            f.write(json.dumps(r, ensure_ascii=False) + "\n")
-
-    META.write_text(json.dumps({
-        "schema_version": "2.0",
-        "built_questions": built,
-        "published_questions": published
-    }, indent=2), encoding="utf-8")
-
-    print(f"Built {built} questions → {OUT_JSONL}")
-    print(f"Published: {published}")
-    return 0
+    result = build_bank(jobs=args.jobs)
+    print(result.format())
+    return 0 if result.ok else 1
 
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -0,0 +1,50 @@
+import argparse
+
+from pymongo import UpdateOne
+
+from mongo_client import get_database
+from question_tags import SEARCH_FIELDS, ensure_indexes, search_fields
+
+# Precompute the indexed `keywords`/`domain` fields on every document in the
+# `questions` collection and create their indexes (see question_tags.py).
+#
+#   python -m scripts.migrate_question_tags             # tag changed docs, build indexes
+#   python -m scripts.migrate_question_tags --dry-run   # count what would change
+#
+# Safe to re-run: documents whose fields are already current are skipped.
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Tag questions with indexed search fields")
+    ap.add_argument("--dry-run", action="store_true", help="report changes without writing")
+    ap.add_argument("--batch", type=int, default=500, help="updates per bulk_write")
+    args = ap.parse_args(argv)
+
+    col = get_database()["questions"]
+    projection = {f: 1 for f in (*SEARCH_FIELDS, "keywords", "domain")}
+
+    seen = changed = 0
+    ops = []
+    for doc in col.find({}, projection):
+        seen += 1
+        fields = search_fields(doc)
+        if all(doc.get(k) == v for k, v in fields.items()):
+            continue
+        changed += 1
+        ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": fields}))
+        if len(ops) >= args.batch and not args.dry_run:
+            col.bulk_write(ops, ordered=False)
+            ops = []
+    if ops and not args.dry_run:
+        col.bulk_write(ops, ordered=False)
+
+    if args.dry_run:
+        print(f"{seen} questions, {changed} would be tagged")
+        return 0
+    ensure_indexes(col)
+    print(f"{seen} questions, {changed} tagged; indexes: {', '.join(sorted(col.index_information()))}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,47 @@
+import argparse
+from pathlib import Path
+
+from src.data import rollups
+from src.data.local_db import DB_PATH, get_db
+from src.data.question_bank import get_bank
+
+# Recompute the dashboard rollups in data/local.db from the base tables.
+#
+#   python -m scripts.rebuild_rollups           # rebuild, report any drift it fixed
+#   python -m scripts.rebuild_rollups --check   # verify only; exit 1 on drift
+#
+# Revision items without topic/difficulty labels (queued before labels were
+# stored) are labelled from the current bank first.
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Rebuild or verify the dashboard rollups")
+    ap.add_argument("--check", action="store_true", help="only compare stored rollups with a fresh recompute")
+    ap.add_argument("--db", type=Path, default=DB_PATH, help="database path")
+    args = ap.parse_args(argv)
+
+    db = get_db(args.db)
+    with db.transaction() as conn:
+        problems = rollups.verify(conn)
+        labelled = 0
+        if not args.check:
+            labelled = rollups.backfill_revision_labels(conn, get_bank().rows_by_id)
+            result = rollups.rebuild(conn)
+
+    for p in problems:
+        print(p)
+    if args.check:
+        print("rollups in sync" if not problems else f"{len(problems)} rollup mismatches")
+        return 1 if problems else 0
+
+    s = result["attempt_rollup"]
+    print(
+        f"rebuilt: {len(result['answer_rollups'])} answer keys, {len(result['revision_rollups'])} revision keys, "
+        f"{s['attempts']} attempts (best {s['best_pct']}%)"
+    )
+    print(f"fixed {len(problems)} mismatches, labelled {labelled} revision items")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
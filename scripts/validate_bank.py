@@ -1,58 +1,116 @@
-import glob
-import sys
-import yaml
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass, field
 from pathlib import Path
 
-from src.domain.models import QuestionV2
+from scripts.bank_io import (
+    YAML_LOADER,
+    FileResult,
+    PhaseTimer,
+    file_result,
+    format_timings,
+    list_bank_files,
+    run_parse_and_validate,
+)
 
 ROOT = Path(__file__).resolve().parents[1]
 BANK_DIR = ROOT / "question_bank" / "v2" / "questions"
 
-def load_yaml(path: Path) -> dict:
-    with path.open("r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
 
-def main():
-    files = sorted(glob.glob(str(BANK_DIR / "*.yaml")))
-    if not files:
-        print(f"No YAML files found in {BANK_DIR}")
-        return 1
+@dataclass
+class ValidationReport:
+    files: list[FileResult] = field(default_factory=list)
+    timings_ms: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return bool(self.files) and all(f.ok for f in self.files)
+
+    @property
+    def valid(self) -> int:
+        return sum(1 for f in self.files if f.ok)
+
+    @property
+    def errors(self) -> list[FileResult]:
+        return [f for f in self.files if not f.ok]
+
+    def format(self) -> str:
+        if not self.files:
+            return f"No YAML files found in {BANK_DIR}"
+        lines = []
+        if self.errors:
+            lines.append("\nVALIDATION FAILED ❌\n")
+            for f in self.errors:
+                lines.append(f"- {f.name}: {f.error}")
+            lines.append(f"\nValid: {self.valid}, Invalid: {len(self.errors)}")
+        else:
+            lines.append(f"VALIDATION PASSED ✅  ({self.valid} questions)")
+            lines.append(f"YAML loader: {YAML_LOADER}")
+        lines.append(format_timings(self.timings_ms))
+        return "\n".join(lines)
+
+
+def check_bank_rules(d: dict) -> None:
+    # Extra guardrail for exam pool quality (still hidden from users)
+    if d["exam_relevance"]["pool"] == "exam":
+        # must have trap OR mini_demo for medium/hard (upgrade quality)
+        r = d["rationale"]
+        if d["difficulty"] in ("medium", "hard") and not (r.get("trap") or r.get("mini_demo")):
+            raise ValueError("Exam question (medium/hard) must include rationale.trap or rationale.mini_demo")
+
+
+def validate_bank(paths: list[Path] | None = None, jobs: int = 1) -> ValidationReport:
+    """
+    Validate `paths` (default: every bank YAML file) in-process.
+
+    Duplicate ids are only detected among the files being validated.
+    """
+    timer = PhaseTimer()
+    with timer.phase("glob"):
+        files = list_bank_files(BANK_DIR) if paths is None else sorted(Path(p) for p in paths)
+
+    with timer.phase("read"):
+        items = [(p.name, p.read_bytes()) for p in files]
+
+    with timer.phase(f"parse+validate wall ({jobs} jobs)"):
+        results = run_parse_and_validate(items, jobs=jobs)
 
     ids = set()
-    errors = []
-    ok = 0
+    report = ValidationReport()
 
-    for fp in files:
-        p = Path(fp)
-        if p.name.startswith("_"):
-            continue
+    # Results are in sorted file order, so duplicate ids are reported on the
+    # later file exactly as in a serial run.
+    for r in results:
+        timer.add("parse", r["parse_s"])
+        timer.add("validate", r["validate_s"])
         try:
-            obj = load_yaml(p)
-            q = QuestionV2.model_validate(obj)
+            if r["error"]:
+                raise ValueError(r["error"])
+            d = r["dump"]
 
-            if q.id in ids:
-                raise ValueError(f"Duplicate id detected: {q.id}")
-            ids.add(q.id)
+            if d["id"] in ids:
+                raise ValueError(f"Duplicate id detected: {d['id']}")
+            ids.add(d["id"])
 
-            # Extra guardrail for exam pool quality (still hidden from users)
-            if q.exam_relevance.pool == "exam":
-                # must have trap OR mini_demo for medium/hard (upgrade quality)
-                if q.difficulty in ("medium", "hard") and not (q.rationale.trap or q.rationale.mini_demo):
-                    raise ValueError("Exam question (medium/hard) must include rationale.trap or rationale.mini_demo")
+            check_bank_rules(d)
 
-            ok += 1
+            report.files.append(file_result(r))
         except Exception as e:
-            errors.append((p.name, str(e)))
+            report.files.append(file_result(r, error=str(e)))
+
+    report.timings_ms = timer.as_ms()
+    return report
+
 
-    if errors:
-        print("\nVALIDATION FAILED ❌\n")
-        for name, msg in errors:
-            print(f"- {name}: {msg}")
-        print(f"\nValid: {ok}, Invalid: {len(errors)}")
-        return 1
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Validate question YAML files")
+    ap.add_argument("--jobs", "-j", type=int, default=1, help="worker processes for parse/validate")
+    args = ap.parse_args(argv)
 
-    print(f"VALIDATION PASSED ✅  ({ok} questions)")
-    return 0
+    report = validate_bank(jobs=args.jobs)
+    print(report.format())
+    return 0 if report.ok else 1
 
 if __name__ == "__main__":
     raise SystemExit(main())
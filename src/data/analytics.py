@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import math
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data import rollups
+from src.data.local_db import LocalDB, get_db
+from src.domain.domains import OFFICIAL_DOMAIN_PCTS
+
+# Score the pass-probability estimate aims for. MongoDB does not publish a
+# cut score; 70% is the target the Study Plan already steers towards.
+PASS_PCT = 70.0
+OFFICIAL_QUESTIONS = 53
+# Answers per domain that count as "current form" for the pass estimate.
+RECENT_ANSWERS = 200
+# Pseudo-answers at the overall accuracy added to each domain, so a domain
+# with three answers does not swing the estimate to 0% or 100%.
+PRIOR_WEIGHT = 5
+
+# Attempts are append-only, so rowid > seq is exactly "logged since seq".
+_ATTEMPT_COLS = ["seq", "attempt_id", "ts", "mode", "total", "score", "pct", "duration_sec"]
+_ANSWER_COLS = ["attempt_id", "pos", "topic", "domain", "difficulty", "correct", "time_ms"]
+_ATTEMPT_SQL = """
+SELECT rowid AS seq, attempt_id, ts, mode, total, score, pct, duration_sec
+FROM attempts WHERE rowid > ?
+"""
+_ANSWER_SQL = """
+SELECT attempt_id, pos, topic, domain, difficulty, correct, time_ms
+FROM attempt_answers WHERE attempt_id IN (SELECT attempt_id FROM attempts WHERE rowid > ?)
+"""
+
+
+def _frame(db: LocalDB, sql: str, since: int, columns: list[str]) -> pd.DataFrame:
+    rows = db.query(sql, (since,))
+    return pd.DataFrame.from_records([tuple(r) for r in rows], columns=columns)
+
+
+class Analytics:
+    """
+    Columnar view of the mock history: one attempts frame and one answers
+    frame. The full history is read once; after that each new data version
+    only fetches the attempts logged since (see extend). Every statistic is
+    a vectorised groupby over the frames, so the Stats page stays responsive
+    with 100k+ answer events.
+    """
+
+    def __init__(self, attempts: pd.DataFrame, answers: pd.DataFrame, version=None):
+        self.version = version
+        attempts = attempts.reindex(columns=_ATTEMPT_COLS).sort_values(["ts", "seq"], kind="stable")
+        attempts["n"] = np.arange(1, len(attempts) + 1)
+        self.attempts = attempts.reset_index(drop=True)
+        self.seq = int(attempts["seq"].max()) if len(attempts) else 0
+
+        answers = answers.reindex(columns=_ANSWER_COLS)
+        for col in ("topic", "domain", "difficulty"):
+            answers[col] = answers[col].astype("category")
+        answers["correct"] = answers["correct"].fillna(0).astype(np.int8)
+        answers["time_ms"] = pd.to_numeric(answers["time_ms"])
+        # Attempt sequence number on every answer, for time ordering.
+        order = pd.Series(self.attempts["n"].to_numpy(), index=self.attempts["attempt_id"])
+        answers["n"] = answers["attempt_id"].map(order)
+        self.answers = answers.sort_values(["n", "pos"], kind="stable").reset_index(drop=True)
+
+    @classmethod
+    def load(cls, db: LocalDB | None = None, version=None) -> "Analytics":
+        db = db or get_db()
+        return cls(
+            _frame(db, _ATTEMPT_SQL, 0, _ATTEMPT_COLS),
+            _frame(db, _ANSWER_SQL, 0, _ANSWER_COLS),
+            version,
+        )
+
+    def extend(self, db: LocalDB, version=None) -> "Analytics":
+        """A new Analytics with the attempts logged since this one was loaded."""
+        attempts = _frame(db, _ATTEMPT_SQL, self.seq, _ATTEMPT_COLS)
+        answers = _frame(db, _ANSWER_SQL, self.seq, _ANSWER_COLS)
+        old_answers = self.answers[_ANSWER_COLS].astype({"topic": object, "domain": object, "difficulty": object})
+        return Analytics(
+            pd.concat([self.attempts[_ATTEMPT_COLS], attempts], ignore_index=True),
+            pd.concat([old_answers, answers], ignore_index=True),
+            version,
+        )
+
+    def __len__(self) -> int:
+        return len(self.answers)
+
+    # -------------------------
+    # Trends
+    # -------------------------
+    def rolling_accuracy(self, window: int = 5) -> pd.DataFrame:
+        """Per attempt: n, ts, pct and the rolling mean of pct over `window` attempts."""
+        out = self.attempts[["n", "ts", "pct"]].copy()
+        out["rolling"] = out["pct"].rolling(window, min_periods=1).mean()
+        return out
+
+    def domain_trend(self, window: int = 5) -> pd.DataFrame:
+        """
+        Per (attempt, domain): accuracy in that attempt and the rolling
+        accuracy over the domain's last `window` attempts, weighted by the
+        number of questions (long format, ready for a colour-by-domain line).
+        """
+        known = self.answers[self.answers["domain"].notna()]
+        per = (
+            known.groupby(["domain", "n"], observed=True)["correct"]
+            .agg(correct="sum", total="size")
+            .reset_index()
+            .sort_values(["domain", "n"], kind="stable")
+        )
+        g = per.groupby("domain", observed=True)
+        per["accuracy"] = per["correct"] / per["total"] * 100
+        per["rolling"] = (
+            g["correct"].transform(lambda s: s.rolling(window, min_periods=1).sum())
+            / g["total"].transform(lambda s: s.rolling(window, min_periods=1).sum())
+            * 100
+        )
+        return per
+
+    def time_percentiles(self, by: str = "domain", qs=(0.5, 0.75, 0.9)) -> pd.DataFrame:
+        """Seconds per question at each quantile in `qs`, per value of `by` (timed answers only)."""
+        timed = self.answers[self.answers["time_ms"].notna() & self.answers[by].notna()]
+        if timed.empty:
+            return pd.DataFrame(columns=[f"p{int(q * 100)}" for q in qs] + ["answers"])
+        grouped = timed.groupby(by, observed=True)["time_ms"]
+        out = grouped.quantile(list(qs)).unstack() / 1000
+        out.columns = [f"p{int(q * 100)}" for q in qs]
+        out["answers"] = grouped.size()
+        return out
+
+    # -------------------------
+    # Pass estimate
+    # -------------------------
+    def pass_probability(
+        self,
+        pass_pct: float = PASS_PCT,
+        n_questions: int = OFFICIAL_QUESTIONS,
+        recent: int = RECENT_ANSWERS,
+    ) -> dict | None:
+        """
+        P(score >= pass_pct) on an official-weighted exam, from recent form.
+
+        Each domain's accuracy is its last `recent` answers shrunk towards the
+        overall accuracy; the exam score is the domain-weighted mean, with a
+        normal approximation of both exam sampling noise and the uncertainty
+        in the accuracy estimates. None until some answers carry a domain.
+        """
+        known = self.answers[self.answers["domain"].notna()]
+        if known.empty:
+            return None
+        recent_rows = known.groupby("domain", observed=True).tail(recent)
+        per = recent_rows.groupby("domain", observed=True)["correct"].agg(correct="sum", total="size")
+        overall = per["correct"].sum() / per["total"].sum()
+
+        weights = pd.Series(OFFICIAL_DOMAIN_PCTS, dtype=float)
+        per = per.reindex(weights.index, fill_value=0)
+        p = (per["correct"] + PRIOR_WEIGHT * overall) / (per["total"] + PRIOR_WEIGHT)
+        w = weights / weights.sum()
+
+        mean = float((w * p).sum())
+        exam_var = float((w * p * (1 - p)).sum()) / n_questions
+        estimate_var = float((w**2 * p * (1 - p) / (per["total"] + PRIOR_WEIGHT)).sum())
+        sd = math.sqrt(exam_var + estimate_var)
+        z = (pass_pct / 100 - mean) / sd if sd else (-math.inf if mean >= pass_pct / 100 else math.inf)
+        prob = 0.5 * math.erfc(z / math.sqrt(2))
+
+        by_domain = pd.DataFrame(
+            {"weight": w * 100, "answers": per["total"], "accuracy": p * 100},
+        )
+        return {"probability": prob, "expected_pct": mean * 100, "sd_pct": sd * 100, "by_domain": by_domain}
+
+
+# -------------------------
+# Process-wide cache (one frame set per data version)
+# -------------------------
+_lock = threading.Lock()
+_cache: dict[Path, Analytics] = {}
+
+
+def data_version(db: LocalDB) -> tuple:
+    """Changes whenever an attempt is logged; answers only arrive with attempts."""
+    s = rollups.attempt_summary(db)
+    return (s["attempts"], s["last_attempt_id"])
+
+
+def get_analytics(db: LocalDB | None = None) -> Analytics:
+    db = db or get_db()
+    version = data_version(db)
+    a = _cache.get(db.path)
+    if a is not None and a.version == version:
+        return a
+    with _lock:
+        a = _cache.get(db.path)
+        if a is None:
+            a = Analytics.load(db, version)
+        elif a.version != version:
+            a = a.extend(db, version)
+            if len(a.attempts) != version[0]:  # history was reset underneath us
+                a = Analytics.load(db, version)
+        _cache[db.path] = a
+        return a
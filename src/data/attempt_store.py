@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+from src.data.local_db import LocalDB, get_db
+
+# Attempt fields persisted in `state`; everything else is per-session UI state.
+STATE_KEYS = ("mode", "selection_mode", "total_q", "duration_sec", "order", "selection_debug")
+# Rows are pruned this long after their deadline.
+KEEP_AFTER_END_SEC = 7 * 86400
+
+
+class ActiveAttemptStore:
+    """
+    Mock attempts in progress, backed by the active_attempts table.
+
+    The deadline (end_ts) lives here rather than in the browser, so time-up
+    is enforced by the server and an attempt picked up again after a
+    reconnect (see the `attempt` query param on the Mock page) keeps its
+    original deadline and questions. Progress is checkpointed per question
+    in active_answers, so a write touches only the questions that changed.
+    """
+
+    def __init__(self, db: LocalDB | None = None):
+        self.db = db or get_db()
+
+    def start(self, attempt: dict):
+        state = {k: attempt.get(k) for k in STATE_KEYS}
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM active_attempts WHERE end_ts < ?", (time.time() - KEEP_AFTER_END_SEC,))
+            conn.execute(
+                "INSERT OR REPLACE INTO active_attempts (attempt_id, started_at, end_ts, state) VALUES (?, ?, ?, ?)",
+                (attempt["attempt_id"], attempt["started_at"], attempt["end_ts"], json.dumps(state, default=str)),
+            )
+
+    def save_progress(self, attempt_id: str, idx: int, rows: list[tuple[str, list[str], bool, int]]):
+        """Checkpoint the current question and the (qid, selected, marked, time_ms) rows that changed."""
+        with self.db.transaction() as conn:
+            conn.execute("UPDATE active_attempts SET idx = ? WHERE attempt_id = ?", (idx, attempt_id))
+            conn.executemany(
+                """
+                INSERT INTO active_answers (attempt_id, qid, selected, marked, time_ms) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(attempt_id, qid) DO UPDATE SET
+                    selected = excluded.selected, marked = excluded.marked, time_ms = excluded.time_ms
+                """,
+                [(attempt_id, qid, json.dumps(list(sel)), int(marked), int(ms)) for qid, sel, marked, ms in rows],
+            )
+
+    def get(self, attempt_id: str | None) -> dict | None:
+        """
+        The persisted attempt fields plus attempt_id, started_at, end_ts,
+        submitted and the checkpointed idx, answers, marked and time_ms.
+        """
+        row = self.db.query_one("SELECT * FROM active_attempts WHERE attempt_id = ?", (attempt_id,))
+        if row is None:
+            return None
+        answers = self.db.query("SELECT * FROM active_answers WHERE attempt_id = ?", (attempt_id,))
+        return {
+            **json.loads(row["state"]),
+            "attempt_id": row["attempt_id"],
+            "started_at": row["started_at"],
+            "end_ts": row["end_ts"],
+            "submitted": bool(row["submitted"]),
+            "idx": row["idx"],
+            "answers": {a["qid"]: json.loads(a["selected"]) for a in answers},
+            "marked": {a["qid"] for a in answers if a["marked"]},
+            "time_ms": {a["qid"]: a["time_ms"] for a in answers if a["time_ms"]},
+        }
+
+    def finish(self, attempt_id: str):
+        with self.db.transaction() as conn:
+            conn.execute("UPDATE active_attempts SET submitted = 1 WHERE attempt_id = ?", (attempt_id,))
+
+
+# -------------------------
+# Process-wide store
+# -------------------------
+_lock = threading.Lock()
+_store: ActiveAttemptStore | None = None
+
+
+def get_attempt_store() -> ActiveAttemptStore:
+    global _store
+    if _store is not None:
+        return _store
+    with _lock:
+        if _store is None:
+            _store = ActiveAttemptStore()
+        return _store
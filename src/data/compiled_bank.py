@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import mmap
+import os
+import pickle
+import struct
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Iterator
+
+from src.domain.grading import answer_mask
+
+# Layout of questions.bin:
+#
+#   MAGIC | body_0 | body_1 | ... | manifest | footer
+#
+# Each body is one question pickled on its own (protocol 5), so a reader can
+# decode a single question without touching the others. The manifest holds the
+# selection rows (ROW_FIELDS plus answer_mask) plus the (offset, length) of every body, and
+# the fixed-size footer points at the manifest.
+MAGIC = b"MDBQBIN1"
+FORMAT_VERSION = 2
+PICKLE_PROTOCOL = 5
+_FOOTER = struct.Struct("<QQ8s")
+
+# Everything the pages need to filter, sample and list questions.
+ROW_FIELDS = (
+    "id",
+    "title",
+    "topic",
+    "subtopic",
+    "difficulty",
+    "type",
+    "tags",
+    "status",
+    "exam_relevance",
+    "domain",
+)
+
+
+def make_row(q: dict) -> dict:
+    row = {f: q[f] for f in ROW_FIELDS if f in q}
+    # Correct keys as a 4-bit mask, so grading never decodes a body.
+    row["answer_mask"] = answer_mask(q)
+    return row
+
+
+def write_compiled_bank(questions: list[dict], path: Path, source_stamp: tuple[int, int] | None = None) -> int:
+    """Write `questions` to `path` atomically. Returns the number of bytes written."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+
+    offsets: list[tuple[int, int]] = []
+    with tmp.open("wb") as f:
+        f.write(MAGIC)
+        for q in questions:
+            blob = pickle.dumps(q, protocol=PICKLE_PROTOCOL)
+            offsets.append((f.tell(), len(blob)))
+            f.write(blob)
+
+        manifest = pickle.dumps(
+            {
+                "format_version": FORMAT_VERSION,
+                "source_stamp": source_stamp,
+                "rows": [make_row(q) for q in questions],
+                "offsets": offsets,
+            },
+            protocol=PICKLE_PROTOCOL,
+        )
+        manifest_at = f.tell()
+        f.write(manifest)
+        f.write(_FOOTER.pack(manifest_at, len(manifest), MAGIC))
+        size = f.tell()
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp, path)
+    return size
+
+
+class CompiledBank:
+    """
+    mmap-backed reader for questions.bin.
+
+    Only the manifest is decoded on open; question bodies are unpickled on
+    first access and memoised. The file is a local build artifact written by
+    scripts.build_bank, never user input.
+
+    close() (or a with block) releases the mapping; until then the file
+    can't be replaced on Windows.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._open()
+        except BaseException:
+            self.close()
+            raise
+
+    def _open(self):
+        if len(self._mm) < len(MAGIC) + _FOOTER.size or self._mm[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a compiled question bank: {self.path}")
+        manifest_at, manifest_len, magic = _FOOTER.unpack_from(self._mm, len(self._mm) - _FOOTER.size)
+        if magic != MAGIC:
+            raise ValueError(f"Truncated compiled question bank: {self.path}")
+
+        manifest = pickle.loads(self._mm[manifest_at: manifest_at + manifest_len])
+        if manifest.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled bank version: {manifest.get('format_version')}")
+
+        self.source_stamp = manifest.get("source_stamp")
+        if self.source_stamp is not None:
+            self.source_stamp = tuple(self.source_stamp)
+        self.rows: list[dict] = manifest["rows"]
+        self._offsets = {
+            row["id"]: span for row, span in zip(self.rows, manifest["offsets"]) if row.get("id")
+        }
+        self._decoded: dict[str, dict] = {}
+
+    def close(self):
+        self._mm.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._mm.closed
+
+    def __enter__(self) -> "CompiledBank":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, qid: object) -> bool:
+        return qid in self._offsets
+
+    def ids(self) -> Iterator[str]:
+        return iter(self._offsets)
+
+    def load(self, qid: str) -> dict:
+        q = self._decoded.get(qid)
+        if q is None:
+            off, length = self._offsets[qid]
+            q = pickle.loads(self._mm[off: off + length])
+            self._decoded[qid] = q
+        return q
+
+
+class LazyQuestions(Mapping):
+    """Read-only id -> question mapping that decodes bodies on demand."""
+
+    def __init__(self, compiled: CompiledBank):
+        self._compiled = compiled
+
+    def __getitem__(self, qid: str) -> dict:
+        return self._compiled.load(qid)
+
+    def __contains__(self, qid: object) -> bool:
+        return qid in self._compiled
+
+    def __iter__(self) -> Iterator[str]:
+        return self._compiled.ids()
+
+    def __len__(self) -> int:
+        return len(self._compiled)
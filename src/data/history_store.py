@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import json
+import threading
+
+from src.data import rollups
+from src.data.local_db import LocalDB, get_db
+
+_ATTEMPT_COLS = "attempt_id, ts, mode, selection_mode, total, score, pct, duration_sec"
+
+
+class MockHistoryStore:
+    """
+    Mock exam history backed by the attempts/attempt_answers tables.
+
+    Dashboard reads (count, last, best, accuracy and time-on-question per
+    topic/domain/difficulty) come from the rollups that add_attempt keeps up
+    to date in the same transaction as the answers, so they cost the same at
+    ten attempts as at ten thousand.
+    """
+
+    def __init__(self, db: LocalDB | None = None):
+        self.db = db or get_db()
+
+    # -------------------------
+    # Writes
+    # -------------------------
+    def add_attempt(self, attempt: dict, answers: list[dict]) -> bool:
+        """
+        Store one finished attempt and its per-question answers.
+
+        `answers` are {"qid", "topic", "domain", "difficulty", "selected",
+        "correct"[, "time_ms"]} in exam order. Idempotent per attempt_id;
+        returns False if already stored.
+        """
+        with self.db.transaction() as conn:
+            cur = conn.execute(
+                f"INSERT OR IGNORE INTO attempts ({_ATTEMPT_COLS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    attempt["attempt_id"],
+                    attempt["ts"],
+                    attempt.get("mode"),
+                    attempt.get("selection_mode"),
+                    attempt["total"],
+                    attempt["score"],
+                    attempt["pct"],
+                    attempt.get("duration_sec"),
+                ),
+            )
+            if cur.rowcount == 0:
+                return False
+            conn.executemany(
+                """
+                INSERT INTO attempt_answers
+                    (attempt_id, pos, qid, topic, domain, difficulty, selected, correct, time_ms)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        attempt["attempt_id"],
+                        pos,
+                        a["qid"],
+                        a.get("topic"),
+                        a.get("domain"),
+                        a.get("difficulty"),
+                        json.dumps(list(a.get("selected") or [])),
+                        1 if a.get("correct") else 0,
+                        a.get("time_ms"),
+                    )
+                    for pos, a in enumerate(answers)
+                ],
+            )
+            rollups.on_attempt_logged(conn, attempt, answers)
+        return True
+
+    # -------------------------
+    # Reads
+    # -------------------------
+    def count(self) -> int:
+        return rollups.attempt_summary(self.db)["attempts"]
+
+    def get(self, attempt_id: str | None) -> dict | None:
+        row = self.db.query_one(f"SELECT {_ATTEMPT_COLS} FROM attempts WHERE attempt_id = ?", (attempt_id,))
+        return dict(row) if row else None
+
+    def recent(self, n: int = 10) -> list[dict]:
+        """Latest `n` attempts, newest first."""
+        rows = self.db.query(f"SELECT {_ATTEMPT_COLS} FROM attempts ORDER BY ts DESC, rowid DESC LIMIT ?", (n,))
+        return [dict(r) for r in rows]
+
+    def last(self) -> dict | None:
+        return self.get(rollups.attempt_summary(self.db)["last_attempt_id"])
+
+    def best(self) -> dict | None:
+        return self.get(rollups.attempt_summary(self.db)["best_attempt_id"])
+
+    def wrong_ids(self, attempt_id: str) -> list[str]:
+        rows = self.db.query(
+            "SELECT qid FROM attempt_answers WHERE attempt_id = ? AND correct = 0 ORDER BY pos",
+            (attempt_id,),
+        )
+        return [r["qid"] for r in rows]
+
+    def recent_qids(self, attempts: int = 3) -> set[str]:
+        """Every question that appeared in the latest `attempts` attempts."""
+        rows = self.db.query(
+            """
+            SELECT DISTINCT qid FROM attempt_answers
+            WHERE attempt_id IN (SELECT attempt_id FROM attempts ORDER BY ts DESC LIMIT ?)
+            """,
+            (attempts,),
+        )
+        return {r["qid"] for r in rows}
+
+    def rollup(self, dim: str) -> list[dict]:
+        """
+        {"key", "correct", "total", "avg_time_ms"} per value of `dim`
+        ("topic", "domain" or "difficulty"), read from the precomputed
+        counters. avg_time_ms is None when no answer for the key was timed.
+        """
+        rows = self.db.query("SELECT key, correct, total, time_ms, timed FROM answer_rollups WHERE dim = ?", (dim,))
+        return [
+            {
+                "key": r["key"],
+                "correct": r["correct"],
+                "total": r["total"],
+                "avg_time_ms": r["time_ms"] / r["timed"] if r["timed"] else None,
+            }
+            for r in rows
+        ]
+
+    def topic_accuracy(self) -> list[tuple[str, int, int]]:
+        """(topic, correct, total) over every mock answer with a known topic."""
+        return [(r["key"], r["correct"], r["total"]) for r in self.rollup("topic")]
+
+
+# -------------------------
+# Process-wide store
+# -------------------------
+_lock = threading.Lock()
+_store: MockHistoryStore | None = None
+
+
+def get_history_store() -> MockHistoryStore:
+    global _store
+    if _store is not None:
+        return _store
+    with _lock:
+        if _store is None:
+            _store = MockHistoryStore()
+        return _store
@@ -0,0 +1,397 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from src.data import rollups
+from src.data.rollups import ROLLUP_DIMS
+from src.domain.scheduler import DEFAULT_EASE
+
+ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = ROOT / "data"
+DB_PATH = DATA_DIR / "local.db"
+BANK_JSONL = ROOT / "question_bank" / "v2" / "questions.jsonl"
+
+# PRAGMA user_version once every step in MIGRATIONS has run.
+SCHEMA_VERSION = 7
+
+# Base (version 1) tables; later columns are added by MIGRATIONS.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS revision_items (
+    qid           TEXT PRIMARY KEY,
+    added_at      TEXT NOT NULL,
+    last_seen     TEXT,
+    times_seen    INTEGER NOT NULL DEFAULT 0,
+    times_wrong   INTEGER NOT NULL DEFAULT 0,
+    times_correct INTEGER NOT NULL DEFAULT 0,
+    last_selected TEXT NOT NULL DEFAULT '[]',
+    source        TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_revision_items_last_seen ON revision_items(last_seen);
+
+-- mock attempt ids whose answers were already pushed to revision (idempotency)
+CREATE TABLE IF NOT EXISTS revision_batches (
+    attempt_id TEXT PRIMARY KEY,
+    ts         TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS attempts (
+    attempt_id     TEXT PRIMARY KEY,
+    ts             TEXT NOT NULL,
+    mode           TEXT,
+    selection_mode TEXT,
+    total          INTEGER NOT NULL,
+    score          INTEGER NOT NULL,
+    pct            REAL NOT NULL,
+    duration_sec   INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_attempts_ts ON attempts(ts);
+CREATE INDEX IF NOT EXISTS idx_attempts_pct ON attempts(pct);
+
+CREATE TABLE IF NOT EXISTS attempt_answers (
+    attempt_id TEXT NOT NULL REFERENCES attempts(attempt_id) ON DELETE CASCADE,
+    pos        INTEGER NOT NULL,
+    qid        TEXT NOT NULL,
+    topic      TEXT,
+    difficulty TEXT,
+    selected   TEXT NOT NULL DEFAULT '[]',
+    correct    INTEGER NOT NULL,
+    PRIMARY KEY (attempt_id, pos)
+);
+CREATE INDEX IF NOT EXISTS idx_attempt_answers_qid ON attempt_answers(qid);
+CREATE INDEX IF NOT EXISTS idx_attempt_answers_topic ON attempt_answers(topic, correct);
+"""
+
+
+class LocalDB:
+    """
+    The app's local SQLite database (data/local.db).
+
+    One connection per process, shared by every Streamlit session thread and
+    serialised by a lock; WAL mode lets the CLI scripts read while the app
+    writes. Everything is local, so the app works fully offline.
+    """
+
+    def __init__(self, path: Path = DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        # isolation_level=None: we issue BEGIN/COMMIT ourselves in transaction().
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def query(self, sql: str, params=()) -> list[sqlite3.Row]:
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def query_one(self, sql: str, params=()) -> sqlite3.Row | None:
+        with self._lock:
+            return self.conn.execute(sql, params).fetchone()
+
+    @property
+    def user_version(self) -> int:
+        return self.query_one("PRAGMA user_version")[0]
+
+
+# -------------------------
+# Legacy JSON import
+# -------------------------
+def _new_record(qid: str, ts: str, source: str) -> dict:
+    return {
+        "qid": qid,
+        "added_at": ts,
+        "last_seen": None,
+        "times_seen": 0,
+        "times_wrong": 0,
+        "times_correct": 0,
+        "last_selected": [],
+        "source": source,
+    }
+
+
+def _replay(items: dict, attempts: set, ev: dict):
+    op = ev.get("op")
+    qid = ev.get("qid")
+    if op == "batch":
+        attempt_id = ev.get("attempt_id")
+        if attempt_id:
+            if attempt_id in attempts:
+                return
+            attempts.add(attempt_id)
+        for sub in ev.get("events") or []:
+            _replay(items, attempts, {**sub, "ts": ev["ts"]})
+    elif op == "wrong":
+        rec = items.get(qid) or _new_record(qid, ev["ts"], ev.get("source", ""))
+        rec["last_seen"] = ev["ts"]
+        rec["times_seen"] += 1
+        rec["times_wrong"] += 1
+        rec["last_selected"] = ev.get("selected", [])
+        rec["source"] = ev.get("source", rec["source"])
+        items[qid] = rec
+    elif op == "correct" and qid in items:
+        rec = items[qid]
+        rec["last_seen"] = ev["ts"]
+        rec["times_seen"] += 1
+        rec["times_correct"] += 1
+        rec["last_selected"] = ev.get("selected", [])
+    elif op == "remove":
+        items.pop(qid, None)
+    elif op == "clear":
+        items.clear()
+
+
+def _read_json(path: Path, default):
+    if not path.exists():
+        return default
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return default
+
+
+def read_legacy_revision(data_dir: Path = DATA_DIR) -> tuple[dict, set]:
+    """revision.json snapshot plus any revision.log.jsonl events newer than it."""
+    snap = _read_json(data_dir / "revision.json", {})
+    items = snap.get("items") or {}
+    attempts = set(snap.get("attempts") or {})
+    snap_seq = int(snap.get("seq", 0))
+
+    log_path = data_dir / "revision.log.jsonl"
+    if log_path.exists():
+        with log_path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    ev = json.loads(line)
+                except json.JSONDecodeError:
+                    break  # torn trailing line
+                if ev.get("seq", 0) > snap_seq:
+                    _replay(items, attempts, ev)
+    return items, attempts
+
+
+def migrate_legacy_json(conn: sqlite3.Connection, data_dir: Path = DATA_DIR) -> dict:
+    """
+    One-shot import of revision.json(+log) and mock_history.json.
+
+    The JSON files are left in place as a backup. Legacy attempts only
+    recorded wrong_ids, so they are imported as wrong answers without a topic.
+    """
+    items, batches = read_legacy_revision(data_dir)
+    history = _read_json(data_dir / "mock_history.json", {"attempts": []})
+    counts = {"revision_items": 0, "attempts": 0}
+
+    for rec in items.values():
+        if not rec.get("qid"):
+            continue
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO revision_items
+                (qid, added_at, last_seen, times_seen, times_wrong, times_correct, last_selected, source)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                rec["qid"],
+                rec.get("added_at") or "",
+                rec.get("last_seen"),
+                int(rec.get("times_seen", 0)),
+                int(rec.get("times_wrong", 0)),
+                int(rec.get("times_correct", 0)),
+                json.dumps(rec.get("last_selected") or []),
+                rec.get("source") or "",
+            ),
+        )
+        counts["revision_items"] += 1
+    conn.executemany(
+        "INSERT OR IGNORE INTO revision_batches VALUES (?, '')",
+        [(a,) for a in batches],
+    )
+
+    for a in history.get("attempts") or []:
+        attempt_id = a.get("attempt_id")
+        if not attempt_id:
+            continue
+        cur = conn.execute(
+            "INSERT OR IGNORE INTO attempts VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                attempt_id,
+                a.get("ts", ""),
+                a.get("mode"),
+                a.get("selection_mode"),
+                int(a.get("total", 0)),
+                int(a.get("score", 0)),
+                float(a.get("pct", 0.0)),
+                a.get("duration_sec"),
+            ),
+        )
+        if cur.rowcount == 0:
+            continue
+        conn.executemany(
+            "INSERT INTO attempt_answers (attempt_id, pos, qid, correct) VALUES (?, ?, ?, 0)",
+            [(attempt_id, pos, qid) for pos, qid in enumerate(a.get("wrong_ids") or [])],
+        )
+        counts["attempts"] += 1
+    return counts
+
+
+def add_revision_schedule(conn: sqlite3.Connection, data_dir: Path = DATA_DIR):
+    """SM-2 state per revision item; existing items start out due now."""
+    conn.execute(f"ALTER TABLE revision_items ADD COLUMN ease REAL NOT NULL DEFAULT {DEFAULT_EASE}")
+    conn.execute("ALTER TABLE revision_items ADD COLUMN interval_days REAL NOT NULL DEFAULT 0")
+    conn.execute("ALTER TABLE revision_items ADD COLUMN reps INTEGER NOT NULL DEFAULT 0")
+    conn.execute("ALTER TABLE revision_items ADD COLUMN due_ts REAL NOT NULL DEFAULT 0")
+    conn.execute("CREATE INDEX idx_revision_items_due ON revision_items(due_ts)")
+    conn.execute("CREATE INDEX idx_revision_items_wrong ON revision_items(times_wrong DESC, times_seen DESC)")
+
+
+def add_answer_analytics(conn: sqlite3.Connection, data_dir: Path = DATA_DIR):
+    """Per-answer domain and time-on-question, plus rollup counters per dimension."""
+    conn.execute("ALTER TABLE attempt_answers ADD COLUMN domain TEXT")
+    conn.execute("ALTER TABLE attempt_answers ADD COLUMN time_ms INTEGER")
+    conn.execute("CREATE INDEX idx_attempt_answers_domain ON attempt_answers(domain, correct)")
+    conn.execute(
+        """
+        CREATE TABLE answer_rollups (
+            dim     TEXT NOT NULL,
+            key     TEXT NOT NULL,
+            correct INTEGER NOT NULL DEFAULT 0,
+            total   INTEGER NOT NULL DEFAULT 0,
+            time_ms INTEGER NOT NULL DEFAULT 0,
+            timed   INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (dim, key)
+        ) WITHOUT ROWID
+        """
+    )
+    for dim in ROLLUP_DIMS:
+        conn.execute(
+            f"""
+            INSERT INTO answer_rollups (dim, key, correct, total, time_ms, timed)
+            SELECT ?, {dim}, SUM(correct), COUNT(*), COALESCE(SUM(time_ms), 0), COUNT(time_ms)
+            FROM attempt_answers WHERE {dim} IS NOT NULL GROUP BY {dim}
+            """,
+            (dim,),
+        )
+
+
+def _bank_labels(path: Path = BANK_JSONL) -> dict[str, dict]:
+    """qid -> {"topic", "difficulty"} straight from the built bank, if there is one."""
+    labels = {}
+    if not path.exists():
+        return labels
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                q = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if q.get("id"):
+                labels[q["id"]] = {"topic": q.get("topic"), "difficulty": q.get("difficulty")}
+    return labels
+
+
+def add_rollups(conn: sqlite3.Connection, data_dir: Path = DATA_DIR):
+    """Labels on revision items plus the revision/attempt rollups, built from current rows."""
+    conn.execute("ALTER TABLE revision_items ADD COLUMN topic TEXT")
+    conn.execute("ALTER TABLE revision_items ADD COLUMN difficulty TEXT")
+    for stmt in rollups.TABLES:
+        conn.execute(stmt)
+    rollups.backfill_revision_labels(conn, _bank_labels())
+    rollups.rebuild(conn)
+
+
+def add_active_attempts(conn: sqlite3.Connection, data_dir: Path = DATA_DIR):
+    """Mock attempts in progress, so the deadline and questions outlive the browser session."""
+    conn.execute(
+        """
+        CREATE TABLE active_attempts (
+            attempt_id TEXT PRIMARY KEY,
+            started_at REAL NOT NULL,
+            end_ts     REAL NOT NULL,
+            state      TEXT NOT NULL DEFAULT '{}',
+            submitted  INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+    conn.execute("CREATE INDEX idx_active_attempts_end ON active_attempts(end_ts)")
+
+
+def add_attempt_progress(conn: sqlite3.Connection, data_dir: Path = DATA_DIR):
+    """Checkpointed progress of active attempts: current question plus one row per touched question."""
+    conn.execute("ALTER TABLE active_attempts ADD COLUMN idx INTEGER NOT NULL DEFAULT 0")
+    conn.execute(
+        """
+        CREATE TABLE active_answers (
+            attempt_id TEXT NOT NULL REFERENCES active_attempts(attempt_id) ON DELETE CASCADE,
+            qid        TEXT NOT NULL,
+            selected   TEXT NOT NULL DEFAULT '[]',
+            marked     INTEGER NOT NULL DEFAULT 0,
+            time_ms    INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (attempt_id, qid)
+        ) WITHOUT ROWID
+        """
+    )
+
+
+def prune_view_batches(conn: sqlite3.Connection, data_dir: Path = DATA_DIR):
+    """Drop the per-question-view ids Practice (p...) and Revision (r...) used to log; only mock ids are kept."""
+    conn.execute("DELETE FROM revision_batches WHERE attempt_id GLOB 'p[0-9]*' OR attempt_id GLOB 'r[0-9]*'")
+
+
+# (user_version, step): each step runs once, in its own transaction.
+MIGRATIONS = [
+    (1, migrate_legacy_json),
+    (2, add_revision_schedule),
+    (3, add_answer_analytics),
+    (4, add_rollups),
+    (5, add_active_attempts),
+    (6, add_attempt_progress),
+    (7, prune_view_batches),
+]
+
+
+def migrate(db: LocalDB, data_dir: Path = DATA_DIR):
+    for version, step in MIGRATIONS:
+        with db.transaction() as conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= version:
+                continue
+            step(conn, data_dir)
+            conn.execute(f"PRAGMA user_version = {version}")
+
+
+# -------------------------
+# Process-wide database
+# -------------------------
+_lock = threading.Lock()
+_dbs: dict[Path, LocalDB] = {}
+
+
+def get_db(path: Path = DB_PATH) -> LocalDB:
+    path = Path(path)
+    db = _dbs.get(path)
+    if db is not None:
+        return db
+    with _lock:
+        db = _dbs.get(path)
+        if db is None:
+            db = LocalDB(path)
+            if db.user_version < SCHEMA_VERSION:
+                migrate(db, path.parent)
+            _dbs[path] = db
+        return db
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import json
+import pickle
+import random
+import threading
+from collections.abc import Mapping
+from functools import cached_property
+from pathlib import Path
+
+from src.data.compiled_bank import CompiledBank, LazyQuestions
+from src.data.question_index import QuestionIndex, question_pool
+from src.domain.domains import normalize_domain
+from src.domain.exam_assembly import ConstrainedExamAssembler
+from src.domain.grading import Grader
+
+ROOT = Path(__file__).resolve().parents[2]
+JSONL_PATH = ROOT / "question_bank" / "v2" / "questions.jsonl"
+
+
+def _file_stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class QuestionBank:
+    """
+    Read-only view over the compiled bank.
+
+    `rows` carry the selection fields (see compiled_bank.ROW_FIELDS) and back
+    every list view and index; full question bodies come from `by_id`/`get()`.
+    When loaded from JSONL the rows are the full questions; when loaded from
+    questions.bin the bodies are decoded lazily, one question at a time.
+
+    Built once per file version and shared by every session in the process,
+    so callers must treat the question dicts as immutable.
+    """
+
+    def __init__(self, rows: list[dict], by_id: Mapping[str, dict] | None = None, stamp: tuple | None = None):
+        self.stamp = stamp
+        self.compiled: CompiledBank | None = None
+        self.rows = rows
+        self.rows_by_id = {r["id"]: r for r in rows if r.get("id")}
+        self.by_id: Mapping[str, dict] = self.rows_by_id if by_id is None else by_id
+
+        self.published = [r for r in rows if r.get("status") == "published"]
+        self.published_exam = [r for r in self.published if question_pool(r) == "exam"]
+        self.published_learning = [r for r in self.published if question_pool(r) == "learning"]
+
+        self.by_topic: dict[str, list[dict]] = {}
+        self.by_difficulty: dict[str, list[dict]] = {}
+        self.by_status: dict[str, list[dict]] = {}
+        for r in rows:
+            self.by_topic.setdefault(r.get("topic", "Unknown"), []).append(r)
+            self.by_difficulty.setdefault(r.get("difficulty", "Unknown"), []).append(r)
+            self.by_status.setdefault(r.get("status", "Unknown"), []).append(r)
+
+        self.topics = sorted(self.by_topic)
+        self.difficulties = sorted(self.by_difficulty)
+
+        self.index = QuestionIndex(rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def get(self, qid: str) -> dict | None:
+        """Full question body (decodes it if the bank is lazy)."""
+        if qid not in self.by_id:
+            return None
+        return self.by_id[qid]
+
+    def row(self, qid: str) -> dict | None:
+        """Selection fields only; never decodes a body."""
+        return self.rows_by_id.get(qid)
+
+    def filter(self, **filters: str | None) -> list[dict]:
+        return [self.rows[i] for i in self.index.candidates(**filters)]
+
+    def sample(self, rng: random.Random | None = None, **filters: str | None) -> dict | None:
+        i = self.index.sample(rng, **filters)
+        return None if i is None else self.get(self.rows[i]["id"])
+
+    @cached_property
+    def exam_assembler(self) -> ConstrainedExamAssembler:
+        """Official-exam generator over `published_exam` (positions index that list)."""
+        pool = self.published_exam
+        return ConstrainedExamAssembler(pool, [normalize_domain(r) for r in pool])
+
+    @cached_property
+    def grader(self) -> Grader:
+        """Answer masks for every question (see src.domain.grading)."""
+        return Grader(self.rows)
+
+    @classmethod
+    def from_jsonl(cls, path: Path) -> "QuestionBank":
+        stamp = _file_stamp(path)
+        if stamp is None:
+            return cls([], stamp=None)
+        rows = []
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                rows.append(json.loads(line))
+        return cls(rows, stamp=stamp)
+
+    @classmethod
+    def from_compiled(cls, compiled: CompiledBank, stamp: tuple | None = None) -> "QuestionBank":
+        bank = cls(compiled.rows, LazyQuestions(compiled), stamp=stamp)
+        bank.compiled = compiled
+        return bank
+
+    def close(self):
+        """Release the questions.bin mapping, if any; bodies not yet decoded become unavailable."""
+        if self.compiled is not None:
+            self.compiled.close()
+
+
+def _bin_path(jsonl_path: Path) -> Path:
+    return jsonl_path.with_suffix(".bin")
+
+
+def _bank_stamp(path: Path) -> tuple:
+    return (_file_stamp(path), _file_stamp(_bin_path(path)))
+
+
+def load_bank(path: Path = JSONL_PATH) -> QuestionBank:
+    """
+    Load from questions.bin when it was compiled from the current JSONL,
+    otherwise parse the JSONL.
+    """
+    path = Path(path)
+    stamp = _bank_stamp(path)
+    jsonl_stamp, bin_stamp = stamp
+    if jsonl_stamp is not None and bin_stamp is not None:
+        try:
+            compiled = CompiledBank(_bin_path(path))
+        except (OSError, ValueError, pickle.UnpicklingError, EOFError):
+            compiled = None
+        if compiled is not None and compiled.source_stamp == jsonl_stamp:
+            return QuestionBank.from_compiled(compiled, stamp)
+        if compiled is not None:
+            compiled.close()
+
+    bank = QuestionBank.from_jsonl(path)
+    bank.stamp = stamp
+    return bank
+
+
+# -------------------------
+# Process-wide cache
+# -------------------------
+_lock = threading.Lock()
+_banks: dict[Path, QuestionBank] = {}
+
+
+def get_bank(path: Path = JSONL_PATH) -> QuestionBank:
+    """Return the cached bank for `path`, reloading only if the JSONL or .bin changed."""
+    path = Path(path)
+    bank = _banks.get(path)
+    if bank is not None and bank.stamp == _bank_stamp(path):
+        return bank
+
+    with _lock:
+        bank = _banks.get(path)
+        if bank is not None and bank.stamp == _bank_stamp(path):
+            return bank
+        return _replace(path, load_bank(path))
+
+
+def _replace(path: Path, bank: QuestionBank | None) -> QuestionBank | None:
+    # Callers hold _lock. The old bank's mapping is released so it neither
+    # leaks nor blocks replacing questions.bin (Windows).
+    old = _banks.pop(path, None)
+    if bank is not None:
+        _banks[path] = bank
+    if old is not None and old is not bank:
+        old.close()
+    return bank
+
+
+def reload_bank(path: Path = JSONL_PATH) -> QuestionBank:
+    """Drop the cached bank for `path` and load it again."""
+    path = Path(path)
+    with _lock:
+        return _replace(path, load_bank(path))
+
+
+def close_bank(path: Path = JSONL_PATH):
+    """Drop and close the cached bank for `path`; the next get_bank() loads it again."""
+    path = Path(path)
+    with _lock:
+        _replace(path, None)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import random
+from typing import Iterable
+
+from src.domain.domains import normalize_domain
+
+# Fields that can be used as filters. "tags" is multi-valued, every other
+# field maps a question to exactly one value.
+INDEXED_FIELDS = ("status", "topic", "difficulty", "type", "tags", "domain", "pool")
+
+# Value for a question missing a single-valued field.
+UNKNOWN = "Unknown"
+
+_CACHE_LIMIT = 256
+
+
+def question_pool(q: dict) -> str:
+    """exam_relevance.pool, as both the index and QuestionBank's pool lists see it."""
+    return (q.get("exam_relevance") or {}).get("pool", UNKNOWN)
+
+
+def _field_values(q: dict, field: str) -> Iterable[str]:
+    if field == "tags":
+        return q.get("tags") or []
+    if field == "pool":
+        return [question_pool(q)]
+    if field == "domain":
+        return [normalize_domain(q)]
+    return [q.get(field, UNKNOWN)]
+
+
+class QuestionIndex:
+    """
+    Inverted indexes over a fixed list of questions.
+
+    Postings are sorted tuples of row numbers (positions in the question list),
+    so a single-field lookup is one dict access and a composite filter is an
+    intersection of the postings involved, cached per filter combination.
+    """
+
+    def __init__(self, questions: list[dict], fields: tuple[str, ...] = INDEXED_FIELDS):
+        self.size = len(questions)
+        self.fields = fields
+        self._postings: dict[str, dict[str, tuple[int, ...]]] = {}
+        for field in fields:
+            post: dict[str, list[int]] = {}
+            for row, q in enumerate(questions):
+                for v in _field_values(q, field):
+                    post.setdefault(v, []).append(row)
+            self._postings[field] = {v: tuple(rows) for v, rows in post.items()}
+
+        self._all = tuple(range(self.size))
+        self._cache: dict[tuple, tuple[int, ...]] = {}
+
+    def values(self, field: str) -> list[str]:
+        return sorted(self._postings[field])
+
+    def count(self, field: str, value: str) -> int:
+        return len(self._postings[field].get(value, ()))
+
+    def candidates(self, **filters: str | None) -> tuple[int, ...]:
+        """Return sorted row numbers matching every filter. None/"All" means no filter."""
+        active = tuple(sorted((f, v) for f, v in filters.items() if v is not None and v != "All"))
+        if not active:
+            return self._all
+
+        hit = self._cache.get(active)
+        if hit is not None:
+            return hit
+
+        for f, _v in active:
+            if f not in self._postings:
+                raise KeyError(f"Field is not indexed: {f}")
+
+        postings = sorted((self._postings[f].get(v, ()) for f, v in active), key=len)
+        if len(postings) == 1:
+            rows = postings[0]
+        elif not postings[0]:
+            rows = ()
+        else:
+            keep = set(postings[0])
+            for p in postings[1:]:
+                keep.intersection_update(p)
+                if not keep:
+                    break
+            rows = tuple(sorted(keep))
+
+        if len(self._cache) >= _CACHE_LIMIT:
+            self._cache.clear()
+        self._cache[active] = rows
+        return rows
+
+    def sample(self, rng: random.Random | None = None, **filters: str | None) -> int | None:
+        rows = self.candidates(**filters)
+        if not rows:
+            return None
+        return (rng or random).choice(rows)
+
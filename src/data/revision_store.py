@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Container
+from datetime import datetime
+
+from src.data import rollups
+from src.data.local_db import LocalDB, get_db
+from src.domain.scheduler import Schedule, review_answer
+
+# Pick strategies; each ORDER BY is served by an index on revision_items.
+PICK_ORDERS = {
+    "due": "due_ts ASC",
+    "most_wrong": "times_wrong DESC, times_seen DESC",
+    "least_recent": "last_seen ASC",
+    "random": "RANDOM()",
+}
+_PICK_PAGE = 32
+
+
+def now_iso():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _record(row: sqlite3.Row) -> dict:
+    rec = dict(row)
+    rec["last_selected"] = json.loads(rec["last_selected"] or "[]")
+    return rec
+
+
+class RevisionStore:
+    """
+    Revision queue backed by the revision_items table of data/local.db.
+
+    Records keep the shape the pages already use (qid, added_at, last_seen,
+    times_seen/wrong/correct, last_selected, source) plus the SM-2 schedule
+    (ease, interval_days, reps, due_ts) and the question's topic/difficulty.
+    Every write is a single SQLite transaction that also updates the
+    revision rollups, so nothing is ever rewritten or rescanned wholesale.
+    """
+
+    def __init__(self, db: LocalDB | None = None):
+        self.db = db or get_db()
+
+    # -------------------------
+    # Reads
+    # -------------------------
+    @property
+    def items(self) -> dict[str, dict]:
+        """Point-in-time snapshot of qid -> record."""
+        return {r["qid"]: _record(r) for r in self.db.query("SELECT * FROM revision_items")}
+
+    def __len__(self) -> int:
+        return self.db.query_one("SELECT COUNT(*) FROM revision_items")[0]
+
+    def __contains__(self, qid: object) -> bool:
+        return self.db.query_one("SELECT 1 FROM revision_items WHERE qid = ?", (qid,)) is not None
+
+    def get(self, qid: str) -> dict | None:
+        row = self.db.query_one("SELECT * FROM revision_items WHERE qid = ?", (qid,))
+        return _record(row) if row else None
+
+    def has_attempt(self, attempt_id: str) -> bool:
+        return self.db.query_one("SELECT 1 FROM revision_batches WHERE attempt_id = ?", (attempt_id,)) is not None
+
+    def pick(self, order: str = "due", valid: Container | None = None, exclude: Container = ()) -> dict | None:
+        """
+        First record in `order` whose qid is in `valid` and not in `exclude`.
+
+        Walks the matching index a page at a time, so the usual case reads a
+        handful of rows rather than sorting the whole queue.
+        """
+        sql = f"SELECT * FROM revision_items ORDER BY {PICK_ORDERS[order]} LIMIT ? OFFSET ?"
+        offset = 0
+        while True:
+            rows = self.db.query(sql, (_PICK_PAGE, offset))
+            for r in rows:
+                qid = r["qid"]
+                if (valid is None or qid in valid) and qid not in exclude:
+                    return _record(r)
+            if len(rows) < _PICK_PAGE:
+                return None
+            offset += _PICK_PAGE
+
+    def due_count(self, now: float | None = None) -> int:
+        now = time.time() if now is None else now
+        return self.db.query_one("SELECT COUNT(*) FROM revision_items WHERE due_ts <= ?", (now,))[0]
+
+    def counts_by(self, dim: str) -> dict[str, int]:
+        """Queue size per "topic" or "difficulty", from the rollup table."""
+        return rollups.revision_counts(self.db, dim)
+
+    # -------------------------
+    # Writes (one transaction each)
+    # -------------------------
+    def record_many(self, events: list[dict], attempt_id: str | None = None) -> bool:
+        """
+        Apply the answers of one attempt in a single transaction.
+
+        `events` are {"op": "wrong" | "correct", "qid", "selected"[, "source",
+        "topic", "difficulty"]}; the labels are kept on the item for the
+        rollups. Each answer also advances the item's SM-2 schedule. With a
+        mock `attempt_id` the batch is applied at most once, so re-running a
+        submit (e.g. after autosubmit) never double-counts; single-question
+        pages guard repeats in session state instead of adding a batch row
+        per question shown. Returns False if the attempt was already recorded.
+        """
+        ts = now_iso()
+        now = time.time()
+        with self.db.transaction() as conn:
+            if attempt_id:
+                cur = conn.execute("INSERT OR IGNORE INTO revision_batches VALUES (?, ?)", (attempt_id, ts))
+                if cur.rowcount == 0:
+                    return False
+            for ev in events:
+                qid, op = ev.get("qid"), ev.get("op")
+                if not qid or op not in ("wrong", "correct"):
+                    continue
+                row = conn.execute(
+                    "SELECT ease, interval_days, reps, due_ts, topic, difficulty FROM revision_items WHERE qid = ?",
+                    (qid,),
+                ).fetchone()
+                if row is None and op == "correct":
+                    continue
+                sched = review_answer(Schedule(*row[:4]) if row else Schedule(), op == "correct", now)
+                selected = json.dumps(list(ev.get("selected") or []))
+                if op == "wrong":
+                    old = {dim: row[dim] for dim in rollups.REVISION_DIMS} if row else None
+                    labels = {dim: (old or {}).get(dim) or ev.get(dim) for dim in rollups.REVISION_DIMS}
+                    if labels != old:
+                        rollups.on_revision_labels(conn, old, labels)
+                    conn.execute(
+                        """
+                        INSERT INTO revision_items
+                            (qid, added_at, last_seen, times_seen, times_wrong, last_selected, source,
+                             ease, interval_days, reps, due_ts, topic, difficulty)
+                        VALUES (?, ?, ?, 1, 1, ?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(qid) DO UPDATE SET
+                            last_seen = excluded.last_seen,
+                            times_seen = times_seen + 1,
+                            times_wrong = times_wrong + 1,
+                            last_selected = excluded.last_selected,
+                            source = excluded.source,
+                            ease = excluded.ease,
+                            interval_days = excluded.interval_days,
+                            reps = excluded.reps,
+                            due_ts = excluded.due_ts,
+                            topic = excluded.topic,
+                            difficulty = excluded.difficulty
+                        """,
+                        (qid, ts, ts, selected, ev.get("source", ""),
+                         sched.ease, sched.interval_days, sched.reps, sched.due_ts,
+                         labels["topic"], labels["difficulty"]),
+                    )
+                else:
+                    conn.execute(
+                        """
+                        UPDATE revision_items
+                        SET last_seen = ?, times_seen = times_seen + 1,
+                            times_correct = times_correct + 1, last_selected = ?,
+                            ease = ?, interval_days = ?, reps = ?, due_ts = ?
+                        WHERE qid = ?
+                        """,
+                        (ts, selected, sched.ease, sched.interval_days, sched.reps, sched.due_ts, qid),
+                    )
+        return True
+
+    def record_wrong(self, qid: str, selected: list[str], source: str, attempt_id: str | None = None) -> bool:
+        return self.record_many([{"op": "wrong", "qid": qid, "selected": list(selected), "source": source}], attempt_id)
+
+    def record_correct(self, qid: str, selected: list[str], attempt_id: str | None = None) -> bool:
+        return self.record_many([{"op": "correct", "qid": qid, "selected": list(selected)}], attempt_id)
+
+    def remove(self, qid: str):
+        with self.db.transaction() as conn:
+            row = conn.execute("DELETE FROM revision_items WHERE qid = ? RETURNING topic, difficulty", (qid,)).fetchone()
+            if row is not None:
+                rollups.on_revision_labels(conn, dict(row), None)
+
+    def clear(self):
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM revision_items")
+            rollups.on_revision_cleared(conn)
+
+
+# -------------------------
+# Process-wide store
+# -------------------------
+_lock = threading.Lock()
+_store: RevisionStore | None = None
+
+
+def get_revision_store() -> RevisionStore:
+    global _store
+    if _store is not None:
+        return _store
+    with _lock:
+        if _store is None:
+            _store = RevisionStore()
+        return _store
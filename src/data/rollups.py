@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Mapping
+
+# Incrementally maintained aggregates behind the Stats / Study Plan / home
+# dashboards. Each writer calls the matching on_* hook inside its own
+# transaction, so a rollup can never disagree with the rows it summarises;
+# rebuild() recomputes everything from the base tables and verify() reports
+# any drift without writing.
+#
+#   answer_rollups    (dim, key) -> correct, total, time_ms, timed  (mock answers)
+#   revision_rollups  (dim, key) -> count                            (revision queue)
+#   attempt_rollup    one row: attempts, best/last attempt id        (mock attempts)
+
+# Mock answers are rolled up per topic, exam domain and difficulty.
+ROLLUP_DIMS = ("topic", "domain", "difficulty")
+# Revision items are counted per topic and difficulty.
+REVISION_DIMS = ("topic", "difficulty")
+
+# One statement each: migrations run them inside an open transaction.
+TABLES = (
+    """
+    CREATE TABLE IF NOT EXISTS revision_rollups (
+        dim   TEXT NOT NULL,
+        key   TEXT NOT NULL,
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (dim, key)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS attempt_rollup (
+        id              INTEGER PRIMARY KEY CHECK (id = 0),
+        attempts        INTEGER NOT NULL DEFAULT 0,
+        best_attempt_id TEXT,
+        best_pct        REAL,
+        last_attempt_id TEXT,
+        last_ts         TEXT
+    )
+    """,
+)
+
+
+# -------------------------
+# Event hooks (call inside the writer's transaction)
+# -------------------------
+def on_attempt_logged(conn: sqlite3.Connection, attempt: dict, answers: list[dict]):
+    """A new mock attempt was stored (not a re-submit of a stored one)."""
+    conn.executemany(
+        """
+        INSERT INTO answer_rollups (dim, key, correct, total, time_ms, timed)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(dim, key) DO UPDATE SET
+            correct = correct + excluded.correct,
+            total = total + excluded.total,
+            time_ms = time_ms + excluded.time_ms,
+            timed = timed + excluded.timed
+        """,
+        answer_deltas(answers),
+    )
+    conn.execute("INSERT OR IGNORE INTO attempt_rollup (id) VALUES (0)")
+    # Ties keep the earlier attempt, matching ORDER BY pct DESC over insertion order.
+    conn.execute(
+        """
+        UPDATE attempt_rollup SET
+            attempts = attempts + 1,
+            best_attempt_id = CASE WHEN best_pct IS NULL OR :pct > best_pct
+                                   THEN :id ELSE best_attempt_id END,
+            best_pct = CASE WHEN best_pct IS NULL OR :pct > best_pct THEN :pct ELSE best_pct END,
+            last_attempt_id = CASE WHEN last_ts IS NULL OR :ts >= last_ts
+                                   THEN :id ELSE last_attempt_id END,
+            last_ts = CASE WHEN last_ts IS NULL OR :ts >= last_ts THEN :ts ELSE last_ts END
+        WHERE id = 0
+        """,
+        {"id": attempt["attempt_id"], "pct": attempt["pct"], "ts": attempt["ts"]},
+    )
+
+
+def on_revision_labels(conn: sqlite3.Connection, old: Mapping | None, new: Mapping | None):
+    """
+    A revision item's labels changed: `old` is None for an insert, `new` is
+    None for a delete, and both are set when an unlabelled item gets labels.
+    """
+    for labels, step in ((old, -1), (new, 1)):
+        if not labels:
+            continue
+        for dim in REVISION_DIMS:
+            key = labels[dim]
+            if key is None:
+                continue
+            conn.execute(
+                """
+                INSERT INTO revision_rollups (dim, key, count) VALUES (?, ?, ?)
+                ON CONFLICT(dim, key) DO UPDATE SET count = count + excluded.count
+                """,
+                (dim, key, step),
+            )
+    conn.execute("DELETE FROM revision_rollups WHERE count <= 0")
+
+
+def on_revision_cleared(conn: sqlite3.Connection):
+    conn.execute("DELETE FROM revision_rollups")
+
+
+def answer_deltas(answers: list[dict]) -> list[tuple]:
+    """One attempt's answers folded into (dim, key, correct, total, time_ms, timed) rows."""
+    acc: dict[tuple[str, str], list[int]] = {}
+    for a in answers:
+        t = a.get("time_ms")
+        for dim in ROLLUP_DIMS:
+            key = a.get(dim)
+            if key is None:
+                continue
+            row = acc.setdefault((dim, key), [0, 0, 0, 0])
+            row[0] += 1 if a.get("correct") else 0
+            row[1] += 1
+            if t is not None:
+                row[2] += int(t)
+                row[3] += 1
+    return [(dim, key, *row) for (dim, key), row in acc.items()]
+
+
+def backfill_revision_labels(conn: sqlite3.Connection, labels: Mapping[str, Mapping]) -> int:
+    """Set topic/difficulty on revision items that have none, from qid -> question."""
+    rows = conn.execute("SELECT qid FROM revision_items WHERE topic IS NULL").fetchall()
+    updates = [
+        (labels[qid].get("topic") or "Unknown", labels[qid].get("difficulty") or "Unknown", qid)
+        for (qid,) in rows
+        if qid in labels
+    ]
+    conn.executemany("UPDATE revision_items SET topic = ?, difficulty = ? WHERE qid = ?", updates)
+    return len(updates)
+
+
+# -------------------------
+# Reads (`db` is a LocalDB; each is a primary-key lookup)
+# -------------------------
+_SUMMARY_KEYS = ("attempts", "best_attempt_id", "best_pct", "last_attempt_id", "last_ts")
+_SUMMARY_SQL = f"SELECT {', '.join(_SUMMARY_KEYS)} FROM attempt_rollup WHERE id = 0"
+
+
+def _summary(row) -> dict:
+    return dict(zip(_SUMMARY_KEYS, row)) if row else {**dict.fromkeys(_SUMMARY_KEYS), "attempts": 0}
+
+
+def revision_counts(db, dim: str) -> dict[str, int]:
+    """key -> number of revision items, for dim "topic" or "difficulty"."""
+    return {r["key"]: r["count"] for r in db.query("SELECT key, count FROM revision_rollups WHERE dim = ?", (dim,))}
+
+
+def attempt_summary(db) -> dict:
+    """Attempt count plus the ids of the best and the latest attempt."""
+    return _summary(db.query_one(_SUMMARY_SQL))
+
+
+# -------------------------
+# Rebuild / verify
+# -------------------------
+def _stored(conn: sqlite3.Connection) -> dict:
+    return {
+        "answer_rollups": sorted(
+            tuple(r) for r in conn.execute("SELECT dim, key, correct, total, time_ms, timed FROM answer_rollups")
+        ),
+        "revision_rollups": sorted(tuple(r) for r in conn.execute("SELECT dim, key, count FROM revision_rollups")),
+        "attempt_rollup": _summary(conn.execute(_SUMMARY_SQL).fetchone()),
+    }
+
+
+def _expected(conn: sqlite3.Connection) -> dict:
+    answers = []
+    for dim in ROLLUP_DIMS:
+        answers += conn.execute(
+            f"""
+            SELECT ?, {dim}, SUM(correct), COUNT(*), COALESCE(SUM(time_ms), 0), COUNT(time_ms)
+            FROM attempt_answers WHERE {dim} IS NOT NULL GROUP BY {dim}
+            """,
+            (dim,),
+        ).fetchall()
+    revision = []
+    for dim in REVISION_DIMS:
+        revision += conn.execute(
+            f"SELECT ?, {dim}, COUNT(*) FROM revision_items WHERE {dim} IS NOT NULL GROUP BY {dim}",
+            (dim,),
+        ).fetchall()
+
+    summary = {"attempts": conn.execute("SELECT COUNT(*) FROM attempts").fetchone()[0]}
+    best = conn.execute("SELECT attempt_id, pct FROM attempts ORDER BY pct DESC, rowid ASC LIMIT 1").fetchone()
+    last = conn.execute("SELECT attempt_id, ts FROM attempts ORDER BY ts DESC, rowid DESC LIMIT 1").fetchone()
+    summary["best_attempt_id"], summary["best_pct"] = tuple(best) if best else (None, None)
+    summary["last_attempt_id"], summary["last_ts"] = tuple(last) if last else (None, None)
+    return {
+        "answer_rollups": sorted(tuple(r) for r in answers),
+        "revision_rollups": sorted(tuple(r) for r in revision),
+        "attempt_rollup": summary,
+    }
+
+
+def rebuild(conn: sqlite3.Connection) -> dict:
+    """Recompute every rollup from the base tables; returns the new contents."""
+    expected = _expected(conn)
+    conn.execute("DELETE FROM answer_rollups")
+    conn.executemany("INSERT INTO answer_rollups VALUES (?, ?, ?, ?, ?, ?)", expected["answer_rollups"])
+    conn.execute("DELETE FROM revision_rollups")
+    conn.executemany("INSERT INTO revision_rollups VALUES (?, ?, ?)", expected["revision_rollups"])
+    s = expected["attempt_rollup"]
+    conn.execute(
+        "INSERT OR REPLACE INTO attempt_rollup VALUES (0, ?, ?, ?, ?, ?)",
+        (s["attempts"], s["best_attempt_id"], s["best_pct"], s["last_attempt_id"], s["last_ts"]),
+    )
+    return expected
+
+
+def verify(conn: sqlite3.Connection) -> list[str]:
+    """Human-readable differences between stored and recomputed rollups (empty if in sync)."""
+    stored, expected = _stored(conn), _expected(conn)
+    problems = []
+    for name in ("answer_rollups", "revision_rollups"):
+        have, want = set(stored[name]), set(expected[name])
+        problems += [f"{name}: unexpected {row}" for row in sorted(have - want)]
+        problems += [f"{name}: missing {row}" for row in sorted(want - have)]
+    for k, want in expected["attempt_rollup"].items():
+        have = stored["attempt_rollup"][k]
+        if have != want:
+            problems.append(f"attempt_rollup.{k}: stored {have!r}, expected {want!r}")
+    return problems
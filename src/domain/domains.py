@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+OFFICIAL_DOMAIN_PCTS = {
+    "OVERVIEW_DOCUMENT_MODEL": 0.08,
+    "CRUD": 0.51,
+    "INDEXES": 0.17,
+    "DATA_MODELING": 0.04,
+    "TOOLS_TOOLING": 0.02,
+    "DRIVERS": 0.18,
+}
+
+DOMAIN_ORDER_FILL = [
+    "CRUD",
+    "DRIVERS",
+    "INDEXES",
+    "OVERVIEW_DOCUMENT_MODEL",
+    "DATA_MODELING",
+    "TOOLS_TOOLING",
+]
+
+
+DOMAIN_ALIASES = {
+    "OVERVIEW": "OVERVIEW_DOCUMENT_MODEL",
+    "DOCUMENT_MODEL": "OVERVIEW_DOCUMENT_MODEL",
+    "OVERVIEW_DOCUMENT": "OVERVIEW_DOCUMENT_MODEL",
+    "DOC_MODEL": "OVERVIEW_DOCUMENT_MODEL",
+    "INDEX": "INDEXES",
+    "INDEXING": "INDEXES",
+    "TOOLS": "TOOLS_TOOLING",
+    "TOOLING": "TOOLS_TOOLING",
+    "DRIVER": "DRIVERS",
+}
+
+
+def canonical_domain(raw: str) -> str:
+    """Map a hand-written domain label (any case, aliases) to its canonical name."""
+    d = raw.strip().upper()
+    if d in OFFICIAL_DOMAIN_PCTS:
+        return d
+    d = d.replace("&", "AND").replace("/", "_").replace("-", "_").replace(" ", "_")
+    return DOMAIN_ALIASES.get(d, d)
+
+
+def heuristic_domain(q: dict) -> str:
+    txt = f"{q.get('topic','')} {q.get('subtopic','')}".lower()
+    if any(k in txt for k in ["crud", "insert", "update", "delete", "find", "aggregate", "aggregation", "pipeline"]):
+        return "CRUD"
+    if "index" in txt:
+        return "INDEXES"
+    if any(k in txt for k in ["driver", "pymongo", "motor", "uri", "tls", "retrywrites"]):
+        return "DRIVERS"
+    if any(k in txt for k in ["model", "schema", "embedding", "reference", "normalize", "denormal"]):
+        return "DATA_MODELING"
+    if any(k in txt for k in ["mongosh", "atlas", "compass", "dump", "restore", "import", "export"]):
+        return "TOOLS_TOOLING"
+    return "OVERVIEW_DOCUMENT_MODEL"
+
+
+def classify_domain(q: dict) -> tuple[str, bool]:
+    """(domain, from_heuristic). Used by build_bank to stamp every question."""
+    d = q.get("domain")
+    if d:
+        return canonical_domain(d), False
+    return heuristic_domain(q), True
+
+
+def normalize_domain(q: dict) -> str:
+    # Built banks carry a canonical domain on every question, so this is a
+    # dict lookup; the keyword fallback only runs for unbuilt/legacy rows.
+    d = q.get("domain")
+    if d in OFFICIAL_DOMAIN_PCTS:
+        return d
+    return classify_domain(q)[0]
@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Collection, Sequence
+
+import numpy as np
+
+from src.domain.domains import DOMAIN_ORDER_FILL, OFFICIAL_DOMAIN_PCTS
+
+
+def compute_domain_quotas(total_q: int) -> dict[str, int]:
+    raw = {k: OFFICIAL_DOMAIN_PCTS[k] * total_q for k in OFFICIAL_DOMAIN_PCTS}
+    quotas = {k: int(round(v)) for k, v in raw.items()}
+
+    for k in quotas:
+        quotas[k] = max(0, quotas[k])
+
+    s = sum(quotas.values())
+    if s != total_q:
+        diff = total_q - s
+        i = 0
+        while diff != 0:
+            k = DOMAIN_ORDER_FILL[i % len(DOMAIN_ORDER_FILL)]
+            if diff > 0:
+                quotas[k] += 1
+                diff -= 1
+            else:
+                if quotas[k] > 0:
+                    quotas[k] -= 1
+                    diff += 1
+            i += 1
+
+    s = sum(quotas.values())
+    if s != total_q:
+        quotas["CRUD"] += (total_q - s)
+    return quotas
+
+
+# Default official-simulation targets beyond the domain weights.
+DIFFICULTY_MIX = {"easy": 0.3, "medium": 0.5, "hard": 0.2}
+MULTI_SHARE = 0.2
+MAX_PER_SUBTOPIC = 3
+
+
+def apportion(total: int, shares: dict[str, float]) -> dict[str, int]:
+    """Largest-remainder split of `total` by `shares` (which need not sum to 1)."""
+    norm = sum(shares.values()) or 1.0
+    raw = {k: total * v / norm for k, v in shares.items()}
+    out = {k: int(v) for k, v in raw.items()}
+    by_remainder = sorted(raw, key=lambda k: raw[k] - out[k], reverse=True)
+    for k in by_remainder[: total - sum(out.values())]:
+        out[k] += 1
+    return out
+
+
+def make_rng(seed: int | np.random.Generator | None = None) -> np.random.Generator:
+    return np.random.default_rng(seed)
+
+
+def _codes(values: Sequence[str]) -> tuple[np.ndarray, list[str]]:
+    names = sorted(set(values))
+    lookup = {v: i for i, v in enumerate(names)}
+    return np.fromiter((lookup[v] for v in values), dtype=np.int32, count=len(values)), names
+
+
+class ExamAssembler:
+    """
+    Quota-weighted exam drawing over a fixed question pool.
+
+    `domains[i]` is the (normalized) domain of pool position i. Per-domain
+    position arrays are built once, so each exam is one Generator.choice per
+    domain quota, an optional top-up from the rest of the pool, and a final
+    shuffle. Results are pool positions; map them back to questions yourself.
+    """
+
+    def __init__(self, domains: Sequence[str]):
+        self.size = len(domains)
+        self.domain, self.domain_names = _codes(list(domains))
+        self.by_domain: dict[str, np.ndarray] = {
+            d: np.flatnonzero(self.domain == c) for c, d in enumerate(self.domain_names)
+        }
+
+    def assemble(self, total_q: int, rng: int | np.random.Generator | None = None) -> tuple[np.ndarray, dict]:
+        rng = make_rng(rng)
+        quotas = compute_domain_quotas(total_q)
+        empty = np.empty(0, dtype=np.intp)
+
+        parts = []
+        shortages: dict[str, int] = {}
+        for d, qn in quotas.items():
+            pool = self.by_domain.get(d, empty)
+            pick = min(qn, len(pool))
+            if pick:
+                parts.append(rng.choice(pool, size=pick, replace=False))
+            if pick < qn:
+                shortages[d] = qn - pick
+        chosen = np.concatenate(parts) if parts else empty
+
+        # Top up shortfalls from anything not yet chosen (any domain).
+        fill_needed = min(total_q, self.size) - len(chosen)
+        if fill_needed > 0:
+            free = np.ones(self.size, dtype=bool)
+            free[chosen] = False
+            chosen = np.concatenate([chosen, rng.choice(np.flatnonzero(free), size=fill_needed, replace=False)])
+
+        chosen = rng.permutation(chosen)
+        dbg = {"quotas": quotas, "shortages": shortages, "selected": len(chosen)}
+        return chosen, dbg
+
+
+@dataclass
+class ExamConstraints:
+    total_q: int
+    difficulty_mix: dict[str, float] | None = field(default_factory=lambda: dict(DIFFICULTY_MIX))
+    multi_share: float | None = MULTI_SHARE
+    max_per_subtopic: int | None = MAX_PER_SUBTOPIC
+    avoid_ids: Collection[str] = ()
+
+
+class ConstrainedExamAssembler:
+    """
+    Greedy-with-repair exam generator over precomputed attribute arrays.
+
+    Targets: official domain quotas, a difficulty mix, a multi/single ratio,
+    a cap per subtopic and no questions from `avoid_ids` (recently seen).
+    Each slot of a domain quota takes the free candidate that best closes
+    the remaining difficulty/type deficits (random tie-break); a repair pass
+    then swaps picks within a domain to fix any leftover difficulty/type
+    imbalance. Hard limits are relaxed in the order no-repeat -> subtopic cap
+    -> domain quota, and every relaxation is reported.
+
+    Domain codes and per-domain positions come from an ExamAssembler over the
+    same pool; with no constraints beyond the domain quotas the exam is drawn
+    by that quota sampler directly.
+    """
+
+    def __init__(self, rows: Sequence[dict], domains: Sequence[str]):
+        self.size = len(rows)
+        self.ids = [r.get("id") for r in rows]
+        self._pos = {qid: i for i, qid in enumerate(self.ids)}
+        self.quota = ExamAssembler(domains)
+        self.domain, self.domain_names = self.quota.domain, self.quota.domain_names
+        self.difficulty, self.difficulty_names = _codes([r.get("difficulty") or "Unknown" for r in rows])
+        self.subtopic, _ = _codes([r.get("subtopic") or "" for r in rows])
+        self.is_multi = np.fromiter((r.get("type") == "multi" for r in rows), dtype=bool, count=self.size)
+
+    def assemble(self, c: ExamConstraints, rng: int | np.random.Generator | None = None) -> tuple[np.ndarray, dict]:
+        rng = make_rng(rng)
+        if not (c.difficulty_mix or c.multi_share is not None or c.max_per_subtopic or c.avoid_ids):
+            chosen, dbg = self.quota.assemble(c.total_q, rng=rng)
+            return chosen, {**dbg, "relaxed": [f"domain_quota:{d} (-{k})" for d, k in dbg["shortages"].items()]}
+        n = min(c.total_q, self.size)
+        relaxed: list[str] = []
+
+        domain_quota = compute_domain_quotas(c.total_q)
+        mix_target = apportion(n, c.difficulty_mix) if c.difficulty_mix else {}
+        diff_target = np.array([mix_target.get(name, 0) for name in self.difficulty_names], dtype=float)
+        multi_target = None if c.multi_share is None else int(round(n * c.multi_share))
+        cap = c.max_per_subtopic or self.size
+
+        free = np.ones(self.size, dtype=bool)
+        fresh = np.ones(self.size, dtype=bool)
+        for qid in c.avoid_ids:
+            if qid in self._pos:
+                fresh[self._pos[qid]] = False
+        sub_count = np.zeros(int(self.subtopic.max(initial=-1)) + 1, dtype=np.int32)
+        diff_have = np.zeros(len(self.difficulty_names))
+        multi_have = 0
+        chosen: list[int] = []
+
+        def take(i: int):
+            nonlocal multi_have
+            chosen.append(i)
+            free[i] = False
+            sub_count[self.subtopic[i]] += 1
+            diff_have[self.difficulty[i]] += 1
+            multi_have += int(self.is_multi[i])
+
+        def best(mask: np.ndarray) -> int | None:
+            idx = np.flatnonzero(mask)
+            if len(idx) == 0:
+                return None
+            score = rng.random(len(idx))
+            if c.difficulty_mix:
+                score += (diff_target - diff_have)[self.difficulty[idx]] * 2
+            if multi_target is not None:
+                want_multi = multi_target - multi_have > 0
+                score += np.where(self.is_multi[idx] == want_multi, 1.0, 0.0)
+            return int(idx[np.argmax(score)])
+
+        def pick(base: np.ndarray) -> int | None:
+            # Strict first, then relax no-repeat, then the subtopic cap.
+            under_cap = sub_count[self.subtopic] < cap
+            for mask, label in (
+                (base & fresh & under_cap, None),
+                (base & under_cap, "no_repeat"),
+                (base, "subtopic_cap"),
+            ):
+                i = best(mask)
+                if i is not None:
+                    if label and label not in relaxed:
+                        relaxed.append(label)
+                    return i
+            return None
+
+        shortages: dict[str, int] = {}
+        for d, qn in domain_quota.items():
+            in_domain = np.zeros(self.size, dtype=bool)
+            in_domain[self.quota.by_domain.get(d, ())] = True
+            for k in range(qn):
+                if len(chosen) >= n:
+                    break
+                i = pick(free & in_domain)
+                if i is None:
+                    shortages[d] = qn - k
+                    break
+                take(i)
+        for d, k in shortages.items():
+            relaxed.append(f"domain_quota:{d} (-{k})")
+        while len(chosen) < n:
+            take(pick(free))
+
+        chosen = np.array(chosen, dtype=np.intp)
+        self._repair(chosen, free, fresh, sub_count, cap, diff_target, multi_target, c, rng)
+
+        diff_final = np.bincount(self.difficulty[chosen], minlength=len(self.difficulty_names))
+        multi_final = int(self.is_multi[chosen].sum())
+        diff_got = {name: int(diff_final[j]) for j, name in enumerate(self.difficulty_names) if diff_final[j]}
+        if c.difficulty_mix and any(diff_got.get(k, 0) != v for k, v in mix_target.items()):
+            relaxed.append("difficulty_mix")
+        if multi_target is not None and multi_final != multi_target:
+            relaxed.append("multi_share")
+
+        out = rng.permutation(chosen)
+        dbg = {
+            "quotas": domain_quota,
+            "shortages": shortages,
+            "selected": len(out),
+            "difficulty": {
+                name: {"target": mix_target.get(name, 0), "got": diff_got.get(name, 0)}
+                for name in sorted(set(mix_target) | set(diff_got))
+            },
+            "multi": {"target": multi_target, "got": multi_final},
+            "relaxed": relaxed,
+        }
+        return out, dbg
+
+    def _repair(self, chosen, free, fresh, sub_count, cap, diff_target, multi_target, c, rng):
+        """Swap picks within their domain to close difficulty, then type, gaps."""
+        keep_fresh = bool(fresh[chosen].all())
+
+        def open_slots() -> np.ndarray:
+            mask = free & (sub_count[self.subtopic] < cap)
+            return mask & fresh if keep_fresh else mask
+
+        def swap_one(slot_ok: np.ndarray, cand: np.ndarray) -> bool:
+            # Any chosen slot in `slot_ok` whose domain has a candidate in `cand`.
+            cand_domains = np.unique(self.domain[cand])
+            slots = np.flatnonzero(slot_ok & np.isin(self.domain[chosen], cand_domains))
+            if len(slots) == 0:
+                return False
+            slot = int(rng.choice(slots))
+            old = chosen[slot]
+            new = int(rng.choice(np.flatnonzero(cand & (self.domain == self.domain[old]))))
+            chosen[slot] = new
+            free[old], free[new] = True, False
+            sub_count[self.subtopic[old]] -= 1
+            sub_count[self.subtopic[new]] += 1
+            return True
+
+        if c.difficulty_mix:
+            for _ in range(len(chosen)):
+                have = np.bincount(self.difficulty[chosen], minlength=len(diff_target))
+                over = np.flatnonzero(have > diff_target)
+                under = np.flatnonzero(have < diff_target)
+                if len(over) == 0 or len(under) == 0:
+                    break
+                cand = open_slots() & np.isin(self.difficulty, under)
+                if not swap_one(np.isin(self.difficulty[chosen], over), cand):
+                    break
+
+        if multi_target is not None:
+            for _ in range(len(chosen)):
+                have = int(self.is_multi[chosen].sum())
+                if have == multi_target:
+                    break
+                want_multi = have < multi_target
+                wrong_type = self.is_multi[chosen] != want_multi
+                base = open_slots() & (self.is_multi == want_multi)
+                # Keep the difficulty mix intact: swap within one difficulty.
+                if not any(
+                    swap_one(wrong_type & (self.difficulty[chosen] == k), base & (self.difficulty == k))
+                    for k in range(len(self.difficulty_names))
+                ):
+                    break
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Mapping, NamedTuple, Sequence
+
+import numpy as np
+
+from src.domain.domains import normalize_domain
+
+# Option keys in bit order: A = 1, B = 2, C = 4, D = 8.
+CHOICE_KEYS = ("A", "B", "C", "D")
+_BIT = {k: 1 << i for i, k in enumerate(CHOICE_KEYS)}
+# Set bits in every 4-bit mask.
+_POPCOUNT = np.array([bin(m).count("1") for m in range(16)], dtype=np.int8)
+
+
+def keys_mask(keys: Iterable[str]) -> int:
+    """4-bit mask of option keys; unknown keys are ignored."""
+    m = 0
+    for k in keys or ():
+        m |= _BIT.get(k, 0)
+    return m
+
+
+def mask_keys(mask: int) -> list[str]:
+    return [k for k in CHOICE_KEYS if mask & _BIT[k]]
+
+
+def answer_mask(q: dict) -> int:
+    """Correct-answer mask of a question (or of a compiled row, which stores it)."""
+    m = q.get("answer_mask")
+    if m is not None:
+        return int(m)
+    return keys_mask((q.get("answer") or {}).get("keys", []))
+
+
+class QuestionResult(NamedTuple):
+    qid: str
+    correct: bool
+    selected: list[str]
+    answer: list[str]
+    domain: str
+    partial: float
+
+
+@dataclass
+class AttemptGrade:
+    """
+    One graded attempt, position-aligned with the attempt's question order.
+
+    `known[i]` is False for questions no longer in the bank; they count
+    towards `total` but are never correct. `partial[i]` is multi-select
+    partial credit: (right picks - wrong picks) / answer size, floored at
+    0; 1.0 exactly when the answer is fully correct.
+    """
+
+    qids: list[str]
+    selected: np.ndarray
+    answer: np.ndarray
+    known: np.ndarray
+    correct: np.ndarray
+    partial: np.ndarray
+    is_multi: np.ndarray
+    domains: list[str | None]
+
+    @property
+    def total(self) -> int:
+        return len(self.qids)
+
+    @property
+    def score(self) -> int:
+        return int(self.correct.sum())
+
+    @property
+    def pct(self) -> float:
+        return round(self.score / max(1, self.total) * 100, 2)
+
+    @property
+    def wrong_qids(self) -> list[str]:
+        return [self.qids[i] for i in np.flatnonzero(self.known & ~self.correct)]
+
+    def results(self) -> Iterator[QuestionResult]:
+        """One result per question still in the bank, in attempt order."""
+        for i in np.flatnonzero(self.known):
+            yield QuestionResult(
+                self.qids[i],
+                bool(self.correct[i]),
+                mask_keys(self.selected[i]),
+                mask_keys(self.answer[i]),
+                self.domains[i],
+                float(self.partial[i]),
+            )
+
+    def by_domain(self) -> dict[str, dict]:
+        """domain -> {correct, total, pct} over the questions still in the bank."""
+        out: dict[str, dict] = {}
+        for i in np.flatnonzero(self.known):
+            d = out.setdefault(self.domains[i], {"correct": 0, "total": 0})
+            d["correct"] += int(self.correct[i])
+            d["total"] += 1
+        for d in out.values():
+            d["pct"] = round(d["correct"] / d["total"] * 100, 2)
+        return out
+
+    def multi_credit(self) -> tuple[float, int]:
+        """(partial credit earned, multi-select questions) over the attempt."""
+        multi = self.known & self.is_multi
+        return float(self.partial[multi].sum()), int(multi.sum())
+
+
+class Grader:
+    """
+    Answer masks for a whole bank, built once per bank load.
+
+    Each question's correct keys are a 4-bit mask in a uint8 array; an
+    attempt is graded by mapping its answers to masks and comparing all
+    positions at once, so the results view, the history log and the
+    revision push share one grading pass.
+    """
+
+    def __init__(self, rows: Sequence[dict]):
+        self.ids = [r.get("id") for r in rows]
+        self._pos = {qid: i for i, qid in enumerate(self.ids) if qid}
+        self.answer = np.fromiter((answer_mask(r) for r in rows), dtype=np.uint8, count=len(rows))
+        self.is_multi = np.fromiter((r.get("type") == "multi" for r in rows), dtype=bool, count=len(rows))
+        self.domains = [normalize_domain(r) for r in rows]
+        # One trailing blank entry, so position -1 (not in the bank) grades as nothing.
+        self._answer = np.append(self.answer, np.uint8(0))
+        self._multi = np.append(self.is_multi, False)
+
+    def __contains__(self, qid: object) -> bool:
+        return qid in self._pos
+
+    def is_correct(self, qid: str, selected: Iterable[str]) -> bool:
+        i = self._pos.get(qid)
+        return i is not None and keys_mask(selected) == self.answer[i]
+
+    def answer_keys(self, qid: str) -> list[str]:
+        i = self._pos.get(qid)
+        return [] if i is None else mask_keys(self.answer[i])
+
+    def grade(self, order: Sequence[str], answers: Mapping[str, Iterable[str]]) -> AttemptGrade:
+        n = len(order)
+        pos = np.fromiter((self._pos.get(qid, -1) for qid in order), dtype=np.intp, count=n)
+        known = pos >= 0
+
+        selected = np.fromiter((keys_mask(answers.get(qid, ())) for qid in order), dtype=np.uint8, count=n)
+        answer = self._answer[pos]
+        is_multi = self._multi[pos]
+
+        correct = known & (selected == answer)
+        hits = _POPCOUNT[selected & answer]
+        wrong = _POPCOUNT[selected & ~answer & 0xF]
+        size = np.maximum(_POPCOUNT[answer], 1)
+        partial = np.where(known, np.clip((hits - wrong) / size, 0.0, 1.0), 0.0)
+
+        return AttemptGrade(
+            qids=list(order),
+            selected=selected,
+            answer=answer,
+            known=known,
+            correct=correct,
+            partial=partial,
+            is_multi=is_multi,
+            domains=[self.domains[p] if p >= 0 else None for p in pos],
+        )
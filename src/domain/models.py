@@ -3,6 +3,8 @@ from __future__ import annotations
 from typing import Dict, List, Literal, Optional
 from pydantic import BaseModel, Field, ConfigDict, field_validator
 
+from src.domain.domains import OFFICIAL_DOMAIN_PCTS, canonical_domain
+
 PoolType = Literal["learning", "exam"]
 Confidence = Literal["high", "medium"]
 Difficulty = Literal["easy", "medium", "hard"]
@@ -50,6 +52,8 @@ class QuestionV2(BaseModel):
     difficulty: Difficulty
     type: QType
     tags: List[str] = Field(default_factory=list)
+    # Official exam domain; build_bank fills it in from topic/subtopic when absent.
+    domain: Optional[str] = None
 
     exam_relevance: ExamRelevance
 
@@ -65,6 +69,16 @@ class QuestionV2(BaseModel):
     author: str = "unknown"
     updated_at: str
 
+    @field_validator("domain")
+    @classmethod
+    def validate_domain(cls, v: Optional[str]):
+        if v is None:
+            return v
+        d = canonical_domain(v)
+        if d not in OFFICIAL_DOMAIN_PCTS:
+            raise ValueError(f"domain must be one of {sorted(OFFICIAL_DOMAIN_PCTS)} (got {v!r})")
+        return d
+
     @field_validator("choices")
     @classmethod
     def validate_choices(cls, choices: List[Choice]):
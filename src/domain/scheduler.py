@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+# SM-2 spaced repetition (SuperMemo 2), tuned for exam cramming: a lapse
+# comes back within minutes instead of tomorrow.
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+RELEARN_SECONDS = 10 * 60
+DAY_SECONDS = 24 * 60 * 60
+
+# Answer quality on SM-2's 0-5 scale.
+QUALITY_WRONG = 1
+QUALITY_CORRECT = 4
+
+
+@dataclass(frozen=True)
+class Schedule:
+    ease: float = DEFAULT_EASE
+    interval_days: float = 0.0
+    reps: int = 0
+    due_ts: float = 0.0
+
+
+def next_ease(ease: float, quality: int) -> float:
+    q = 5 - quality
+    return max(MIN_EASE, ease + 0.1 - q * (0.08 + q * 0.02))
+
+
+def review(s: Schedule, quality: int, now: float | None = None) -> Schedule:
+    """Return the schedule after one answer of the given quality (0-5)."""
+    now = time.time() if now is None else now
+    ease = next_ease(s.ease, quality)
+
+    if quality < 3:
+        # Lapse: start the repetition ladder again.
+        return Schedule(ease=ease, interval_days=0.0, reps=0, due_ts=now + RELEARN_SECONDS)
+
+    reps = s.reps + 1
+    if reps == 1:
+        interval = 1.0
+    elif reps == 2:
+        interval = 6.0
+    else:
+        interval = round(s.interval_days * s.ease, 2)
+    return Schedule(ease=ease, interval_days=interval, reps=reps, due_ts=now + interval * DAY_SECONDS)
+
+
+def review_answer(s: Schedule, correct: bool, now: float | None = None) -> Schedule:
+    return review(s, QUALITY_CORRECT if correct else QUALITY_WRONG, now)
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import time
+
+import streamlit as st
+
+from src.data.attempt_store import get_attempt_store
+
+# Answer and mark changes are checkpointed at once; navigation and
+# time-on-question alone are written at most this often.
+CHECKPOINT_DEBOUNCE_SEC = 5.0
+
+# With st.fragment, a click inside the question panel reruns only the panel;
+# the bank lookups, timer and the rest of the page are left as they are.
+HAS_FRAGMENTS = hasattr(st, "fragment")
+
+
+# -------------------------
+# Attempt bookkeeping
+# -------------------------
+def track_question_time(attempt: dict, qid: str | None):
+    """
+    Credit the time since the previous rerun to the question that was on
+    screen then, and start timing `qid` (None stops the clock on submit).
+    Every answer, Prev/Next, mark or submit is a rerun, so this adds up the
+    time spent on each question across visits.
+    """
+    now = time.time()
+    times = attempt.setdefault("time_ms", {})
+    shown = attempt.get("on_screen")
+    if shown:
+        prev_qid, since = shown
+        times[prev_qid] = times.get(prev_qid, 0) + int((now - since) * 1000)
+    attempt["on_screen"] = (qid, now) if qid else None
+
+
+def progress_snapshot(attempt: dict) -> dict[str, tuple]:
+    """qid -> (selected, marked, time_ms) for every question touched so far."""
+    answers, marked, times = attempt["answers"], attempt["marked"], attempt.get("time_ms") or {}
+    return {
+        qid: (tuple(answers.get(qid, ())), qid in marked, int(times.get(qid, 0)))
+        for qid in set(answers) | marked | set(times)
+    }
+
+
+def checkpoint_attempt(attempt: dict, force: bool = False):
+    """
+    Persist what changed since the last checkpoint, one row per question.
+    A new answer or mark is written straight away (a single-row upsert);
+    a changed idx or time-on-question waits for CHECKPOINT_DEBOUNCE_SEC
+    unless `force`. Reruns that change nothing write nothing.
+    """
+    saved = attempt.setdefault("saved", {})
+    rows, urgent = [], False
+    for qid, row in progress_snapshot(attempt).items():
+        old = saved.get(qid)
+        if row != old:
+            rows.append((qid, *row))
+            urgent = urgent or old is None or old[:2] != row[:2]
+    if not rows and attempt.get("saved_idx") == attempt["idx"]:
+        return
+    now = time.time()
+    if not (force or urgent or now - attempt.get("saved_at", 0.0) >= CHECKPOINT_DEBOUNCE_SEC):
+        return
+    get_attempt_store().save_progress(attempt["attempt_id"], attempt["idx"], rows)
+    for qid, *row in rows:
+        saved[qid] = tuple(row)
+    attempt["saved_idx"] = attempt["idx"]
+    attempt["saved_at"] = now
+
+
+# -------------------------
+# Rendering
+# -------------------------
+def render_counters(attempt: dict):
+    order = attempt["order"]
+    idx = attempt["idx"]
+    c1, c2, c3 = st.columns([2.2, 1.2, 1.3])
+    with c1:
+        st.progress(min(1.0, (idx + 1) / max(1, len(order))))
+        st.caption(f"Question {idx + 1} / {len(order)}")
+        relaxed = (attempt.get("selection_debug") or {}).get("relaxed")
+        if relaxed:
+            st.caption("Bank too small for: " + ", ".join(relaxed))
+    with c2:
+        answered_count = sum(1 for _qid, ans in attempt["answers"].items() if ans)
+        st.metric("Answered", f"{answered_count}/{len(order)}")
+    with c3:
+        st.metric("Marked", str(len(attempt["marked"])))
+
+
+# Navigation runs as button callbacks: they update the attempt before the
+# panel reruns, so a click costs one panel run rather than a run plus st.rerun().
+def _go_to(attempt: dict, idx: int):
+    attempt["idx"] = idx
+
+
+def _toggle_mark(attempt: dict, qid: str):
+    marked = attempt["marked"]
+    if qid in marked:
+        marked.remove(qid)
+    else:
+        marked.add(qid)
+
+
+def render_question_panel(attempt: dict, by_id):
+    """Counters, the current question, its options and Prev/Next/Mark/Submit."""
+    order = attempt["order"]
+    idx = attempt["idx"]
+    qid = order[idx]
+    q = by_id[qid]
+
+    render_counters(attempt)
+    st.divider()
+
+    track_question_time(attempt, qid)
+
+    st.markdown(f"## {q.get('title','')}")
+    st.caption(f"{qid} • {q.get('topic','')} • {q.get('subtopic','')} • {q.get('difficulty','')}")
+
+    st.markdown("### Question")
+    st.write(q.get("prompt", ""))
+
+    context = q.get("context")
+    if context and str(context).strip():
+        st.markdown("### Context")
+        st.caption(context)
+
+    artifacts = q.get("artifacts") or {}
+    sample_docs = artifacts.get("sample_docs") or []
+    if sample_docs:
+        st.markdown("### Sample docs")
+        st.json(sample_docs)
+
+    st.divider()
+    st.markdown("### Options")
+
+    qtype = q.get("type", "single")
+    choices = q.get("choices", [])
+    choice_map = {c["key"]: c["text"] for c in choices}
+
+    prev = attempt["answers"].get(qid, [])
+    selected_keys: list[str] = []
+
+    if qtype == "multi":
+        for k in ["A", "B", "C", "D"]:
+            if k not in choice_map:
+                continue
+            default_checked = k in prev
+            ck = st.checkbox(
+                f"{k}. {choice_map[k]}",
+                value=default_checked,
+                key=f"mock_opt_{qid}_{k}",
+            )
+            if ck:
+                selected_keys.append(k)
+    else:
+        keys = [c["key"] for c in choices]
+        labels = [f"{k}. {choice_map[k]}" for k in keys]
+        default_index = 0
+        if prev and prev[0] in keys:
+            default_index = keys.index(prev[0])
+        picked = st.radio(
+            "Select one",
+            options=labels,
+            index=default_index,
+            key=f"mock_radio_{qid}",
+        )
+        selected_keys = [picked.split(".")[0]]
+
+    attempt["answers"][qid] = selected_keys
+    checkpoint_attempt(attempt)
+
+    # Navigation
+    nav1, nav2, nav3, nav4, nav5 = st.columns([1, 1, 1.4, 1.2, 4.4])
+
+    with nav1:
+        st.button("Prev", disabled=idx == 0, on_click=_go_to, args=(attempt, max(0, idx - 1)))
+
+    with nav2:
+        st.button(
+            "Next",
+            disabled=idx >= len(order) - 1,
+            on_click=_go_to,
+            args=(attempt, min(len(order) - 1, idx + 1)),
+        )
+
+    with nav3:
+        is_marked = qid in attempt["marked"]
+        st.button("Unmark" if is_marked else "Mark for review", on_click=_toggle_mark, args=(attempt, qid))
+
+    with nav4:
+        if st.button("Submit", type="primary"):
+            attempt["submitted"] = True
+            # Leave the panel: the whole page switches to the results view.
+            if HAS_FRAGMENTS:
+                st.rerun(scope="app")
+            st.rerun()
+
+    st.caption("Typeform mode: one question at a time. No explanations until submission. Pool labels hidden by design.")
+
+
+question_panel = st.fragment(render_question_panel) if HAS_FRAGMENTS else render_question_panel
@@ -1,15 +1,11 @@
 
 import streamlit as st
 
+from question_tags import EXAM_DOMAINS
+
 class StatsManager:
     def __init__(self, user_manager=None):
-        self.exam_domains = {
-            "CRUD Operations": ["CRUD", "Insert", "Update", "Delete", "Find"],
-            "Aggregation": ["Aggregation", "Pipeline", "Match", "Group", "Project"],
-            "Indexing": ["Indexes", "Index", "Compound Indexes", "Text Index"],
-            "Data Modeling": ["Schema", "Data Model", "Document Design", "References"],
-            "Tools & Deployment": ["Tools", "Deployment", "Compass", "Atlas", "Mongosh"]
-        }
+        self.exam_domains = EXAM_DOMAINS
         self.user_manager = user_manager
         self.initialize_session_state()
     
@@ -0,0 +1,58 @@
+from pathlib import Path
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from src.data import attempt_store, history_store, revision_store
+from src.data.local_db import get_db
+
+PAGE = str(Path(__file__).resolve().parents[1] / "pages" / "2_Mock_Exam.py")
+
+
+@pytest.fixture
+def stores(tmp_path, monkeypatch):
+    db = get_db(tmp_path / "local.db")
+    attempts = attempt_store.ActiveAttemptStore(db)
+    monkeypatch.setattr(attempt_store, "_store", attempts)
+    monkeypatch.setattr(revision_store, "_store", revision_store.RevisionStore(db))
+    monkeypatch.setattr(history_store, "_store", history_store.MockHistoryStore(db))
+    finished = []
+    finish = attempt_store.ActiveAttemptStore.finish
+    monkeypatch.setattr(
+        attempt_store.ActiveAttemptStore, "finish", lambda self, aid: (finished.append(aid), finish(self, aid))
+    )
+    return attempts, finished
+
+
+def _click(at, label):
+    next(b for b in at.button if b.label == label).click().run()
+
+
+def _submitted_attempt_id():
+    at = AppTest.from_file(PAGE, default_timeout=60).run()
+    _click(at, "Start")
+    _click(at, "Submit")
+    assert not at.exception
+    return at, at.session_state.attempt["attempt_id"]
+
+
+def test_results_view_finishes_once(stores):
+    _, finished = stores
+    at, attempt_id = _submitted_attempt_id()
+    for _ in range(3):
+        at.run()
+    assert finished == [attempt_id]
+    assert "Time left" not in [m.label for m in at.metric]
+
+
+def test_reopening_a_submitted_attempt_does_not_finish_it_again(stores):
+    attempts, finished = stores
+    _, attempt_id = _submitted_attempt_id()
+    assert attempts.get(attempt_id)["submitted"]
+
+    at = AppTest.from_file(PAGE, default_timeout=60)
+    at.query_params["attempt"] = attempt_id
+    at.run()
+    assert not at.exception
+    assert "Score" in [m.label for m in at.metric]
+    assert finished == [attempt_id]
@@ -0,0 +1,133 @@
+import functools
+import os
+from pathlib import Path
+
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+from pymongo import MongoClient, monitoring
+from streamlit.testing.v1 import AppTest
+
+import mongo_client
+import question_tags
+from database import QuizDatabase
+from user_manager import UserManager
+
+ROOT = Path(__file__).resolve().parents[1]
+ADDRESS = ("localhost", 27017)
+# Optional live server for the driver-level checks, e.g. mongodb://localhost:27017
+TEST_URI = os.environ.get("MONGO_TEST_URI")
+
+
+class NoClient:
+    def __init__(self, *args, **kwargs):
+        raise AssertionError("a second MongoClient was created")
+
+
+@pytest.fixture(autouse=True)
+def fresh_client(monkeypatch):
+    monkeypatch.setattr(mongo_client, "_client", None)
+    monkeypatch.setattr(mongo_client, "_secrets", lambda: {})
+    monkeypatch.setenv("MONGO_URI", "mongodb://db.example:27017")
+    yield
+    mongo_client.close_client()
+
+
+@pytest.fixture
+def mock_client(monkeypatch):
+    monkeypatch.setattr(mongo_client, "MongoClient", NoClient)
+    client = mongomock.MongoClient()
+    mongo_client.set_client(client)
+    return client
+
+
+def test_get_client_is_one_shared_instance(monkeypatch):
+    monkeypatch.setattr(mongo_client, "MongoClient", mongomock.MongoClient)
+    client = mongo_client.get_client()
+    assert mongo_client.get_client() is client
+    assert mongo_client.get_database().client is client
+    assert QuizDatabase().client is client
+    assert UserManager().client is client
+
+
+def test_pool_options_reach_the_driver(monkeypatch):
+    # A real pymongo client that does not open connections until first use.
+    monkeypatch.setattr(mongo_client, "MongoClient", functools.partial(MongoClient, connect=False))
+    monkeypatch.setattr(mongo_client, "_secrets", lambda: {"mongo": {"maxPoolSize": 50}})
+    options = mongo_client.get_client().options
+    pool = options.pool_options
+    assert pool.max_pool_size == 50
+    assert pool.min_pool_size == 0
+    assert pool.max_idle_time_seconds == 300
+    assert pool.wait_queue_timeout == 5
+    assert pool.connect_timeout == 5
+    assert pool.socket_timeout == 20
+    assert options.server_selection_timeout == 5
+    assert options.retry_writes is True
+    assert pool.metadata["application"] == {"name": "mdb-quiz-app"}
+    assert mongo_client.counter in options.event_listeners
+
+
+def test_missing_uri_raises(monkeypatch):
+    monkeypatch.delenv("MONGO_URI")
+    with pytest.raises(RuntimeError):
+        mongo_client.get_client()
+
+
+def test_set_client_is_used_for_filtered_questions_and_indexes(mock_client):
+    db = QuizDatabase()
+    assert db.client is mock_client
+
+    question_tags.ensure_indexes(db.collection)
+    assert {"keywords_1", "domain_1"} <= set(db.collection.index_information())
+
+    docs = [
+        {"question_id": "idx01", "topic": "Indexing", "stem": "Which compound index supports the sort?"},
+        {"question_id": "agg01", "topic": "Aggregation", "stem": "What does $group output?"},
+    ]
+    for doc in docs:
+        doc.update(question_tags.search_fields(doc))
+    mock_client[mongo_client.DB_NAME]["questions"].insert_many(docs)
+
+    assert db.get_question_count() == 2
+    for _ in range(5):
+        assert db.get_filtered_question(["Index"])["question_id"] == "idx01"
+    assert db.get_filtered_question(["Schema"]) is None
+
+
+def test_set_client_is_used_by_practice_page(mock_client):
+    at = AppTest.from_file(str(ROOT / "practice.py"), default_timeout=30).run()
+    assert not at.exception
+    assert at.title[0].value == "🔐 Please Login to Continue"
+
+
+def test_close_client_closes_and_forgets(mock_client):
+    mongo_client.close_client()
+    assert mongo_client._client is None
+
+
+def test_connection_counter_tracks_listener_events():
+    counter = mongo_client.ConnectionCounter()
+    for i in (1, 2):
+        counter.connection_created(monitoring.ConnectionCreatedEvent(ADDRESS, i))
+    counter.connection_checked_out(monitoring.ConnectionCheckedOutEvent(ADDRESS, 1, 0.0))
+    counter.connection_checked_out(monitoring.ConnectionCheckedOutEvent(ADDRESS, 2, 0.0))
+    assert counter.snapshot() == {"open": 2, "in_use": 2, "created_total": 2}
+
+    counter.connection_checked_in(monitoring.ConnectionCheckedInEvent(ADDRESS, 1))
+    counter.connection_closed(monitoring.ConnectionClosedEvent(ADDRESS, 1, "idle"))
+    assert counter.snapshot() == {"open": 1, "in_use": 1, "created_total": 2}
+
+
+@pytest.mark.skipif(not TEST_URI, reason="set MONGO_TEST_URI to run against a live mongod")
+def test_connection_counter_with_live_server(monkeypatch):
+    monkeypatch.setenv("MONGO_URI", TEST_URI)
+    monkeypatch.setattr(mongo_client, "counter", mongo_client.ConnectionCounter())
+    client = mongo_client.get_client()
+    client.admin.command("ping")
+    QuizDatabase().get_question_count()
+    stats = mongo_client.connection_stats()
+    assert stats["created_total"] >= 1
+    assert stats["open"] >= 1
+    assert stats["in_use"] == 0
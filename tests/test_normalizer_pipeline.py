@@ -0,0 +1,71 @@
+import threading
+
+import bson
+import pytest
+
+import normalizer
+
+
+class _NullWriter:
+    def write(self, batch):
+        return len(batch)
+
+
+def _raw_docs(n):
+    return (bson.encode({"_id": i, "question_id": f"Q{i}"}) for i in range(n))
+
+
+def _run_in_thread(**kwargs):
+    result = {}
+
+    def target():
+        try:
+            result["value"] = normalizer.run(**kwargs)
+        except BaseException as e:
+            result["error"] = e
+
+    t = threading.Thread(target=target, daemon=True)
+    t.start()
+    t.join(timeout=10)
+    assert not t.is_alive(), "run() hung"
+    return result
+
+
+def test_normalize_failure_is_reraised_without_hanging(monkeypatch):
+    def boom(raw_docs):
+        raise RuntimeError("normalize failed")
+
+    monkeypatch.setattr(normalizer, "plan_batch", boom)
+    # Many one-doc batches and a one-slot queue: the reader is blocked on a
+    # full queue when the normalize stage fails.
+    result = _run_in_thread(
+        source=_raw_docs(1000), writer=_NullWriter(), batch_size=1,
+        checkpoint=normalizer.Checkpoint(None), workers=0, queue_depth=1,
+    )
+    assert isinstance(result.get("error"), RuntimeError)
+
+
+def test_write_failure_is_reraised_without_hanging():
+    class FailingWriter:
+        def write(self, batch):
+            raise RuntimeError("write failed")
+
+    docs = [{"_id": i, "question_id": f"Q{i}", "difficulty": "EASY"} for i in range(200)]
+    result = _run_in_thread(
+        source=(bson.encode(d) for d in docs), writer=FailingWriter(), batch_size=1,
+        checkpoint=normalizer.Checkpoint(None), workers=0, queue_depth=1,
+    )
+    assert isinstance(result.get("error"), RuntimeError)
+
+
+def test_run_completes():
+    stats, _ = normalizer.run(_raw_docs(50), _NullWriter(), 7, normalizer.Checkpoint(None))
+    assert stats["total"] == 50
+
+
+def test_checkpoint_is_refused_for_dump_runs(tmp_path):
+    dump = tmp_path / "dump.json"
+    dump.write_text("[]", encoding="utf-8")
+    with pytest.raises(SystemExit) as exc:
+        normalizer.main(["--input", str(dump), "--checkpoint", str(tmp_path / "ck.json")])
+    assert exc.value.code == 2
@@ -0,0 +1,61 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.data import question_bank
+from src.data.compiled_bank import CompiledBank, write_compiled_bank
+from src.data.question_index import UNKNOWN
+
+BANK_DIR = Path(__file__).resolve().parents[1] / "question_bank" / "v2"
+
+
+@pytest.fixture
+def bank_path(tmp_path):
+    jsonl = tmp_path / "questions.jsonl"
+    shutil.copy(BANK_DIR / "questions.jsonl", jsonl)
+    rows = question_bank.QuestionBank.from_jsonl(jsonl).rows
+    st = jsonl.stat()
+    write_compiled_bank(rows, jsonl.with_suffix(".bin"), source_stamp=(st.st_mtime_ns, st.st_size))
+    yield jsonl
+    question_bank.close_bank(jsonl)
+
+
+def test_compiled_bank_closes(bank_path):
+    with CompiledBank(bank_path.with_suffix(".bin")) as compiled:
+        assert len(compiled)
+    assert compiled.closed
+
+
+def test_reload_bank_closes_the_old_mapping(bank_path):
+    old = question_bank.get_bank(bank_path)
+    assert old.compiled is not None and not old.compiled.closed
+
+    new = question_bank.reload_bank(bank_path)
+    assert new is question_bank.get_bank(bank_path)
+    assert old.compiled.closed
+    assert not new.compiled.closed
+
+
+def test_close_bank_allows_replacing_the_bin(bank_path):
+    bank = question_bank.get_bank(bank_path)
+    question_bank.close_bank(bank_path)
+    assert bank.compiled.closed
+
+    bin_path = bank_path.with_suffix(".bin")
+    tmp = bin_path.with_name("rebuilt.bin")
+    shutil.copy(bin_path, tmp)
+    tmp.replace(bin_path)
+    assert question_bank.get_bank(bank_path) is not bank
+
+
+def test_pool_lists_agree_with_the_index():
+    rows = [
+        {"id": "Q1", "status": "published", "exam_relevance": {"pool": "exam"}},
+        {"id": "Q2", "status": "published", "exam_relevance": {"pool": "learning"}},
+        {"id": "Q3", "status": "published"},
+    ]
+    bank = question_bank.QuestionBank(rows)
+    for pool, listed in (("exam", bank.published_exam), ("learning", bank.published_learning)):
+        assert bank.filter(status="published", pool=pool) == listed
+    assert [r["id"] for r in bank.filter(pool=UNKNOWN)] == ["Q3"]
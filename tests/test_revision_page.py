@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from src.data import revision_store
+from src.data.local_db import get_db
+from src.data.question_bank import get_bank
+
+PAGE = str(Path(__file__).resolve().parents[1] / "pages" / "3_Revision.py")
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    s = revision_store.RevisionStore(get_db(tmp_path / "local.db"))
+    monkeypatch.setattr(revision_store, "_store", s)
+    return s
+
+
+def _single_question():
+    bank = get_bank()
+    return next(bank.get(r["id"]) for r in bank.rows if bank.get(r["id"]).get("type", "single") == "single")
+
+
+def _submit_twice(qid, key):
+    at = AppTest.from_file(PAGE, default_timeout=30).run()
+    radio = at.radio(key=f"rev_radio_{qid}")
+    radio.set_value(next(o for o in radio.options if o.startswith(f"{key}.")))
+    at.run()
+    snapshots = []
+    for _ in range(2):
+        next(b for b in at.button if b.label == "Submit").click().run()
+        snapshots.append(revision_store.get_revision_store().items)
+    return snapshots
+
+
+@pytest.mark.parametrize("answer", ["correct", "wrong"])
+def test_repeated_submit_is_applied_once(store, answer):
+    q = _single_question()
+    store.record_wrong(q["id"], [], "practice")
+    correct = get_bank().grader.answer_keys(q["id"])
+    key = next(c["key"] for c in q["choices"] if (c["key"] in correct) == (answer == "correct"))
+
+    first, second = _submit_twice(q["id"], key)
+
+    assert second == first
+    assert first[q["id"]]["times_seen"] == 2
+    # Card views are guarded in session state, not by permanent batch rows.
+    assert store.db.query_one("SELECT COUNT(*) FROM revision_batches")[0] == 0
@@ -1,16 +1,16 @@
 import streamlit as st
 import json
 from datetime import datetime
-from pymongo import MongoClient
 from bson import ObjectId
 
+from mongo_client import get_database
+from question_tags import search_fields
+
 # === CONFIG ===
 st.set_page_config(page_title="MongoDB QA Uploader", layout="wide")
 
 # === MONGODB CONNECTION ===
-mongo_uri = st.secrets["mongo_uri"]  # Define this in .streamlit/secrets.toml
-client = MongoClient(mongo_uri)
-db = client["quiz_app"]
+db = get_database()  # mongo_uri in .streamlit/secrets.toml; one pooled client per process
 collection = db["questions"]
 
 # === PAGE HEADER ===
@@ -29,6 +29,7 @@ if st.button("📤 Upload to MongoDB"):
         qa_doc["_id"] = ObjectId()
         qa_doc["created_at"] = datetime.utcnow()
         qa_doc["updated_at"] = datetime.utcnow()
+        qa_doc.update(search_fields(qa_doc))
 
         # Insert into MongoDB
         collection.insert_one(qa_doc)
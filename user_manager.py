@@ -1,13 +1,14 @@
 
 import streamlit as st
-from pymongo import MongoClient
 from datetime import datetime
 
+from mongo_client import get_database
+
 class UserManager:
-    def __init__(self):
-        self.mongo_uri = st.secrets["mongo_uri"]
-        self.client = MongoClient(self.mongo_uri)
-        self.db = self.client["quiz_app"]
+    def __init__(self, db=None):
+        # Shares the process-wide pooled client; pass `db` to use another database.
+        self.db = db if db is not None else get_database()
+        self.client = self.db.client
         self.users_collection = self.db["users"]
         self.user_stats_collection = self.db["user_stats"]
         self.initialize_session_state()
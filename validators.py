@@ -6,7 +6,9 @@ ALLOWED_KEYS = {
     "options", "answers", "explanation", "difficulty",
     "author", "status", "created_at", "updated_at",
     "type", "version", "index", "operation", "document_before",
-    "sample_doc", "sample_docs"
+    "sample_doc", "sample_docs",
+    # Derived search fields (question_tags.search_fields)
+    "keywords", "domain"
 }
 
 VALID_TOPICS = {